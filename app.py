@@ -6,10 +6,10 @@
 
 import re
 import operator
-from typing import List, Optional, Tuple
-from prettytable import PrettyTable
-from models import Individual, Family
-import user_stories as us
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+from models import Individual, Family, GedcomIndex
+from kinship import spouses_are_siblings
+import tables
 
 TAGS: List[str] = ['INDI', 'NAME', 'SEX', 'BIRT', 'DEAT', 'FAMC', 'FAMS', 'FAM',
                    'MARR', 'HUSB', 'WIFE', 'CHIL', 'DIV', 'DATE', 'HEAD', 'TRLR', 'NOTE']
@@ -21,12 +21,41 @@ ZERO_PATTERN_2: str = '^0 (HEAD|TRLR|NOTE) ?(.*)$'  # pattern 4
 
 regex_list: List[str] = [ARGUMENT_PATTERN, NO_ARGUMENT_PATTERN, ZERO_PATTERN_1, ZERO_PATTERN_2]
 
+# the four patterns above as one compiled alternation; alternatives are tried in the same
+# order as regex_list, so a line gets the same category it would get from pattern_finder
+LINE_REGEX: Pattern = re.compile(
+    '^(?:(?P<arg_level>0|1|2) (?P<arg_tag>NAME|SEX|FAMC|FAMS|MARR|HUSB|WIFE|CHIL|DATE) (?P<arg_value>.*)'
+    '|(?P<no_arg_level>0|1) (?P<no_arg_tag>BIRT|DEAT|MARR|DIV|HEAD|TRLR|NOTE)'
+    '|0 (?P<xref>.*) (?P<zero_1_tag>INDI|FAM)'
+    '|0 (?P<zero_2_tag>HEAD|TRLR|NOTE) ?(?P<zero_2_value>.*))$')
+
+# the last group matched by LINE_REGEX tells which alternative (pattern) the line matched
+LAST_GROUP_PATTERNS: Dict[str, str] = {'arg_value': 'ARGUMENT', 'no_arg_tag': 'NO_ARGUMENT',
+                                       'zero_1_tag': 'ZERO_1', 'zero_2_value': 'ZERO_2'}
+
+Token = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+EMPTY_TOKEN: Token = (None, None, None, None, None)
+
+
+def tokenize(line: str) -> Token:
+    """ split a line into (pattern, level, xref, tag, value) with a single regex match """
+    match = LINE_REGEX.match(line)
+    if match is None:
+        return EMPTY_TOKEN
+
+    pattern: str = LAST_GROUP_PATTERNS[match.lastgroup]
+    if pattern == 'ARGUMENT':
+        return pattern, match.group('arg_level'), None, match.group('arg_tag'), match.group('arg_value')
+    if pattern == 'NO_ARGUMENT':
+        return pattern, match.group('no_arg_level'), None, match.group('no_arg_tag'), None
+    if pattern == 'ZERO_1':
+        return pattern, '0', match.group('xref'), match.group('zero_1_tag'), None
+    return pattern, '0', None, match.group('zero_2_tag'), match.group('zero_2_value')
+
 
 def pattern_finder(line: str) -> Optional[str]:
     """ find the pattern of a given line """
-    for pattern, regex in zip(['ARGUMENT', 'NO_ARGUMENT', 'ZERO_1', 'ZERO_2'], regex_list):
-        if re.search(regex, line):
-            return pattern
+    return tokenize(line)[0]
 
 
 def get_lines(path) -> List[str]:
@@ -35,60 +64,114 @@ def get_lines(path) -> List[str]:
         return [line for line in file]
 
 
-def pretty_print(individuals: List[Individual], families: List[Family]) -> None:
-    """ prettify the data """
+def iter_lines(path) -> Iterator[str]:
+    """ yield the lines of a .ged file one at a time """
+    with open(path, "r") as file:
+        yield from file
+
+
+def pretty_print(individuals: List[Individual], families: List[Family], offset: int = 0,
+                 limit: Optional[int] = None, stream: Optional[bool] = None) -> None:
+    """ prettify the data, offset and limit paging both tables; stream writes the rows as they are
+        made instead of building PrettyTables, by default when there are more than PRETTY_TABLE_ROWS records """
+    index: GedcomIndex = individuals if isinstance(individuals, GedcomIndex) else GedcomIndex(individuals)
+    individual_rows = tables.page(tables.individual_rows(individuals), offset, limit)
+    family_rows = tables.page(tables.family_rows(families, index), offset, limit)  # spouse names by id
+
+    if stream is None:
+        stream = len(individuals) + len(families) > tables.PRETTY_TABLE_ROWS
+    if stream:
+        tables.write_table("Individuals", tables.INDIVIDUAL_FIELDS, individual_rows)
+        tables.write_table("Families", tables.FAMILY_FIELDS, family_rows)
+        print()
+        return
+
+    from prettytable import PrettyTable  # only needed for printing small files
 
     individual_table: PrettyTable = PrettyTable()
     family_table: PrettyTable = PrettyTable()
-    individual_table.field_names = ["ID", "Name", "Gender", "Birthday", "Age",
-                                    "Alive", "Death", "Child", "Spouse"]
-    family_table.field_names = ["ID", "Married", "Divorced", "Husband ID", "Husband Name",
-                                "Wife ID", "Wife Name", "Child"]
+    individual_table.field_names = tables.INDIVIDUAL_FIELDS
+    family_table.field_names = tables.FAMILY_FIELDS
 
-    for individual in individuals:  # add individual info to the table
-        individual_table.add_row(individual.info())
+    for row in individual_rows:  # add individual info to the table
+        individual_table.add_row(row)
 
-    for family in families:  # add individual info to the table
-        family_table.add_row(family.info(individuals))
+    for row in family_rows:  # add family info to the table
+        family_table.add_row(row)
 
     print("Individuals\n", individual_table, sep="")
     print("Families\n", family_table, sep="", end='\n\n')
 
 
-def generate_classes(lines: List[str]) -> Tuple[List[Individual], List[Family]]:
-    """ get lines read from a .ged file """
-    individuals: List[Individual] = []
-    families: List[Family] = []
-    current_record: Optional[Individual, Family] = None
+def assemble_records(tokens: Iterable[Token]) -> Iterator[Union[Individual, Family]]:
+    """ build records from tokenized lines, yielding each one when its level-0 record closes """
+    current_record: Optional[Union[Individual, Family]] = None
     current_tag: Optional[str] = None
 
-    for line in lines:
-        row_fields: List[str] = line.rstrip("\n").split(' ', 2)
-        pattern_type = pattern_finder(line)
-        if pattern_type == 'ZERO_1':
-            current_record = Individual() if row_fields[2] == 'INDI' else Family()
-            (individuals if isinstance(current_record, Individual) else families) \
-                .append(current_record)
-            current_record.id = row_fields[1]
-        elif pattern_type == 'ZERO_2':
-            pass  # nothing to do with this
+    for pattern_type, level, xref, tag, value in tokens:
+        if level == '0':  # any level-0 line closes the current record
+            if current_record is not None:
+                yield current_record
+            current_record = None
+            if pattern_type == 'ZERO_1':
+                current_record = Individual() if tag == 'INDI' else Family()
+                current_record.id = xref
+        elif current_record is None:
+            pass  # a line of a HEAD, NOTE or TRLR record
         elif pattern_type == 'NO_ARGUMENT':
-            if row_fields[0] == '1':
-                setattr(current_record, row_fields[1].lower(), {})
-                current_tag = row_fields[1].lower()
+            current_tag = tag.lower() if tag.lower() in current_record.TAGS else None
+            if current_tag is not None:
+                setattr(current_record, current_tag, {})
         elif pattern_type == 'ARGUMENT':
-            if row_fields[0] == '1':
-                if isinstance(getattr(current_record, row_fields[1].lower()), list):
-                    current_list = getattr(current_record, row_fields[1].lower()) + [row_fields[2]]
-                    setattr(current_record, row_fields[1].lower(), current_list)
+            if level == '1':
+                if tag.lower() not in current_record.TAGS:
+                    pass  # a tag this record does not hold, e.g. MARR under INDI
+                elif isinstance(getattr(current_record, tag.lower()), list):
+                    getattr(current_record, tag.lower()).append(value)
                 else:
-                    setattr(current_record, row_fields[1].lower(), row_fields[2])
-            elif row_fields[0] == '2':
-                setattr(current_record, current_tag, {row_fields[1].lower(): row_fields[2]})
+                    setattr(current_record, tag.lower(), value)
+            elif level == '2' and current_tag is not None:
+                setattr(current_record, current_tag, {tag.lower(): value})
+
+    if current_record is not None:
+        yield current_record
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[Union[Individual, Family]]:
+    """ yield each Individual or Family of the given lines as soon as it is complete """
+    return assemble_records(map(tokenize, lines))
+
+
+def stream_records(path) -> Iterator[Union[Individual, Family]]:
+    """ yield the records of a .ged file while it is being read, without holding its lines """
+    return iter_records(iter_lines(path))
+
+
+def generate_classes(lines: Iterable[str]) -> Tuple[List[Individual], List[Family]]:
+    """ get lines read from a .ged file """
+    individuals: List[Individual] = []
+    families: List[Family] = []
+
+    for record in iter_records(lines):
+        (individuals if isinstance(record, Individual) else families).append(record)
 
     return individuals, families
 
 
+def parse_file(path, workers: int = 1, cache: bool = False) -> Tuple[List[Individual], List[Family]]:
+    """ get the records of a .ged file, parsing it in workers processes when workers > 1
+        and keeping them in a cache file next to it when cache is True """
+    if cache:
+        import parse_cache
+        return parse_cache.cached(path, lambda path: parse_file(path, workers))
+
+    if workers <= 1:
+        return generate_classes(iter_lines(path))
+
+    import mmap_parser  # mmap_parser imports this module
+    return mmap_parser.generate_classes(path, workers=workers)
+
+
 def findParents(id: int, listFam: List) -> str:
     found: str = ""
     for fam in listFam:
@@ -99,40 +182,36 @@ def findParents(id: int, listFam: List) -> str:
 
 
 def checkIfSiblings(fam1: List, fam2: List, listFam: List) -> bool:
-    """just makes sure siblings aren't married, if they are return false"""
-    if fam1.id == fam2.id:
-        return False
-    husb1fam: str = findParents(fam1.husb, listFam)
-    husb2fam: str = findParents(fam2.husb, listFam)
-    wife1fam: str = findParents(fam1.wife, listFam)
-    wife2fam: str = findParents(fam2.wife, listFam)
-
-    if husb1fam:
-        if husb2fam:
-            if husb1fam.id == husb2fam.id:
-                return True
-        elif wife2fam:
-            if husb1fam.id == wife2fam.id:
-                return True
-    elif wife1fam:
-        if husb2fam:
-            if wife1fam.id == husb2fam.id:
-                return True
-        elif wife2fam:
-            if wife1fam.id == wife2fam.id:
-                return True
-
-    return False
-
-
-def main():
+    """just makes sure siblings aren't married, if they are return false
+
+    scans listFam for every spouse; build a kinship.Kinship once to check many pairs"""
+    return spouses_are_siblings(fam1, fam2, lambda _id: findParents(_id, listFam))
+
+
+def main(argv: List[str] = None):
     """ the main function to check the data """
-    path: str = "SSW555-P1-fizgi.ged"
-    lines = get_lines(path)  # process the file
-    individuals, families = generate_classes(lines)
+    import argparse
+    import parse_cache
+    import user_stories as us  # user_stories imports this module
+
+    parser = argparse.ArgumentParser(description="print the records of a .ged file")
+    parser.add_argument("path", nargs='?', default="SSW555-P1-fizgi.ged")
+    parser.add_argument("--no-cache", action='store_true', help="parse the file without the parse cache")
+    parser.add_argument("--clear-cache", action='store_true', help="delete the parse cache of the file first")
+    parser.add_argument("--offset", type=int, default=0, help="skip this many rows of each table")
+    parser.add_argument("--limit", type=int, help="print at most this many rows of each table")
+    parser.add_argument("--stream", action='store_true', default=None,
+                        help="stream the tables even for a small file (the default above "
+                             f"{tables.PRETTY_TABLE_ROWS} records)")
+    args = parser.parse_args(argv)
+
+    path: str = args.path
+    if args.clear_cache:
+        parse_cache.clear(path)
+    individuals, families = parse_file(path, cache=not args.no_cache)  # process the file
     individuals.sort(key=operator.attrgetter('id'))  # sort Individual class list by ID
     families.sort(key=operator.attrgetter('id'))  # sort Family class list by ID
-    pretty_print(individuals, families)
+    pretty_print(individuals, families, args.offset, args.limit, args.stream)
 
     us.list_of_twins(families[0], individuals)
 
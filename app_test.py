@@ -0,0 +1,160 @@
+""" Implement test cases for the GEDCOM parser
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+import io
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import contextlib
+from typing import Dict, List
+
+import app
+import tables
+import mmap_parser
+import parse_cache
+from models import GedcomIndex
+
+
+def fields(record) -> Dict:
+    """ return the stored fields of an Individual or Family """
+    return {name: getattr(record, name, None) for name in type(record).__slots__}
+
+
+class TestParser(unittest.TestCase):
+    """ test class of the parser """
+
+    def test_tokenize(self):
+        """ test tokenize agrees with the four patterns of regex_list """
+        lines: List[str] = ['0 HEAD\n', '0 NOTE a note\n', '0 TRLR', '0 @I1@ INDI\n', '0 @F1@ FAM\n',
+                            '1 NAME John /Doe/\n', '2 DATE 9 NOV 1994\n', '1 BIRT\n', '1 MARR\n',
+                            '1 _CURRENT Y\n', '2 GIVN John\n', '3 DATE 1 JAN 2000\n']
+        for line in lines:
+            expected = next((pattern for pattern, regex in zip(['ARGUMENT', 'NO_ARGUMENT', 'ZERO_1', 'ZERO_2'],
+                                                                app.regex_list) if re.search(regex, line)), None)
+            self.assertEqual(app.pattern_finder(line), expected, line)
+
+        self.assertEqual(app.tokenize('0 @I1@ INDI\n'), ('ZERO_1', '0', '@I1@', 'INDI', None))
+        self.assertEqual(app.tokenize('1 NAME John /Doe/\n'), ('ARGUMENT', '1', None, 'NAME', 'John /Doe/'))
+        self.assertEqual(app.tokenize('1 DEAT\n'), ('NO_ARGUMENT', '1', None, 'DEAT', None))
+        self.assertEqual(app.tokenize('0 NOTE a note\n'), ('ZERO_2', '0', None, 'NOTE', 'a note'))
+        self.assertEqual(app.tokenize('2 GIVN John\n'), (None, None, None, None, None))
+
+    def test_generate_classes(self):
+        """ test generate_classes on the sample file """
+        individuals, families = app.generate_classes(app.get_lines('SSW555-P1-fizgi.ged'))
+        self.assertEqual(len(individuals), 12)
+        self.assertEqual(len(families), 4)
+        individual = next(ind for ind in individuals if ind.id == '@I1@')
+        self.assertEqual(individual.name, 'Fatih /IZGI/')
+        self.assertEqual(individual.birt, {'date': '9 NOV 1994'})
+        self.assertEqual(individual.famc, ['@F1@'])
+
+    def test_stream_records(self):
+        """ test records are yielded as soon as their level-0 record closes """
+        read: List[str] = []
+
+        def lines():
+            for line in ['0 HEAD\n', '0 @I1@ INDI\n', '1 NAME A /B/\n', '1 BIRT\n', '2 DATE 1 JAN 2000\n',
+                         '0 @F1@ FAM\n', '1 HUSB @I1@\n', '0 TRLR\n']:
+                read.append(line)
+                yield line
+
+        records = app.iter_records(lines())
+        individual = next(records)
+        self.assertEqual(individual.id, '@I1@')
+        self.assertEqual(individual.birt, {'date': '1 JAN 2000'})
+        self.assertEqual(len(read), 6)  # stopped at the line closing @I1@
+        family = next(records)
+        self.assertEqual((family.id, family.husb), ('@F1@', '@I1@'))
+        self.assertEqual(list(records), [])
+
+        streamed = [record.id for record in app.stream_records('SSW555-P1-fizgi.ged')]
+        individuals, families = app.generate_classes(app.get_lines('SSW555-P1-fizgi.ged'))
+        self.assertEqual(streamed, [record.id for record in individuals + families])
+
+    def test_mmap_generate_classes(self):
+        """ test the memory-mapped parser builds the same records as the text parser """
+        individuals, families = app.generate_classes(app.get_lines('SSW555-P1-fizgi.ged'))
+        mmap_individuals, mmap_families = mmap_parser.generate_classes('SSW555-P1-fizgi.ged')
+        self.assertEqual(list(map(fields, mmap_individuals)), list(map(fields, individuals)))
+        self.assertEqual(list(map(fields, mmap_families)), list(map(fields, families)))
+
+        buffer: bytes = b'0 @I1@ INDI\r\n1 NAME J\xc3\xb6rg /M/\r\n1 SEX M\r\n1 FAMS @F1@\r\n0 TRLR\r\n'
+        self.assertEqual(list(mmap_parser.tokenize_range(buffer)),
+                         [('ZERO_1', '0', '@I1@', 'INDI', None), ('ARGUMENT', '1', None, 'NAME', 'J\xf6rg /M/'),
+                          ('ARGUMENT', '1', None, 'SEX', 'M'), ('ARGUMENT', '1', None, 'FAMS', '@F1@'),
+                          ('NO_ARGUMENT', '0', None, 'TRLR', None)])
+
+    def test_parallel_generate_classes(self):
+        """ test parsing split ranges in worker processes keeps the records and their order """
+        with mmap_parser.open_mmap('SSW555-P1-fizgi.ged') as buffer:
+            ranges = mmap_parser.split_ranges(buffer, 4)
+            self.assertEqual(len(ranges), 4)
+            self.assertEqual((ranges[0][0], ranges[-1][1]), (0, len(buffer)))
+            self.assertTrue(all(buffer[start:start + 2] == b'0 ' for start, _ in ranges))
+
+        individuals, families = app.parse_file('SSW555-P1-fizgi.ged')
+        parallel_individuals, parallel_families = app.parse_file('SSW555-P1-fizgi.ged', workers=3)
+        self.assertEqual(list(map(fields, parallel_individuals)), list(map(fields, individuals)))
+        self.assertEqual(list(map(fields, parallel_families)), list(map(fields, families)))
+
+    def test_parse_cache(self):
+        """ test the parse cache is used while the file is unchanged and refreshed after an edit """
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tree.ged")
+            shutil.copy('SSW555-P1-fizgi.ged', path)
+            individuals, families = app.parse_file(path)
+
+            self.assertIsNone(parse_cache.load(path))
+            cached_individuals, cached_families = app.parse_file(path, cache=True)
+            self.assertTrue(os.path.exists(parse_cache.cache_path(path)))
+            cached_individuals, cached_families = parse_cache.load(path)
+            self.assertEqual(list(map(fields, cached_individuals)), list(map(fields, individuals)))
+            self.assertEqual(list(map(fields, cached_families)), list(map(fields, families)))
+
+            os.utime(path, ns=(0, 0))  # touched, same content
+            self.assertIsNotNone(parse_cache.load(path))
+            with open(path, "a") as file:
+                file.write("0 @I99@ INDI\n")
+            self.assertIsNone(parse_cache.load(path))
+            self.assertEqual(len(app.parse_file(path, cache=True)[0]), len(individuals) + 1)
+
+            parse_cache.clear(path)
+            self.assertFalse(os.path.exists(parse_cache.cache_path(path)))
+
+    def test_tables(self):
+        """ test the streaming tables size columns from a sample, cut wide cells and page the rows """
+        header: List[str] = ["ID", "Name"]
+        rows: List[List[str]] = [["@I1@", "Al /B/"], ["@I2@", "Christopher /Columbus/"]]
+        lines: List[str] = list(tables.render(header, rows, sample=1))
+        self.assertEqual(lines[0], "+------+--------+")
+        self.assertEqual(lines[1], "|  ID  |  Name  |")
+        self.assertEqual(lines[3], "| @I1@ | Al /B/ |")
+        self.assertEqual(lines[4], "| @I2@ | Chr... |")
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(list(tables.render(header, rows, widths=[4, 22]))[4], "| @I2@ | Christopher /Columbus/ |")
+        self.assertEqual(list(tables.page(range(10), 3, 4)), [3, 4, 5, 6])
+        self.assertEqual(list(tables.page(range(10), 8)), [8, 9])
+
+        individuals, families = app.generate_classes(app.get_lines('SSW555-P1-fizgi.ged'))
+        families[0].wife = '@I99@'  # no such individual
+        index: GedcomIndex = GedcomIndex(individuals)
+        row: List = next(tables.family_rows(families, index))
+        self.assertEqual(row[4], index[families[0].husb].name)
+        self.assertEqual(row[6], 'NA')
+
+        output: io.StringIO = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            app.pretty_print(individuals, families[1:], offset=2, limit=3, stream=True)
+        streamed: List[str] = output.getvalue().splitlines()
+        self.assertEqual(streamed[0], "Individuals")
+        self.assertEqual(len(streamed), (4 + 3 + 1) + (4 + 1 + 1) + 1)  # 3 individuals, the last family, a blank line
+        self.assertIn(individuals[2].id, streamed[4])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False, verbosity=2)
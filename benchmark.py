@@ -0,0 +1,475 @@
+""" Benchmarks for the GEDCOM parser
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+import app
+import mmap_parser
+import synthetic
+from models import DATE_FORMAT, Individual, Family, GedcomIndex, parse_date
+from findings import SummarySink, TextSink, reporting_to
+
+
+def legacy_tokenize(line: str) -> Tuple:
+    """ the previous classification: up to four re.search calls and a split per line """
+    pattern_type = None
+    for pattern, regex in zip(['ARGUMENT', 'NO_ARGUMENT', 'ZERO_1', 'ZERO_2'], app.regex_list):
+        if re.search(regex, line):
+            pattern_type = pattern
+            break
+    return pattern_type, line.rstrip("\n").split(' ', 2)
+
+
+class DictIndividual:
+    """ the previous Individual: a per-instance __dict__ and a dict per event """
+    def __init__(self, _id=None, name=None, sex=None, birt=None, alive=True, deat=False):
+        self.id, self.name, self.sex, self.birt, self.alive, self.deat = _id, name, sex, birt, alive, deat
+        self.famc: List[str] = []
+        self.fams: List[str] = []
+
+
+class DictFamily:
+    """ the previous Family: a per-instance __dict__ and a dict per event """
+    def __init__(self, _id=None, marr=None, husb=None, wife=None, div=False):
+        self.id, self.marr, self.husb, self.wife, self.div = _id, marr, husb, wife, div
+        self.chil: List[str] = []
+
+
+def lines_per_second(function: Callable[[str], object], lines: List[str]) -> float:
+    """ run function on every line and return the throughput """
+    start: float = time.perf_counter()
+    for line in lines:
+        function(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def bench_tokenizer(lines: Iterable[str]) -> None:
+    """ compare line classification throughput before and after the single-pass tokenizer """
+    lines = list(lines)
+    before: float = lines_per_second(legacy_tokenize, lines)
+    after: float = lines_per_second(app.tokenize, lines)
+    print(f"tokenizer: {len(lines)} lines | before {before:,.0f} lines/s | "
+          f"after {after:,.0f} lines/s | x{after / before:.1f}")
+
+
+def seconds(function: Callable, *args) -> float:
+    """ return the wall time of a single call """
+    start: float = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def peak_megabytes(function: Callable, *args) -> float:
+    """ return the peak traced memory of a single call """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def bytes_per_record(individual_class, family_class, count: int) -> Tuple[float, float]:
+    """ return the traced bytes per individual and per family of count records of each class """
+    ids: List[str] = [f"@I{i}@" for i in range(count)]  # strings are shared by both layouts
+    dates: List[str] = [f"{i % 28 + 1} JAN {1900 + i % 100}" for i in range(count)]
+
+    tracemalloc.start()
+    individuals = [individual_class(_id=ids[i], name=ids[i], sex='M', birt={'date': dates[i]})
+                   for i in range(count)]
+    individual_bytes: int = tracemalloc.get_traced_memory()[0]
+    families = [family_class(_id=ids[i], husb=ids[i], wife=ids[i], marr={'date': dates[i]}, div={'date': dates[i]})
+                for i in range(count)]
+    family_bytes: int = tracemalloc.get_traced_memory()[0] - individual_bytes
+    tracemalloc.stop()
+
+    del individuals, families
+    return individual_bytes / count, family_bytes / count
+
+
+def bench_records(count: int = 100_000) -> None:
+    """ compare the memory of dict-based records with the slotted Individual and Family """
+    before: Tuple[float, float] = bytes_per_record(DictIndividual, DictFamily, count)
+    after: Tuple[float, float] = bytes_per_record(Individual, Family, count)
+    print(f"records: individual {before[0]:.0f} -> {after[0]:.0f} bytes | "
+          f"family {before[1]:.0f} -> {after[1]:.0f} bytes")
+
+
+def bench_dates(path: str) -> None:
+    """ compare parsing every event date with strptime against the memoized dates of the records """
+    individuals, families = mmap_parser.generate_classes(path)
+    events = [event for ind in individuals for event in (ind.birt, ind.deat) if event] + \
+             [event for fam in families for event in (fam.marr, fam.div) if event]
+    before: float = seconds(lambda: [datetime.strptime(event['date'], DATE_FORMAT) for event in events])
+    after: float = seconds(lambda: [event.datetime for event in events])
+    print(f"dates: {len(events)} events | strptime {before:.3f} s | parsed at load {after:.4f} s | "
+          f"memo {parse_date.cache_info().currsize} distinct strings")
+
+
+def bench_mmap(path: str) -> None:
+    """ compare parsing a file through text lines with parsing its memory map as bytes """
+    def text() -> Tuple[List, List]:
+        return app.generate_classes(app.get_lines(path))
+
+    megabytes: float = os.path.getsize(path) / 2 ** 20
+    before: float = seconds(text)
+    after: float = seconds(mmap_parser.generate_classes, path)
+    print(f"mmap parser: {megabytes:.1f} MB | text {megabytes / before:,.1f} MB/s, "
+          f"peak {peak_megabytes(text):,.1f} MB | mmap {megabytes / after:,.1f} MB/s, "
+          f"peak {peak_megabytes(mmap_parser.generate_classes, path):,.1f} MB")
+
+
+def bench_cache(path: str) -> None:
+    """ compare parsing a file with loading its records from the parse cache """
+    import parse_cache
+
+    parse_cache.clear(path)
+    parse: float = seconds(app.parse_file, path)
+    miss: float = seconds(lambda: app.parse_file(path, cache=True))
+    hit: float = seconds(lambda: app.parse_file(path, cache=True))
+    print(f"parse cache: parse {parse:.2f} s | miss (parse + write) {miss:.2f} s | hit {hit:.2f} s | "
+          f"x{parse / hit:.1f}")
+    parse_cache.clear(path)
+
+
+def bench_workers(path: str, workers: int) -> None:
+    """ report parse time with 1 to workers processes """
+    single: float = seconds(mmap_parser.generate_classes, path)
+    for count in range(2, workers + 1):
+        parallel: float = seconds(lambda: mmap_parser.generate_classes(path, workers=count))
+        print(f"parallel parse: {count} workers | {parallel:.2f} s | x{single / parallel:.1f} over 1 worker")
+
+
+def bench_columnar(path: str) -> None:
+    """ compare the record-by-record checks with their vectorized versions """
+    try:
+        import columnar
+    except ImportError:
+        print("columnar: skipped, NumPy is not installed")
+        return
+    import user_stories as us
+
+    individuals, families = mmap_parser.generate_classes(path)
+    index = GedcomIndex(individuals, families)
+    store = columnar.ColumnarStore(individuals, families)
+    with reporting_to(SummarySink()):
+        before: float = seconds(lambda: ([us.less_than_150(ind) for ind in individuals],
+                                         [us.were_parents_over_14(fam, index) for fam in families]))
+    after: float = seconds(lambda: (columnar.less_than_150(store), columnar.were_parents_over_14(store)))
+    print(f"columnar: US07 + US10 over {len(individuals)} individuals | loop {before:.2f} s | "
+          f"vectorized {after:.4f} s (store built in {seconds(columnar.ColumnarStore, individuals, families):.2f} s)")
+
+
+def bench_findings(path: str) -> None:
+    """ compare writing every finding as text with the summary-only sink """
+    import rules
+
+    individuals, families = mmap_parser.generate_classes(path)
+    index = GedcomIndex(individuals, families)
+    checks = [rule for rule in rules.registered_rules() if rule.scope != rules.GLOBAL]
+    with open(os.devnull, "w") as devnull:
+        with reporting_to(TextSink(devnull)):
+            text: float = seconds(rules.run_rules, index, checks)
+        with reporting_to(TextSink(devnull, buffer_size=4096, passes=False)):
+            errors: float = seconds(rules.run_rules, index, checks)
+    with reporting_to(SummarySink()):
+        summary: float = seconds(rules.run_rules, index, checks)
+    print(f"findings: per-record rules | every line {text:.2f} s | errors only {errors:.2f} s | "
+          f"summary only {summary:.2f} s")
+
+
+def bench_sqlite(path: str) -> None:
+    """ compare the load and lookups of a GedcomIndex with those of the SQLite store """
+    from sqlite_store import SqliteStore
+
+    individuals, families = mmap_parser.generate_classes(path)
+    ids: List[str] = [individual.id for individual in individuals[::10]]
+    index = GedcomIndex(individuals, families)
+    memory: float = peak_megabytes(lambda: GedcomIndex(*mmap_parser.generate_classes(path)))
+    with tempfile.TemporaryDirectory() as directory:
+        database: str = os.path.join(directory, "tree.db")
+        load: float = seconds(SqliteStore.from_file, path, database)
+        store = SqliteStore(database)
+        in_dicts: float = seconds(lambda: [index[_id] for _id in ids])
+        in_sqlite: float = seconds(lambda: [store[_id] for _id in ids])
+        print(f"sqlite: load {load:.2f} s, {os.path.getsize(database) / 2 ** 20:.1f} MB on disk "
+              f"(in memory: {memory:.1f} MB) | {len(ids)} lookups: dicts {in_dicts:.3f} s, sqlite {in_sqlite:.3f} s")
+        store.close()
+
+
+def bench_events(path: str) -> None:
+    """ compare a scan of every birth date for the two weeks from 20 December with a query of the event index """
+    from datetime import date, timedelta
+    from events import EventIndex
+
+    individuals, _ = mmap_parser.generate_classes(path)
+    today = date(date.today().year, 12, 20)  # a window across the new year
+
+    def scan() -> List[str]:
+        upcoming: List[str] = []
+        for individual in individuals:
+            if individual.birt:
+                birthday = individual.birt.datetime.date()
+                try:
+                    birthday = birthday.replace(year=today.year)
+                except ValueError:  # 29 February
+                    birthday = date(today.year, 2, 28)
+                if timedelta(0) <= birthday - today <= timedelta(days=14) or \
+                        timedelta(0) <= birthday.replace(year=today.year + 1) - today <= timedelta(days=14):
+                    upcoming.append(individual.id)
+        return upcoming
+
+    build: float = seconds(EventIndex, individuals)
+    events = EventIndex(individuals)
+    before: float = seconds(scan)
+    after: float = seconds(events.upcoming, 'BIRT', today, 14)
+    print(f"events: birthdays of two weeks over {len(individuals)} individuals | scan {before:.3f} s | "
+          f"index {after * 1000:.2f} ms (built in {build:.2f} s) | {len(events.upcoming('BIRT', today, 14))} found")
+
+
+def bench_duplicates(path: str, legacy_records: int = 20_000) -> None:
+    """ compare the ids.count scan US22 used with the single-pass duplicate finders """
+    from duplicates import find_duplicates
+
+    individuals, families = mmap_parser.generate_classes(path)
+    ids: List[str] = [individual.id for individual in individuals[:legacy_records]]
+    before: float = seconds(lambda: list(set([_id for _id in ids if ids.count(_id) > 1])))
+    after: float = seconds(lambda: find_duplicates(individuals + families))
+    streamed: float = seconds(lambda: find_duplicates(app.stream_records(path)))
+    print(f"duplicates: US22 ids.count over {len(ids)} ids {before:.2f} s | US22 + US23 + US24 over "
+          f"{len(individuals) + len(families)} records {after:.2f} s, streamed from the file {streamed:.2f} s")
+
+
+def bench_fuzzy(individuals: int = 100_000, seed: int = 0) -> None:
+    """ time the blocked near-duplicate search over people with common names, a few of them entered twice
+        with a typo and a birth date a day off """
+    import random
+    from duplicates import fuzzy_duplicates
+
+    rng = random.Random(seed)
+    given: List[str] = ["John", "Mary", "William", "Elizabeth", "James", "Sarah", "George", "Anna", "Thomas",
+                        "Emma", "Charles", "Margaret", "Henry", "Alice", "Robert", "Catherine", "Joseph", "Jane"]
+    surnames: List[str] = ["".join(rng.choice("bcdfghklmnprstvw") + rng.choice("aeiouy") for _ in range(3)).title()
+                           for _ in range(2_000)]
+    people: List[Individual] = []
+    for i in range(individuals):
+        born = parse_date(f"{rng.randint(1, 28)} JAN 1900").replace(year=rng.randint(1700, 2000),
+                                                                     month=rng.randint(1, 12))
+        people.append(Individual(f"I{i}", f"{rng.choice(given)} /{rng.choice(surnames)}/", rng.choice("MF"),
+                                 {'date': born.strftime(DATE_FORMAT).upper()}))
+    for i in range(0, individuals, 100):
+        original = people[i]
+        name = original.name.replace("a", "e", 1) if "a" in original.name else original.name + "e"
+        day = original.birt.datetime.replace(day=original.birt.datetime.day % 28 + 1)
+        people.append(Individual(f"D{i}", name, original.sex, {'date': day.strftime(DATE_FORMAT).upper()}))
+
+    found: List = []
+    elapsed: float = seconds(lambda: found.extend(fuzzy_duplicates(people)))
+    planted: int = sum(1 for a, b, _ in found if b == f"D{a[1:]}" or a == f"D{b[1:]}")
+    print(f"fuzzy duplicates: {len(people)} individuals in {elapsed:.2f} s | {len(found)} candidate pairs, "
+          f"{planted} of the {individuals // 100} planted")
+
+
+def legacy_siblings_space(dates: List) -> bool:
+    """ the previous US13 check: each date against every date seen before it """
+    seen = set()
+    for d in dates:
+        if d in seen or any(1 < abs((d2 - d).days) < 280 for d2 in seen):
+            return False
+        seen.add(d)
+    return True
+
+
+def bench_siblings(families: int = 2_000, children: int = 60) -> None:
+    """ compare the previous US13 check with the sorted sibling checks on large well-spaced families """
+    from datetime import date, timedelta
+    import siblings
+
+    individuals: List[Individual] = []
+    tree: List[Family] = []
+    for f in range(families):
+        family = Family(f"F{f}")
+        for c in range(children):
+            born = date(1700, 1, 1) + timedelta(days=300 * c + f % 7)
+            individuals.append(Individual(f"I{f}_{c}", birt={'date': born.strftime(DATE_FORMAT).upper()}))
+            family.chil.append(individuals[-1].id)
+        tree.append(family)
+    index = GedcomIndex(individuals, tree)
+    dates = {family.id: [index[child].birt.datetime for child in family.chil] for family in tree}
+
+    before: float = seconds(lambda: [legacy_siblings_space(dates[family.id]) for family in tree])
+    after: float = seconds(siblings.check_families, tree, index)
+    print(f"siblings: US13 over {families} families of {children} children | pairwise {before:.2f} s | "
+          f"sorted US13 + US14 + multiple births {after:.2f} s")
+
+
+def bench_tables(path: str, records: int = 50_000) -> None:
+    """ compare PrettyTable with the streaming tables, printing the first records individuals and families """
+    import contextlib
+    from prettytable import PrettyTable
+    import tables
+
+    individuals, families = mmap_parser.generate_classes(path)
+    individuals, families = individuals[:records], families[:records // 2]
+
+    def pretty() -> None:  # the previous pretty_print
+        individual_table: PrettyTable = PrettyTable(tables.INDIVIDUAL_FIELDS)
+        family_table: PrettyTable = PrettyTable(tables.FAMILY_FIELDS)
+        for individual in individuals:
+            individual_table.add_row(individual.info())
+        index: GedcomIndex = GedcomIndex(individuals)
+        for family in families:
+            family_table.add_row(family.info(index))
+        print("Individuals\n", individual_table, sep="")
+        print("Families\n", family_table, sep="", end='\n\n')
+
+    def printed(function: Callable, *args) -> Callable[[], None]:
+        def run() -> None:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                function(*args)
+        return run
+
+    def first_line() -> float:  # seconds until the first row is out
+        start: float = time.perf_counter()
+        lines: Iterator[str] = tables.render(tables.INDIVIDUAL_FIELDS, tables.individual_rows(individuals))
+        for _ in range(4):  # border, header, border, first row
+            next(lines)
+        return time.perf_counter() - start
+
+    before: float = seconds(printed(pretty))
+    after: float = seconds(printed(app.pretty_print, individuals, families, 0, None, True))
+    before_peak: float = peak_megabytes(printed(pretty))
+    after_peak: float = peak_megabytes(printed(app.pretty_print, individuals, families, 0, None, True))
+    print(f"tables: {len(individuals) + len(families)} rows | PrettyTable {before:.2f} s, {before_peak:.0f} MB | "
+          f"streamed {after:.2f} s, {after_peak:.1f} MB, first line after {first_line() * 1000:.0f} ms")
+
+
+def family_tree(families: int) -> List[Family]:
+    """ return families linked as a binary tree: the husband of family 2f+1 and the wife of 2f+2 are children of f """
+    tree: List[Family] = []
+    for f in range(families):
+        family = Family(f"F{f}", husb=f"I{2 * f}", wife=f"I{2 * f + 1}")
+        family.chil = [f"I{2 * child + side}" for side, child in ((0, 2 * f + 1), (1, 2 * f + 2)) if child < families]
+        tree.append(family)
+    return tree
+
+
+def bench_kinship(families: int = 2_000) -> None:
+    """ compare US19 + US20 with a scan of the families per parent lookup and with the kinship index """
+    import user_stories as us
+
+    tree: List[Family] = family_tree(families)
+
+    def scanning() -> None:
+        for fam in tree:
+            husband, wife = app.findParents(fam.husb, tree), app.findParents(fam.wife, tree)
+            if husband and wife:
+                app.checkIfSiblings(husband, wife, tree)
+                app.checkIfSiblings(husband, fam, tree)
+                app.checkIfSiblings(wife, fam, tree)
+
+    before: float = seconds(scanning)
+    after: float = seconds(lambda: (us.firstCousinShouldNotMarry(tree), us.auntsAndUncle(tree)))
+    print(f"kinship: US19 + US20 over {families} families | scans {before:.2f} s | index {after:.4f} s")
+
+
+def bench_closures(families: int = 100_000, pairs: int = 1_000_000) -> None:
+    """ time is_ancestor over many pairs with the memoized closures, against a walk per query """
+    import random
+    from kinship import Kinship
+
+    kinship = Kinship(family_tree(families))
+    people: List[str] = [f"I{i}" for i in range(2 * families)]
+    rng = random.Random(0)
+    queries: List[Tuple[str, str]] = [(rng.choice(people), rng.choice(people)) for _ in range(pairs)]
+    walked: float = seconds(lambda: [any(_id == a for _id, _ in kinship.iter_ancestors(b))
+                                     for a, b in queries[:10_000]])
+    memoized: float = seconds(lambda: [kinship.is_ancestor(a, b) for a, b in queries])
+    print(f"closures: is_ancestor over {families} families | walk {walked / 10_000 * 1e6:.1f} us/query | "
+          f"memoized {memoized / pairs * 1e6:.2f} us/query over {pairs} pairs, cold cache")
+
+
+def bench_consanguinity(families: int = 100_000) -> None:
+    """ compare the bitset pass with the memoized closures for a shared ancestor of every couple """
+    from kinship import Kinship
+    from consanguinity import related_couples, GENERATIONS
+
+    tree: List[Family] = family_tree(families)
+    for f in range(0, families // 4, 50):  # marry some first cousins: a grandson and a granddaughter of f
+        tree.append(Family(f"F{families + f}", husb=f"I{2 * (4 * f + 3)}", wife=f"I{2 * (4 * f + 6) + 1}"))
+
+    def closures() -> int:
+        kinship = Kinship(tree)
+        return sum(1 for fam in tree if kinship.ancestors(fam.husb, GENERATIONS) & kinship.ancestors(
+            fam.wife, GENERATIONS) | {fam.husb} & kinship.ancestors(fam.wife, GENERATIONS)
+            | {fam.wife} & kinship.ancestors(fam.husb, GENERATIONS))
+
+    before: float = seconds(closures)
+    after: float = seconds(related_couples, tree)
+    print(f"consanguinity: {len(tree)} couples within {GENERATIONS} generations | closures {before:.2f} s, "
+          f"peak {peak_megabytes(closures):.0f} MB | bitsets {after:.2f} s, "
+          f"peak {peak_megabytes(related_couples, tree):.0f} MB | {len(related_couples(tree))} related")
+
+
+def cold_start_seconds(code: str, runs: int = 5) -> float:
+    """ return the best wall time of running code in a fresh interpreter """
+    best: float = float('inf')
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_import() -> None:
+    """ compare a lazy import of user_stories with one that loads everything up front, as before """
+    eager: float = cold_start_seconds("import prettytable, dateutil.relativedelta, user_stories; user_stories.families")
+    lazy: float = cold_start_seconds("import user_stories")
+    print(f"import user_stories: eager {eager * 1000:.0f} ms | lazy {lazy * 1000:.0f} ms")
+
+
+def main(argv: List[str] = None) -> None:
+    """ generate a synthetic file and run the benchmarks on it """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--individuals", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bench_import()
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "synthetic.ged")
+        synthetic.write_file(path, args.individuals, seed=args.seed)
+        bench_tokenizer(app.get_lines(path))
+        bench_records()
+        bench_dates(path)
+        bench_mmap(path)
+        bench_cache(path)
+        bench_workers(path, args.workers)
+        bench_columnar(path)
+        bench_findings(path)
+        bench_sqlite(path)
+        bench_events(path)
+        bench_duplicates(path)
+        bench_tables(path)
+    bench_kinship()
+    bench_closures()
+    bench_consanguinity()
+    bench_fuzzy()
+    bench_siblings()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
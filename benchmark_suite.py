@@ -0,0 +1,246 @@
+""" Benchmark suite: parsing, index build, printing and every user story on generated trees
+
+    For each size a synthetic tree is written with synthetic.write_file, then each stage is run
+    twice: once for its wall time and once under tracemalloc for its peak memory. A stage that
+    runs longer than the budget is stopped and recorded as timed out, and is skipped at the
+    larger sizes, as is a stage that would run over the budget even if its cost were linear.
+
+    The results go to a JSON file, one entry per stage and size, with the commit and Python
+    version they were measured with, so that runs of different versions can be compared.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import platform
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+import app
+import rules
+import synthetic
+from models import GedcomIndex
+from findings import SummarySink, reporting_to
+
+SIZES: List[int] = [1_000, 100_000, 1_000_000]  # individuals
+BUDGET: float = 60.0  # seconds a timed run may take
+TRACING_SLOWDOWN: float = 4.0  # a run under tracemalloc may take this many times the budget
+RESULTS_PATH: str = "benchmark_results.json"
+
+OK: str = 'ok'
+TIMEOUT: str = 'timeout'
+SKIPPED: str = 'skipped'
+FAILED: str = 'error'
+
+
+class Measurement:
+    """ holds the cost of one stage on one tree """
+    __slots__ = ('stage', 'size', 'items', 'unit', 'seconds', 'peak_megabytes', 'status', 'note')
+
+    def __init__(self, stage: str, size: int, items: int, unit: str):
+        """ store Measurement info """
+        self.stage = stage
+        self.size = size  # individuals in the tree
+        self.items = items  # what the stage goes through: lines, records or rule calls
+        self.unit = unit
+        self.seconds: Optional[float] = None
+        self.peak_megabytes: Optional[float] = None
+        self.status: str = OK
+        self.note: str = ""
+
+    def to_dict(self) -> Dict:
+        """ return the measurement as a JSON-serializable dict """
+        per_second: Optional[float] = self.items / self.seconds if self.seconds else None
+        return {'stage': self.stage, 'size': self.size, 'status': self.status, 'seconds': self.seconds,
+                'peak_megabytes': self.peak_megabytes, 'items': self.items, 'unit': self.unit,
+                'per_second': per_second, 'note': self.note}
+
+
+class OverBudget(BaseException):
+    """ raised in a stage that runs out of time; not an Exception, so that the checks that catch
+        every Exception, like rules.run_rules, let it through """
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float) -> Iterator[None]:
+    """ raise OverBudget in the block after seconds; no limit where there is no interval timer """
+    if not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise OverBudget(f"over {seconds:.0f} s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class Suite:
+    """ runs the stages on trees of growing size and collects their measurements """
+    def __init__(self, budget: float = BUDGET, only: Optional[List[str]] = None,
+                 progress: Optional[Callable[[Measurement], None]] = None):
+        """ store Suite info; only keeps the stages whose name contains one of its strings, and
+            progress is called with each measurement once it is taken """
+        self.budget = budget
+        self.only = only
+        self.progress = progress
+        self.measurements: List[Measurement] = []
+        self.last: Dict[str, Measurement] = {}  # stage -> its measurement on the previous tree
+
+    def wanted(self, stage: str) -> bool:
+        """ return True if the stage is selected """
+        return not self.only or any(part in stage for part in self.only)
+
+    def measure(self, stage: str, size: int, unit: str, items: int, function: Callable, *args):
+        """ time a call, then trace its memory; return its result, None if it did not finish """
+        measurement: Measurement = Measurement(stage, size, items, unit)
+        self.measurements.append(measurement)
+        try:
+            return self.take(measurement, function, *args)
+        finally:
+            self.last[stage] = measurement
+            if self.progress is not None:
+                self.progress(measurement)
+
+    def take(self, measurement: Measurement, function: Callable, *args):
+        """ fill in a measurement, skipping a stage that was or would be over the budget """
+        last: Optional[Measurement] = self.last.get(measurement.stage)
+        if last is not None and last.status in (TIMEOUT, SKIPPED):
+            measurement.status, measurement.note = SKIPPED, f"over the budget at {last.size} individuals"
+            return None
+        if last is not None and last.status == OK and last.seconds * measurement.size / last.size > self.budget:
+            measurement.status = SKIPPED
+            measurement.note = f"would take over {last.seconds * measurement.size / last.size:.0f} s at linear cost"
+            return None
+
+        try:
+            with time_limit(self.budget):
+                start: float = time.perf_counter()
+                result = function(*args)
+                measurement.seconds = time.perf_counter() - start
+        except OverBudget as error:
+            measurement.status, measurement.note = TIMEOUT, str(error)
+            return None
+        except Exception as error:  # a stage failing on this tree must not stop the suite
+            measurement.status, measurement.note = FAILED, f"{type(error).__name__}: {error}"
+            return None
+
+        tracemalloc.start()
+        try:
+            with time_limit(self.budget * TRACING_SLOWDOWN):
+                function(*args)
+            measurement.peak_megabytes = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        except OverBudget:
+            measurement.note = "peak memory not measured: the traced run ran over the budget"
+        finally:
+            tracemalloc.stop()
+        return result
+
+    def run(self, path: str, size: int) -> None:
+        """ run every stage on the tree of a .ged file of size individuals """
+        lines: Optional[List[str]] = None
+        if self.wanted('get_lines') or self.wanted('generate_classes'):
+            with open(path) as file:
+                count: int = sum(1 for _ in file)
+            lines = self.measure('get_lines', size, 'lines', count, app.get_lines, path)
+        if lines is not None and self.wanted('generate_classes'):
+            self.measure('generate_classes', size, 'lines', len(lines), app.generate_classes, lines)
+        lines = None  # the records are parsed from the file again below; free the lines first
+
+        individuals, families = app.parse_file(path)
+        records: int = len(individuals) + len(families)
+        if self.wanted('index'):
+            self.measure('index', size, 'records', records, GedcomIndex, individuals, families)
+        index: GedcomIndex = GedcomIndex(individuals, families)
+
+        if self.wanted('pretty_print'):
+            def printed() -> None:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    app.pretty_print(individuals, families)
+            self.measure('pretty_print', size, 'rows', records, printed)
+
+        checks: Dict[str, int] = {rules.INDIVIDUAL: len(individuals), rules.FAMILY: len(families),
+                                  rules.GLOBAL: records}
+        for rule in rules.registered_rules():
+            stage: str = f"{rule.id} {rule.name}"
+            if self.wanted(stage):
+                with reporting_to(SummarySink()):
+                    stats = self.measure(stage, size, 'records', checks[rule.scope], rules.run_rules, index, [rule])
+                if stats is not None and stats[rule.name].errors:
+                    self.measurements[-1].note = f"{stats[rule.name].errors} of {stats[rule.name].calls} calls raised"
+
+    def results(self, sizes: List[int], seed: int) -> Dict:
+        """ return the measurements and what they were measured with, as a JSON-serializable dict """
+        return {'created': datetime.now().isoformat(timespec='seconds'), 'commit': commit(),
+                'python': platform.python_version(), 'platform': platform.platform(),
+                'sizes': sizes, 'seed': seed, 'budget_seconds': self.budget,
+                'measurements': [measurement.to_dict() for measurement in self.measurements]}
+
+
+def commit() -> Optional[str]:
+    """ return the commit of the working tree, None outside a git repository """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int] = SIZES, seed: int = 0, budget: float = BUDGET, only: Optional[List[str]] = None,
+              output: Optional[str] = RESULTS_PATH, progress: Optional[Callable[[Measurement], None]] = None) -> Dict:
+    """ run the suite on a generated tree of each size, write the results to output and return them """
+    suite: Suite = Suite(budget, only, progress)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, f"synthetic-{size}.ged")
+            synthetic.write_file(path, size, seed=seed)
+            suite.run(path, size)
+    results: Dict = suite.results(sizes, seed)
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=1)
+    return results
+
+
+def format_measurement(measurement: Measurement) -> str:
+    """ return one line about a measurement """
+    if measurement.status != OK:
+        return f"{measurement.size:>9} {measurement.stage:<50} {measurement.status}: {measurement.note}"
+    peak: str = "-" if measurement.peak_megabytes is None else f"{measurement.peak_megabytes:.1f} MB"
+    return (f"{measurement.size:>9} {measurement.stage:<50} {measurement.seconds:>9.3f} s {peak:>11} "
+            f"{measurement.items / measurement.seconds if measurement.seconds else 0:>13,.0f} {measurement.unit}/s")
+
+
+def main(argv: List[str] = None) -> None:
+    """ run the suite and write its results file """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="benchmark parsing, printing and the user stories")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES, help="individuals of the generated trees")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="seconds a stage may take")
+    parser.add_argument("--only", nargs='+', help="run the stages whose name contains one of these")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    args = parser.parse_args(argv)
+
+    run_suite(args.sizes, args.seed, args.budget, args.only, args.output,
+              lambda measurement: print(format_measurement(measurement), flush=True))
+    print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
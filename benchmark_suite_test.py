@@ -0,0 +1,51 @@
+""" Implement test cases for the benchmark suite
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+import os
+import json
+import tempfile
+import unittest
+from typing import Dict
+
+import benchmark_suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """ test class of the suite """
+
+    def test_benchmark_suite(self):
+        """ test the suite writes its measurements and stops and skips the stages over the budget """
+        with tempfile.TemporaryDirectory() as directory:
+            output: str = os.path.join(directory, "results.json")
+            benchmark_suite.run_suite([300], only=['get_lines', 'generate_classes', 'pretty_print', 'US15'],
+                                      output=output)
+            with open(output) as file:
+                results: Dict = json.load(file)
+        self.assertEqual([measurement['stage'] for measurement in results['measurements']],
+                         ['get_lines', 'generate_classes', 'pretty_print', 'US15 fewer_than_15_siblings'])
+        for measurement in results['measurements']:
+            self.assertEqual(measurement['status'], benchmark_suite.OK)
+            self.assertEqual(measurement['size'], 300)
+            self.assertGreater(measurement['per_second'], 0)
+            self.assertIsNotNone(measurement['peak_megabytes'])
+
+        def spin() -> None:
+            while True:
+                pass
+
+        suite = benchmark_suite.Suite(budget=0.05)
+        self.assertIsNone(suite.measure('spin', 10, 'calls', 1, spin))
+        self.assertIsNone(suite.measure('spin', 100, 'calls', 1, spin))
+        self.assertEqual(suite.measure('sum', 10, 'calls', 1, sum, [1, 2]), 3)
+        suite.last['sum'].seconds = 0.01
+        self.assertIsNone(suite.measure('sum', 1000, 'calls', 1, sum, [1, 2]))  # 1 s at linear cost
+        self.assertIsNone(suite.measure('fail', 10, 'calls', 1, int, 'x'))
+        self.assertEqual([measurement.status for measurement in suite.measurements],
+                         [benchmark_suite.TIMEOUT, benchmark_suite.SKIPPED, benchmark_suite.OK,
+                          benchmark_suite.SKIPPED, benchmark_suite.FAILED])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False, verbosity=2)
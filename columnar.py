@@ -0,0 +1,124 @@
+""" Columnar, array-backed view of a parsed tree for vectorized checks
+
+    NumPy is an optional dependency; it is only needed when this module is used.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from models import Individual, Family
+
+MISSING: int = 0  # the ordinal of a missing or unreadable date; real ordinals start at 1
+NO_ROW: int = -1  # the row of a missing husband, wife or parent family
+SEX_CODES: Dict[Optional[str], int] = {'M': 1, 'F': 2}  # anything else is 0
+EPOCH: int = date(1970, 1, 1).toordinal()
+YEARS_150: int = 54750  # days, as in user_stories.less_than_150
+
+
+def to_ordinal(event) -> int:
+    """ return the day ordinal of an event, or MISSING """
+    if not event:
+        return MISSING
+    try:
+        return event.datetime.toordinal()
+    except ValueError:
+        return MISSING
+
+
+def year_month_day(ordinals: np.ndarray) -> np.ndarray:
+    """ return dates as yyyymmdd integers; the difference of two of them // 10000 is an age in years """
+    days = (ordinals.astype(np.int64) - EPOCH).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    return years * 10000 + (months.astype(np.int64) % 12 + 1) * 100 + (days - months).astype(np.int64) + 1
+
+
+class ColumnarStore:
+    """ holds the individuals and families of a tree as NumPy arrays, one row per record
+
+        individuals: birt, deat (day ordinals), sex (0, 1 = M, 2 = F), famc (row of the first parent family)
+        families: husb, wife (individual rows), marr, div (day ordinals), children in CSR form
+        (the children of family f are child_rows[child_offsets[f]:child_offsets[f + 1]])
+    """
+    def __init__(self, individuals: Iterable[Individual], families: Iterable[Family]):
+        """ build the arrays in one pass over the records """
+        individuals = list(individuals)
+        families = list(families)
+        self.individual_ids: List[str] = [individual.id for individual in individuals]
+        self.family_ids: List[str] = [family.id for family in families]
+        self.individual_rows: Dict[str, int] = {}
+        self.family_rows: Dict[str, int] = {}
+        for row, _id in enumerate(self.individual_ids):
+            self.individual_rows.setdefault(_id, row)
+        for row, _id in enumerate(self.family_ids):
+            self.family_rows.setdefault(_id, row)
+
+        def individual_row(_id: str) -> int:
+            return self.individual_rows.get(_id, NO_ROW)
+
+        self.birt: np.ndarray = np.array([to_ordinal(ind.birt) for ind in individuals], dtype=np.int32)
+        self.deat: np.ndarray = np.array([to_ordinal(ind.deat) for ind in individuals], dtype=np.int32)
+        self.sex: np.ndarray = np.array([SEX_CODES.get(ind.sex, 0) for ind in individuals], dtype=np.int8)
+        self.famc: np.ndarray = np.array([self.family_rows.get(ind.famc[0], NO_ROW) if ind.famc else NO_ROW
+                                          for ind in individuals], dtype=np.int32)
+
+        self.husb: np.ndarray = np.array([individual_row(fam.husb) for fam in families], dtype=np.int32)
+        self.wife: np.ndarray = np.array([individual_row(fam.wife) for fam in families], dtype=np.int32)
+        self.marr: np.ndarray = np.array([to_ordinal(fam.marr) for fam in families], dtype=np.int32)
+        self.div: np.ndarray = np.array([to_ordinal(fam.div) for fam in families], dtype=np.int32)
+        self.child_offsets: np.ndarray = np.cumsum([0] + [len(fam.chil) for fam in families], dtype=np.int64)
+        self.child_rows: np.ndarray = np.array([individual_row(child) for fam in families for child in fam.chil],
+                                               dtype=np.int32)
+
+    def failing_individuals(self, passed: np.ndarray) -> List[str]:
+        """ return the ids of the individuals whose row is False in passed """
+        return [self.individual_ids[row] for row in np.flatnonzero(~passed)]
+
+    def failing_families(self, passed: np.ndarray) -> List[str]:
+        """ return the ids of the families whose row is False in passed """
+        return [self.family_ids[row] for row in np.flatnonzero(~passed)]
+
+
+def birth_before_death(store: ColumnarStore) -> np.ndarray:
+    """ US03: for every individual, True if there is no death or the birth is before it """
+    has_birt = store.birt != MISSING
+    return has_birt & ((store.deat == MISSING) | (store.deat > store.birt))
+
+
+def less_than_150(store: ColumnarStore, today: Optional[date] = None) -> np.ndarray:
+    """ US07: for every individual, True if they lived (or have lived so far) less than 150 years """
+    today_ordinal: int = (today or date.today()).toordinal()
+    has_birt = store.birt != MISSING
+    dead = store.deat != MISSING
+    alive_ok = ~dead & (today_ordinal - store.birt < YEARS_150)
+    dead_ok = dead & (store.birt <= store.deat) & (store.deat - store.birt < YEARS_150)
+    return has_birt & (alive_ok | dead_ok)
+
+
+def _parents_over_14(store: ColumnarStore, event: np.ndarray) -> np.ndarray:
+    """ for every family, True if both spouses were at least 14 at the date of event;
+        False when a spouse, their birth or the event is missing """
+    known = (store.husb != NO_ROW) & (store.wife != NO_ROW) & (event != MISSING)
+    husb_birt = store.birt[np.where(known, store.husb, 0)] if len(store.birt) else np.zeros_like(event)
+    wife_birt = store.birt[np.where(known, store.wife, 0)] if len(store.birt) else np.zeros_like(event)
+    known &= (husb_birt != MISSING) & (wife_birt != MISSING)
+
+    event_ymd = year_month_day(np.where(known, event, EPOCH))
+    husb_age = (event_ymd - year_month_day(np.where(known, husb_birt, EPOCH))) // 10000
+    wife_age = (event_ymd - year_month_day(np.where(known, wife_birt, EPOCH))) // 10000
+    return known & (husb_age >= 14) & (wife_age >= 14)
+
+
+def were_parents_over_14(store: ColumnarStore) -> np.ndarray:
+    """ US10: for every family, True if both parents were at least 14 at the marriage date """
+    return _parents_over_14(store, store.marr)
+
+
+def divorce_14(store: ColumnarStore) -> np.ndarray:
+    """ US54: for every family, True if both parents were at least 14 at the divorce date """
+    return _parents_over_14(store, store.div)
@@ -0,0 +1,112 @@
+""" Whole-tree consanguinity check with ancestor bitsets
+
+    The couples are taken in batches. In a batch every spouse and every ancestor of a spouse
+    within N generations gets a bit, numbered couple by couple, and each of them gets the set of
+    their own ancestors within N generations as an integer bitset, built from the bitsets of
+    their parents one generation at a time. A couple is related when the bitsets of husband and
+    wife, each with their own bit added, intersect, which covers every degree of cousin, aunt /
+    uncle and ancestor marriage in one sweep.
+
+    Numbering the bits per batch keeps a bitset at most BATCH_SIZE couples of ancestors wide
+    whatever the size of the tree, and the work and memory linear in the number of couples.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Individual, Family
+from kinship import Kinship
+
+GENERATIONS: int = 3  # up to a shared great-grandparent: second cousins
+BATCH_SIZE: int = 64  # couples numbered together
+
+
+def members(bits: int) -> Iterator[int]:
+    """ yield the bit numbers of a bitset in ascending order """
+    while bits:
+        low: int = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def generation_order(kinship: Kinship, people: Iterable[str]) -> List[str]:
+    """ return the people with every parent among them before their children, generation by
+        generation, keeping the given order within a generation; the people on a loop of descent come last """
+    people = list(dict.fromkeys(people))
+    waiting: Dict[str, int] = {_id: 0 for _id in people}
+    for _id in people:
+        waiting[_id] = sum(1 for parent in set(kinship.parents(_id)) if parent in waiting)
+    queue: deque = deque(_id for _id in people if not waiting[_id])
+    order: List[str] = []
+    while queue:
+        _id: str = queue.popleft()
+        order.append(_id)
+        for child in kinship.offspring(_id):
+            if child in waiting:
+                waiting[child] -= 1
+                if not waiting[child]:
+                    queue.append(child)
+    if len(order) < len(people):
+        placed = set(order)
+        order.extend(_id for _id in people if _id not in placed)
+    return order
+
+
+class AncestorBits:
+    """ the ancestor bitsets of a batch of couples and of their ancestors within a number of generations """
+    def __init__(self, kinship: Kinship, couples: Iterable[Tuple[str, str]], generations: Optional[int] = GENERATIONS):
+        """ number the spouses and their ancestors, then compute the bitsets; generations=None has no limit """
+        self.bit: Dict[str, int] = {}  # id -> bit
+        for couple in couples:
+            for spouse in couple:
+                for _id in (spouse, *(ancestor for ancestor, _ in kinship.iter_ancestors(spouse, generations))):
+                    self.bit.setdefault(_id, 1 << len(self.bit))
+        self.ids: List[str] = list(self.bit)  # bit number -> id
+        parents: Dict[str, List[str]] = {}
+        for _id in self.ids:
+            in_batch: List[str] = [parent for parent in dict.fromkeys(kinship.parents(_id)) if parent in self.bit]
+            if in_batch:
+                parents[_id] = in_batch
+
+        def inherited(_id: str, ancestors: Dict[str, int]) -> int:
+            bits: int = 0
+            for parent in parents[_id]:
+                bits |= self.bit[parent] | ancestors.get(parent, 0)
+            return bits
+
+        self.ancestors: Dict[str, int] = {}
+        if generations is None:  # one sweep in generation order: the parents are done before their children
+            for _id in generation_order(kinship, parents):
+                self.ancestors[_id] = inherited(_id, self.ancestors)
+        else:  # one sweep per generation, each from the bitsets one generation shorter
+            for _ in range(generations):
+                shorter: Dict[str, int] = self.ancestors
+                self.ancestors = {_id: inherited(_id, shorter) for _id in parents}
+
+    def shared(self, id1, id2) -> List[str]:
+        """ return the ids of the common ancestors of two spouses of the batch, counting each as their own ancestor """
+        bits: int = (self.bit[id1] | self.ancestors.get(id1, 0)) & (self.bit[id2] | self.ancestors.get(id2, 0))
+        return [self.ids[number] for number in members(bits)]
+
+
+def related_couples(families: List[Family], individuals: Iterable[Individual] = (),
+                    generations: Optional[int] = GENERATIONS,
+                    batch_size: int = BATCH_SIZE) -> List[Tuple[Family, List[str]]]:
+    """ return (family, ids of the shared ancestors) for each family whose husband and wife share
+        an ancestor within generations of both, or where one descends from the other """
+    kinship: Kinship = Kinship(families, individuals)
+    couples: List[Family] = [family for family in families
+                             if family.husb not in (None, 'NA') and family.wife not in (None, 'NA')]
+
+    related: List[Tuple[Family, List[str]]] = []
+    for start in range(0, len(couples), batch_size):
+        batch: List[Family] = couples[start:start + batch_size]
+        bits: AncestorBits = AncestorBits(kinship, ((family.husb, family.wife) for family in batch), generations)
+        for family in batch:
+            shared: List[str] = bits.shared(family.husb, family.wife)
+            if shared:
+                related.append((family, shared))
+    return related
@@ -0,0 +1,269 @@
+""" Single-pass duplicate detection for US22, US23 and US24
+
+    A DuplicateFinder hashes a key of every record it is given: the id (US22), the name and
+    birth date of an individual (US23) or the spouses and marriage date of a family (US24).
+    It keeps the id of the first record of each key and a group for each key that repeats, so
+    it runs in linear time and in memory linear in the number of distinct keys, and it can be
+    fed records as app.stream_records reads them. A DuplicateIndex groups records the same way
+    and lets them be replaced or removed later, for the rules that only check changed records.
+
+    fuzzy_duplicates finds near-duplicate individuals ("John /Smith/" born 3 MAY 1900 and
+    "Jon /Smyth/" born 4 MAY 1900): people are blocked by the Soundex code of their surname and
+    their birth year, and only pairs within a block or across a new year are scored.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from datetime import date
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from models import Individual, Family
+
+Record = Union[Individual, Family]
+Candidate = Tuple[str, str, float]  # (id, id, score)
+
+SOUNDEX_CODES: Dict[str, str] = {letter: code for letters, code in
+                                 (("BFPV", "1"), ("CGJKQSXZ", "2"), ("DT", "3"), ("L", "4"), ("MN", "5"), ("R", "6"))
+                                 for letter in letters}
+THRESHOLD: float = 0.85  # lowest score reported by fuzzy_duplicates
+MAX_BLOCK: int = 200  # people in a block whose pairs are all scored
+NEIGHBORS: int = 10  # people a person is scored against in a bigger block
+
+
+def event_date(event) -> Optional[str]:
+    """ return the date of an event, or None if it is missing """
+    return event.get('date') if event else None
+
+
+def id_key(record: Record) -> Hashable:
+    """ US22: individuals and families share one id space """
+    return record.id
+
+
+def individual_key(individual: Individual) -> Optional[Hashable]:
+    """ US23: name and birth date; None when either is missing, as such records cannot be compared """
+    birth: Optional[str] = event_date(individual.birt)
+    return None if individual.name is None or birth is None else (individual.name, birth)
+
+
+def family_key(family: Family) -> Optional[Hashable]:
+    """ US24: husband, wife and marriage date; None when the marriage date is missing """
+    marriage: Optional[str] = event_date(family.marr)
+    return None if marriage is None else (family.husb, family.wife, marriage)
+
+
+class DuplicateFinder:
+    """ groups the ids of the records that share a key """
+    def __init__(self, key: Callable[[Record], Optional[Hashable]], kinds: tuple = (Individual, Family)):
+        """ store DuplicateFinder info; records that are not of one of kinds are ignored """
+        self.key = key
+        self.kinds = kinds
+        self.first: Dict[Hashable, str] = {}  # key -> id of its first record
+        self.groups: Dict[Hashable, List[str]] = {}  # key -> ids of all its records, for repeated keys only
+
+    def add(self, record: Record) -> bool:
+        """ count one record and return True if a record with the same key came before it """
+        if not isinstance(record, self.kinds):
+            return False
+        key: Optional[Hashable] = self.key(record)
+        if key is None:
+            return False
+        if key not in self.first:
+            self.first[key] = record.id
+            return False
+        self.groups.setdefault(key, [self.first[key]]).append(record.id)
+        return True
+
+    def update(self, records: Iterable[Record]) -> 'DuplicateFinder':
+        """ count every record of an iterable """
+        for record in records:
+            self.add(record)
+        return self
+
+    def duplicates(self) -> List[List[str]]:
+        """ return the ids of each group of records sharing a key, the groups in the order their keys first repeat """
+        return list(self.groups.values())
+
+
+class DuplicateIndex:
+    """ groups the ids of the records that share a key, one record per id, and lets a record be replaced
+        or removed later; an id keeps its place, so the first record of a key stays the one that a
+        DuplicateFinder over the records, in the order they were first added, would keep """
+    def __init__(self, key: Callable[[Record], Optional[Hashable]]):
+        """ store DuplicateIndex info """
+        self.key = key
+        self.keys: Dict[str, Optional[Hashable]] = {}  # id -> key of its record
+        self.places: Dict[str, int] = {}  # id -> place of its record
+        self.groups: Dict[Hashable, List[str]] = {}  # key -> ids of its records, by place
+        self.repeated: Set[Hashable] = set()  # keys of more than one record
+        self.count: int = 0  # records added, the place of the next new id
+
+    def remove(self, record_id: str) -> List[str]:
+        """ forget the record with an id and return the ids of the records that shared its key """
+        self.places.pop(record_id, None)
+        key: Optional[Hashable] = self.keys.pop(record_id, None)
+        if key is None:
+            return []
+        group: List[str] = self.groups[key]
+        group.remove(record_id)
+        if len(group) < 2:
+            self.repeated.discard(key)
+        if not group:
+            del self.groups[key]
+        return list(group)
+
+    def add(self, record: Record) -> List[str]:
+        """ add a record in place of the one with its id and return the ids of the records that shared
+            the key of either, its own id included """
+        place: int = self.places.get(record.id, self.count)
+        shared: List[str] = self.remove(record.id)
+        self.places[record.id] = place
+        self.count += 1
+        key: Optional[Hashable] = self.key(record)
+        self.keys[record.id] = key
+        if key is None:
+            return shared + [record.id]
+        group: List[str] = self.groups.setdefault(key, [])
+        group.append(record.id)
+        group.sort(key=self.places.__getitem__)
+        if len(group) > 1:
+            self.repeated.add(key)
+        return shared + group
+
+    def is_first(self, record_id: str) -> bool:
+        """ return True if no record with the same key comes before the one with an id """
+        key: Optional[Hashable] = self.keys[record_id]
+        return key is None or self.groups[key][0] == record_id
+
+    def duplicates(self) -> List[str]:
+        """ return the ids of the records with the key of a record before them, by place """
+        return sorted((_id for key in self.repeated for _id in self.groups[key][1:]), key=self.places.__getitem__)
+
+
+def find_duplicates(records: Iterable[Record]) -> Dict[str, DuplicateFinder]:
+    """ count the records of a tree, streamed in any order, for US22, US23 and US24 in one pass """
+    finders: Dict[str, DuplicateFinder] = {'US22': DuplicateFinder(id_key),
+                                           'US23': DuplicateFinder(individual_key, (Individual,)),
+                                           'US24': DuplicateFinder(family_key, (Family,))}
+    for record in records:
+        for finder in finders.values():
+            finder.add(record)
+    return finders
+
+
+@lru_cache(maxsize=None)  # a tree has far fewer surnames than people
+def soundex(name: str) -> str:
+    """ return the American Soundex code of a name, "" if it has no letters """
+    letters: str = "".join(letter for letter in name.upper() if "A" <= letter <= "Z")
+    if not letters:
+        return ""
+    code: str = letters[0]
+    previous: str = SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit: str = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "HW":  # H and W do not separate letters with the same code
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def split_name(name: Optional[str]) -> Tuple[str, str]:
+    """ return (given names, surname) of a GEDCOM name like 'John /Smith/' """
+    given, _, rest = (name or "").partition("/")
+    return given.strip(), rest.partition("/")[0].strip()
+
+
+class Person:
+    """ holds what fuzzy_duplicates compares of an individual """
+    __slots__ = ('id', 'given', 'surname', 'sex', 'ordinal')
+
+    def __init__(self, individual: Individual):
+        """ store Person info """
+        self.id = individual.id
+        given, surname = split_name(individual.name)
+        self.given, self.surname, self.sex = given.lower(), surname.lower(), individual.sex
+        try:
+            self.ordinal: Optional[int] = individual.birt.datetime.toordinal() if individual.birt else None
+        except (TypeError, ValueError):
+            self.ordinal = None
+
+
+def similarity(a: Person, b: Person) -> float:
+    """ return a score from 0 to 1: the given names and surnames compared letter by letter and the
+        birth dates by their distance, a year apart or more scoring 0; 0 for people of different sexes """
+    if a.sex and b.sex and a.sex != b.sex:
+        return 0.0
+    days: int = 0 if a.ordinal is None or b.ordinal is None else abs(a.ordinal - b.ordinal)
+    return (0.35 * SequenceMatcher(None, a.given, b.given).ratio()
+            + 0.35 * SequenceMatcher(None, a.surname, b.surname).ratio()
+            + 0.3 * max(0.0, 1 - days / 365))
+
+
+def blocks(individuals: Iterable[Individual]) -> Dict[Tuple[str, Optional[int]], List[Person]]:
+    """ group people by the Soundex code of their surname and their birth year (None when unknown) """
+    grouped: Dict[Tuple[str, Optional[int]], List[Person]] = {}
+    for individual in individuals:
+        person: Person = Person(individual)
+        year: Optional[int] = None if person.ordinal is None else date.fromordinal(person.ordinal).year
+        grouped.setdefault((soundex(person.surname), year), []).append(person)
+    return grouped
+
+
+def pairs(people: List[Person]) -> Iterator[Tuple[Person, Person]]:
+    """ yield every pair of a block of up to MAX_BLOCK people; in a bigger block, sorted by given name
+        and birth date, yield each person with their NEIGHBORS next people only """
+    if len(people) <= MAX_BLOCK:
+        for i, a in enumerate(people):
+            for b in people[i + 1:]:
+                yield a, b
+        return
+    people = sorted(people, key=lambda person: (person.given, person.ordinal or 0))
+    for i, a in enumerate(people):
+        for b in people[i + 1:i + 1 + NEIGHBORS]:
+            yield a, b
+
+
+def fuzzy_duplicates(individuals: Iterable[Individual], threshold: float = THRESHOLD,
+                     only: Optional[Set[str]] = None) -> List[Candidate]:
+    """ return the pairs of individuals that look like the same person, with their score, best first;
+        given only, a set of ids, just the pairs with one of them
+
+        a pair is only scored when both surnames have the same Soundex code and both people were
+        born in the same year, or close to either side of a new year, so the work grows with the
+        size of the blocks and not with the square of the number of people
+    """
+    max_days: float = 365 * (1 - max(0.0, threshold - 0.7) / 0.3)  # further apart, even equal names score less
+    grouped = blocks(individuals)
+    candidates: List[Candidate] = []
+    keys: Optional[Set] = None if only is None else {  # the blocks with someone of only
+        key for key, people in grouped.items() if any(person.id in only for person in people)}
+
+    def score(block_pairs: Iterable[Tuple[Person, Person]]) -> None:
+        for a, b in block_pairs:
+            if only is not None and a.id not in only and b.id not in only:
+                continue
+            if a.id != b.id and (a.ordinal is None or b.ordinal is None or abs(a.ordinal - b.ordinal) <= max_days):
+                value: float = similarity(a, b)
+                if value >= threshold:
+                    candidates.append((a.id, b.id, round(value, 3)))
+
+    for (code, year), people in grouped.items():
+        if not code:
+            continue
+        if keys is None or (code, year) in keys:
+            score(pairs(people))
+        following: List[Person] = [] if year is None else grouped.get((code, year + 1), [])
+        if following and (keys is None or (code, year) in keys or (code, year + 1) in keys):
+            # pairs across the new year, of the people born within max_days of it
+            new_year: int = date(year + 1, 1, 1).toordinal()
+            late: List[Person] = [person for person in people if new_year - person.ordinal <= max_days]
+            early: List[Person] = [person for person in following if person.ordinal - new_year < max_days]
+            score((a, b) for a, b in pairs(late + early) if (a.ordinal < new_year) != (b.ordinal < new_year))
+    candidates.sort(key=lambda candidate: -candidate[2])
+    return candidates
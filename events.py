@@ -0,0 +1,105 @@
+""" Sorted index of the dated events of a tree, for date window and anniversary queries
+
+    EventIndex keeps the BIRT, DEAT, MARR and DIV events of the records sorted twice: by day
+    ordinal, for "what happened between two dates", and by day of the year, for "whose birthday
+    or anniversary falls in the next N days". Both are answered by binary search, so a daily
+    reminder job builds the index once and queries it in time proportional to the answer.
+
+    An anniversary of 29 February falls on 28 February in common years.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from bisect import bisect_left, bisect_right
+from calendar import isleap
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from models import Individual, Family, Event
+
+TAGS: Dict[str, str] = {'BIRT': 'birt', 'DEAT': 'deat', 'MARR': 'marr', 'DIV': 'div'}  # tag -> attribute
+WINDOW: int = 30  # days, as in the US35 - US39 and US53 listings
+
+Occurrence = Tuple[str, date, date]  # (record id, date of the event, date it falls on in the window)
+
+
+def day_key(month: int, day: int) -> int:
+    """ return a sortable key of a day of the year; 29 February has its own key, after 28 February """
+    return month * 32 + day
+
+
+class EventIndex:
+    """ the dated events of a set of records, by tag, sorted by date and by day of the year """
+    def __init__(self, records: Iterable[Union[Individual, Family]], tags: Iterable[str] = TAGS):
+        """ index the events with a readable date; missing and unreadable dates are left out """
+        tags = list(tags)
+        by_date: Dict[str, List[Tuple[int, str]]] = {tag: [] for tag in tags}
+        for record in records:
+            for tag in tags:
+                event = getattr(record, TAGS[tag], None)
+                if isinstance(event, Event):
+                    try:
+                        by_date[tag].append((event.datetime.toordinal(), record.id))
+                    except (TypeError, ValueError):
+                        pass
+
+        self.ordinals: Dict[str, List[int]] = {}
+        self.ids: Dict[str, List[str]] = {}
+        self.day_keys: Dict[str, List[int]] = {}
+        self.day_ordinals: Dict[str, List[int]] = {}
+        self.day_ids: Dict[str, List[str]] = {}
+        for tag, events in by_date.items():
+            events.sort()
+            self.ordinals[tag] = [ordinal for ordinal, _ in events]
+            self.ids[tag] = [_id for _, _id in events]
+            by_day: List[Tuple[int, int, str]] = []
+            for ordinal, _id in events:
+                day: date = date.fromordinal(ordinal)
+                by_day.append((day_key(day.month, day.day), ordinal, _id))
+            by_day.sort()
+            self.day_keys[tag] = [key for key, _, _ in by_day]
+            self.day_ordinals[tag] = [ordinal for _, ordinal, _ in by_day]
+            self.day_ids[tag] = [_id for _, _, _id in by_day]
+
+    def between(self, tag: str, start: date, end: date) -> List[Tuple[str, date]]:
+        """ return (record id, date) of the events dated from start to end inclusive, by date """
+        ordinals: List[int] = self.ordinals[tag]
+        low: int = bisect_left(ordinals, start.toordinal())
+        high: int = bisect_right(ordinals, end.toordinal())
+        return [(self.ids[tag][i], date.fromordinal(ordinals[i])) for i in range(low, high)]
+
+    def recent(self, tag: str, today: Optional[date] = None, days: int = WINDOW) -> List[Tuple[str, date]]:
+        """ return (record id, date) of the events of the last days days, today included """
+        today = today or date.today()
+        return self.between(tag, today - timedelta(days=days), today)
+
+    def upcoming(self, tag: str, today: Optional[date] = None, days: int = WINDOW) -> List[Occurrence]:
+        """ return the events whose anniversary falls from today to days days later, by the day it falls on;
+            the window may cross the end of the year, and an event is not its own anniversary before it happened """
+        today = today or date.today()
+        end: date = today + timedelta(days=days)
+        occurrences: List[Occurrence] = []
+        for year in range(today.year, end.year + 1):
+            start_key: int = day_key(today.month, today.day) if year == today.year else day_key(1, 1)
+            end_key: int = day_key(end.month, end.day) if year == end.year else day_key(12, 31)
+            if not isleap(year) and end_key == day_key(2, 28):
+                end_key += 1  # 29 February falls on 28 February
+            occurrences.extend(self.falling_in(tag, year, start_key, end_key))
+        return occurrences
+
+    def falling_in(self, tag: str, year: int, start_key: int, end_key: int) -> List[Occurrence]:
+        """ return the events whose day of the year in year is from start_key to end_key inclusive """
+        keys: List[int] = self.day_keys[tag]
+        occurrences: List[Occurrence] = []
+        for i in range(bisect_left(keys, start_key), bisect_right(keys, end_key)):
+            month, day = divmod(keys[i], 32)
+            if month == 2 and day == 29 and not isleap(year):
+                day = 28
+            falls_on: date = date(year, month, day)
+            if self.day_ordinals[tag][i] <= falls_on.toordinal():
+                occurrences.append((self.day_ids[tag][i], date.fromordinal(self.day_ordinals[tag][i]), falls_on))
+        return occurrences
+
+    def __len__(self) -> int:
+        return sum(len(ordinals) for ordinals in self.ordinals.values())
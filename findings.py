@@ -0,0 +1,172 @@
+""" Structured findings of the user-story checks and the sinks they are reported to
+
+    A check reports a finding with report(rule_id, severity, record_ids, message, *args)
+    instead of printing it. The message is only formatted when the current sink keeps
+    findings of that severity, so a sink that drops passes never formats one.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import sys
+import json
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+PASS: str = 'pass'  # the record meets the user story
+ERROR: str = 'error'  # the record breaks the user story
+INFO: str = 'info'  # a listing, neither a pass nor an error
+
+MARKS: Dict[str, str] = {PASS: "✔ ", ERROR: "✘ ", INFO: ""}
+
+RecordIds = Union[str, Tuple]  # one record id, or a tuple of them; () for findings about the whole tree
+
+
+class Finding:
+    """ holds one result of a check """
+    __slots__ = ('rule_id', 'record_ids', 'severity', 'message', 'marked')
+
+    def __init__(self, rule_id: str, record_ids: Tuple, severity: str, message: str, marked: bool = True):
+        """ store Finding info """
+        self.rule_id = rule_id
+        self.record_ids = record_ids
+        self.severity = severity
+        self.message = message
+        self.marked = marked  # False for a line printed without a ✔ / ✘ mark before the findings
+
+    def to_dict(self) -> Dict:
+        """ return the finding as a JSON-serializable dict """
+        return {'rule_id': self.rule_id, 'record_ids': list(self.record_ids),
+                'severity': self.severity, 'message': self.message}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Finding) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Finding({self.rule_id!r}, {self.record_ids!r}, {self.severity!r}, {self.message!r})"
+
+
+class Sink:
+    """ counts the findings reported to it by rule and severity and keeps none of them
+
+        subclasses keep the findings of the severities wants() accepts; with passes=False
+        they only count passing records (the summary-only mode)
+    """
+    def __init__(self, passes: bool = True):
+        """ store Sink info """
+        self.passes = passes
+        self.counts: Counter = Counter()  # (rule_id, severity) -> findings
+
+    def wants(self, severity: str) -> bool:
+        """ return True if findings of this severity are formatted and written """
+        return False
+
+    def write(self, finding: Finding) -> None:
+        """ keep one finding """
+
+    def flush(self) -> None:
+        """ write out whatever is buffered """
+
+    def summary(self) -> List[str]:
+        """ return one line per rule: its passes, errors and infos """
+        rules: Dict[str, Counter] = {}
+        for (rule_id, severity), count in self.counts.items():
+            rules.setdefault(rule_id, Counter())[severity] = count
+        return [f"{rule_id}: {counts[PASS]} passed, {counts[ERROR]} errors, {counts[INFO]} infos"
+                for rule_id, counts in sorted(rules.items())]
+
+
+class SummarySink(Sink):
+    """ counts every finding and formats none of them """
+
+
+class CollectorSink(Sink):
+    """ keeps the findings in memory, in the order they were reported """
+    def __init__(self, passes: bool = True):
+        """ store CollectorSink info """
+        super().__init__(passes)
+        self.findings: List[Finding] = []
+
+    def wants(self, severity: str) -> bool:
+        return self.passes or severity != PASS
+
+    def write(self, finding: Finding) -> None:
+        self.findings.append(finding)
+
+
+class TextSink(Sink):
+    """ writes findings as ✔ / ✘ lines, buffering buffer_size lines per write to the stream
+
+        the stream defaults to the sys.stdout of the moment the lines are written
+    """
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = 1, passes: bool = True):
+        """ store TextSink info """
+        super().__init__(passes)
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+
+    def wants(self, severity: str) -> bool:
+        return self.passes or severity != PASS
+
+    def format(self, finding: Finding) -> str:
+        """ return the line written for a finding """
+        return (MARKS[finding.severity] if finding.marked else "") + finding.message
+
+    def write(self, finding: Finding) -> None:
+        self.buffer.append(self.format(finding))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            stream: TextIO = self.stream or sys.stdout
+            stream.write("\n".join(self.buffer) + "\n")
+            self.buffer.clear()
+
+
+class JsonlSink(TextSink):
+    """ writes findings as JSON lines """
+    def format(self, finding: Finding) -> str:
+        return json.dumps(finding.to_dict(), ensure_ascii=False)
+
+
+_sink: Sink = TextSink()  # prints every finding as it is reported, like the checks used to
+
+
+def get_sink() -> Sink:
+    """ return the sink findings are currently reported to """
+    return _sink
+
+
+def set_sink(sink: Sink) -> Sink:
+    """ report findings to sink from now on and return the previous sink """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+@contextmanager
+def reporting_to(sink: Sink) -> Iterator[Sink]:
+    """ report findings to sink inside the with block, then flush it and restore the previous sink """
+    previous: Sink = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        set_sink(previous)
+
+
+def report(rule_id: str, severity: str, record_ids: RecordIds, message: str, *args, marked: bool = True) -> None:
+    """ report a finding to the current sink
+
+        message is a str.format template filled with args, or with the record ids when there
+        are no args; it is only formatted if the sink wants findings of this severity.
+        marked=False keeps the ✔ / ✘ mark off the text line, for the checks that never printed one
+    """
+    sink: Sink = _sink
+    sink.counts[rule_id, severity] += 1
+    if sink.wants(severity):
+        ids: Tuple = record_ids if isinstance(record_ids, tuple) else (record_ids,)
+        sink.write(Finding(rule_id, ids, severity, message.format(*(args or ids)), marked))
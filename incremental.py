@@ -0,0 +1,289 @@
+""" Incremental revalidation of a .ged file after small edits
+
+    A Validation keeps the parse of a file, a digest of each of its level-0 records and the
+    results and findings of every rule. update() hashes the records of the file again,
+    parses only the records whose digest changed and re-runs the per-record rules on them
+    and on the families they belong to. A global rule runs again when a record of a kind it
+    takes (individuals or families) changed. One that takes changed only checks the changed
+    records and their relatives again, with what it kept in its state from the last run: its
+    new findings replace the ones that name those records or no record, and the ones about
+    the same records, and its other findings are kept.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import re
+import pickle
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, Union
+
+import mmap_parser
+from app import assemble_records
+from models import Individual, Family, GedcomIndex
+from findings import PASS, Finding, CollectorSink, get_sink, reporting_to
+from rules import Rule, RuleStats, FAMILY, INDIVIDUAL, GLOBAL, registered_rules, run_rules
+
+Key = Tuple[str, Optional[str]]  # (rule name, record id); the record id of a global rule is None
+
+
+# a level-0 line after the first line, from its newline; xref is set when it starts an INDI or FAM record
+# (searching for the newline is much faster than for ^ in MULTILINE mode)
+RECORD_REGEX: Pattern = re.compile(rb'\n0 (?:(?P<xref>[^\r\n]*) (?:INDI|FAM)\r?(?=\n|$))?')
+FIRST_RECORD_REGEX: Pattern = re.compile(rb'0 (?:(?P<xref>[^\r\n]*) (?:INDI|FAM)\r?(?=\n|$))?')
+
+
+def record_ranges(buffer) -> Dict[str, List[Tuple[int, int]]]:
+    """ return the byte ranges of the INDI and FAM records of a buffer by xref, in file order """
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    first = FIRST_RECORD_REGEX.match(buffer)
+    xref: Optional[bytes] = first and first.group('xref')
+    start: int = 0
+
+    for match in RECORD_REGEX.finditer(buffer):
+        if xref is not None:
+            ranges.setdefault(xref.decode('utf-8'), []).append((start, match.start() + 1))
+        xref, start = match.group('xref'), match.start() + 1
+    if xref is not None:
+        ranges.setdefault(xref.decode('utf-8'), []).append((start, len(buffer)))
+
+    return ranges
+
+
+class RuleFindings:
+    """ holds the findings of a global rule by the record ids they name, and which of them name each record """
+    __slots__ = ('by_ids', 'by_record')
+
+    def __init__(self, findings: Iterable[Finding] = ()):
+        """ store RuleFindings info """
+        self.by_ids: Dict[Tuple, List[Finding]] = {}
+        self.by_record: Dict[str, Set[Tuple]] = {}  # record id -> the record ids of the findings naming it
+        for finding in findings:
+            self.add(finding)
+
+    def add(self, finding: Finding) -> None:
+        """ keep a finding after the others """
+        self.by_ids.setdefault(finding.record_ids, []).append(finding)
+        for _id in finding.record_ids:
+            self.by_record.setdefault(_id, set()).add(finding.record_ids)
+
+    def replace(self, dropped: Set[str], findings: List[Finding]) -> None:
+        """ drop the findings that name no record or one of dropped, and those whose records are all named
+            by one of the new findings, then add the new findings after the others """
+        self.by_ids.pop((), None)
+        for _id in dropped:
+            for ids in self.by_record.pop(_id, ()):
+                self.by_ids.pop(ids, None)
+        for finding in findings:
+            named: Set = set(finding.record_ids)
+            for _id in finding.record_ids:
+                for ids in [ids for ids in self.by_record.get(_id, ()) if named.issuperset(ids)]:
+                    self.by_ids.pop(ids, None)
+        for finding in findings:
+            self.add(finding)
+
+    def __iter__(self) -> Iterator[Finding]:
+        for findings in self.by_ids.values():
+            yield from findings
+
+
+def digest(buffer, ranges: List[Tuple[int, int]]) -> bytes:
+    """ return the digest of the records of one xref """
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        return hashlib.blake2b(buffer[start:end], digest_size=16).digest()
+
+    hasher = hashlib.blake2b(digest_size=16)
+    for start, end in ranges:
+        hasher.update(buffer[start:end])
+    return hasher.digest()
+
+
+class Validation:
+    """ holds the parse of a .ged file and the results and findings of every rule on it """
+    def __init__(self, path: str, rules: Optional[List[Rule]] = None):
+        """ store Validation info; nothing is parsed before the first update() """
+        self.path = path
+        self.rule_names: List[str] = [rule.name for rule in (registered_rules() if rules is None else rules)]
+        self.digests: Dict[str, bytes] = {}
+        self.index: GedcomIndex = GedcomIndex()
+        self.results: Dict[Key, object] = {}
+        self.findings: Dict[Key, List[Finding]] = {}  # of the per-record rules
+        self.rule_findings: Dict[str, RuleFindings] = {}  # of the global rules, by rule name
+        self.states: Dict[str, Dict] = {}  # what the global rules taking state kept from their last run
+        self.stats: Dict[str, RuleStats] = {}
+        self.member_families: Dict[str, Set[str]] = {}  # individual id -> ids of the families naming them
+
+    @property
+    def rules(self) -> List[Rule]:
+        registered: Dict[str, Rule] = {rule.name: rule for rule in registered_rules()}
+        return [registered[name] for name in self.rule_names]
+
+    def update(self) -> Set[str]:
+        """ bring the parse, results and findings up to date with the file and return the ids
+            of the records that were added, changed or removed since the last update """
+        with mmap_parser.open_mmap(self.path) as buffer:
+            ranges: Dict[str, List[Tuple[int, int]]] = record_ranges(buffer)
+            digests: Dict[str, bytes] = {xref: digest(buffer, xref_ranges) for xref, xref_ranges in ranges.items()}
+            changed: List[str] = [xref for xref, value in digests.items() if self.digests.get(xref) != value]
+            changed.extend(xref for xref in self.digests if xref not in digests)
+            if not changed:
+                return set()
+
+            previous: Dict[str, Union[Individual, Family]] = {}
+            for xref in changed:  # in file order, so a first parse indexes the records in file order
+                previous[xref] = self.index.get(xref) or self.index.get_family(xref)
+                records: List[Union[Individual, Family]] = [
+                    record for start, end in ranges.get(xref, [])
+                    for record in assemble_records(mmap_parser.tokenize_range(buffer, start, end))]
+                if not records or type(records[0]) is not type(previous[xref]):
+                    self.index.discard(xref)
+                if records:  # lookups get the first record of a repeated id, as in GedcomIndex
+                    self.index.add(records[0])  # a changed record keeps its place in the index
+                for record in records[1:]:
+                    self.index.append(record)
+        self.digests = digests
+
+        for xref in changed:
+            self.link_members(previous[xref], self.index.get_family(xref))
+        self.revalidate(set(changed), previous)
+        return set(changed)
+
+    def link_members(self, old: Optional[Family], new: Optional[Family]) -> None:
+        """ move the husband, wife and children of a changed family from its old record to its new one """
+        if isinstance(old, Family):
+            for member in [old.husb, old.wife, *old.chil]:
+                self.member_families.get(member, set()).discard(old.id)
+        if isinstance(new, Family):
+            for member in [new.husb, new.wife, *new.chil]:
+                self.member_families.setdefault(member, set()).add(new.id)
+
+    def affected_families(self, changed: Set[str], previous: Dict) -> Set[str]:
+        """ return the ids of the families a family rule has to check again: the changed families
+            and the families the changed individuals belong or belonged to """
+        families: Set[str] = set()
+        for xref in changed:
+            families.update(self.member_families.get(xref, ()))
+            for record in (previous.get(xref), self.index.get(xref), self.index.get_family(xref)):
+                if isinstance(record, Family):
+                    families.add(record.id)
+                elif isinstance(record, Individual):
+                    families.update(record.famc)
+                    families.update(record.fams)
+        return families
+
+    def changed_kinds(self, changed: Set[str], previous: Dict) -> Set[str]:
+        """ return the global rule parameters whose records changed: 'individuals', 'families' or both """
+        kinds: Set[str] = set()
+        for xref in changed:
+            for record in (previous.get(xref), self.index.get(xref), self.index.get_family(xref)):
+                if isinstance(record, Individual):
+                    kinds.add('individuals')
+                elif isinstance(record, Family):
+                    kinds.add('families')
+        return kinds
+
+    def relatives(self, changed: Set[str], previous: Dict, family_ids: Set[str]) -> Set[str]:
+        """ return the changed ids, the families in family_ids, their husbands, wives and children, then the
+            families those belong or belonged to and their husbands, wives and children in turn """
+        ids: Set[str] = changed | family_ids
+        families: Set[str] = family_ids
+        for _ in range(2):
+            members: Set[str] = set()
+            for family_id in families:
+                for family in (self.index.get_family(family_id), previous.get(family_id)):
+                    if isinstance(family, Family):
+                        members.update([family.husb, family.wife, *family.chil])
+            members.discard(None)
+            families = set()
+            for member in members - ids:
+                families.update(self.member_families.get(member, ()))
+                individual: Optional[Individual] = self.index.get(member)
+                if individual is not None:
+                    families.update(individual.famc)
+                    families.update(individual.fams)
+            ids |= members
+            families -= ids
+            ids |= families
+        return ids
+
+    def continues(self, rule: Rule) -> bool:
+        """ return True if a global rule can only check the changed records: it takes changed, its last run
+            did not raise, and it kept a state if it takes one """
+        result = self.results.get((rule.name, None), KeyError())
+        return 'changed' in rule.parameters and not isinstance(result, Exception) and \
+            ('state' not in rule.parameters or bool(self.states.get(rule.name)))
+
+    def revalidate(self, changed: Set[str], previous: Dict) -> None:
+        """ drop the results of the affected records and of the global rules reading a changed kind of
+            record, then run the rules again on them; a global rule that continues from its last run
+            only reports again on the changed records and their relatives """
+        kinds: Set[str] = self.changed_kinds(changed, previous)
+        rules: List[Rule] = [rule for rule in self.rules if rule.scope != GLOBAL or kinds & set(rule.parameters)
+                             or (rule.name, None) not in self.results]
+        continuing: List[Rule] = [rule for rule in rules if rule.scope == GLOBAL and self.continues(rule)]
+        family_ids: Set[str] = self.affected_families(changed, previous)
+        relatives: Set[str] = self.relatives(changed, previous, family_ids) if continuing else set()
+        for rule in rules:
+            if rule.scope == GLOBAL:
+                self.results.pop((rule.name, None), None)
+                if rule not in continuing:
+                    self.rule_findings.pop(rule.name, None)
+                    self.states.pop(rule.name, None)  # a run over the whole tree fills a new one
+                continue
+            for record_id in changed | family_ids:
+                self.results.pop((rule.name, record_id), None)
+                self.findings.pop((rule.name, record_id), None)
+
+        families: List[Family] = [self.index.family(_id) for _id in sorted(family_ids)
+                                  if self.index.get_family(_id) is not None]
+        individuals: List[Individual] = [self.index[_id] for _id in sorted(changed) if _id in self.index]
+        sink: CollectorSink = CollectorSink(get_sink().wants(PASS))
+        reported: List[int] = [0]
+
+        def keep(rule: Rule, record_id, result) -> None:
+            self.results[rule.name, record_id] = result
+            findings: List[Finding] = sink.findings[reported[0]:]
+            reported[0] = len(sink.findings)
+            if record_id is not None:
+                self.findings[rule.name, record_id] = findings
+            elif rule in continuing:
+                self.rule_findings[rule.name].replace(relatives, findings)
+            else:
+                self.rule_findings[rule.name] = RuleFindings(findings)
+
+        with reporting_to(sink):
+            stats: Dict[str, RuleStats] = run_rules(self.index, [rule for rule in rules if rule not in continuing],
+                                                    keep, families, individuals, None, self.states)
+            stats.update(run_rules(self.index, continuing, keep, [], [], relatives, self.states))
+        for name, rule_stats in stats.items():
+            total: RuleStats = self.stats.setdefault(name, RuleStats())
+            total.calls += rule_stats.calls
+            total.seconds += rule_stats.seconds
+            total.errors += rule_stats.errors
+
+    def iter_findings(self) -> Iterator[Finding]:
+        """ yield the findings in the order a full run_rules on a fresh parse would report them, except
+            that the findings a global rule reported again on changed records come after its others """
+        rules: List[Rule] = self.rules
+        families: Iterator[Family] = (self.index.get_family(xref) for xref in self.digests)
+        individuals: Iterator[Individual] = (self.index.get(xref) for xref in self.digests)
+        for scope, records in ((FAMILY, families), (INDIVIDUAL, individuals)):
+            scope_rules: List[Rule] = [rule for rule in rules if rule.scope == scope]
+            for record in filter(None, records):
+                for rule in scope_rules:
+                    yield from self.findings.get((rule.name, record.id), ())
+        for rule in rules:
+            if rule.scope == GLOBAL:
+                yield from self.rule_findings.get(rule.name, ())
+
+    def save(self, path: str) -> None:
+        """ write the state to a file, to be continued by Validation.load in a later run """
+        with open(path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str) -> 'Validation':
+        """ read a state written by save """
+        with open(path, "rb") as file:
+            return pickle.load(file)
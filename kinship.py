@@ -0,0 +1,178 @@
+""" Kinship index of a tree: parents, children, spouses and siblings by id
+
+    Kinship is built once from the CHIL, HUSB and WIFE lines of the families and the FAMC and
+    FAMS lines of the individuals, and answers child -> parent families, person -> spouse
+    families and family -> children with dict lookups instead of a scan of every family.
+
+    The ancestor and descendant closures are memoized per (id, depth), so the closures of
+    shared ancestors are computed once for all the people descending from them.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from models import Individual, Family, GedcomIndex
+
+ParentFamily = Callable[[str], Union[Family, str]]  # id -> first family listing it as a child, or ""
+Closures = Dict[Tuple[str, Optional[int]], FrozenSet[str]]  # (id, depth) -> ids; a depth of None is unlimited
+
+
+class Kinship:
+    """ adjacency index of the families of a tree, keyed by individual and family id """
+    def __init__(self, families: Iterable[Family], individuals: Iterable[Individual] = ()):
+        """ index the families in order, then the FAMC / FAMS links of the individuals they miss """
+        self.families: Dict[str, Family] = {}
+        self._parents: Dict[str, List[Family]] = {}  # child id -> families listing them as CHIL, in order
+        self._spouses: Dict[str, List[Family]] = {}  # person id -> families with them as HUSB or WIFE, in order
+        self._ancestors: Closures = {}
+        self._descendants: Closures = {}
+
+        for family in families:
+            self.families.setdefault(family.id, family)
+            for child in family.chil:
+                self._parents.setdefault(child, []).append(family)
+            for spouse in {family.husb, family.wife} - {None, 'NA'}:
+                self._spouses.setdefault(spouse, []).append(family)
+
+        for individual in individuals:
+            for links, ids in ((self._parents, individual.famc), (self._spouses, individual.fams)):
+                for family_id in ids:
+                    family: Optional[Family] = self.families.get(family_id)
+                    linked: List[Family] = links.setdefault(individual.id, [])
+                    if family is not None and family not in linked:
+                        linked.append(family)
+
+    @classmethod
+    def from_index(cls, index: GedcomIndex) -> 'Kinship':
+        """ build the kinship index of the records of a GedcomIndex """
+        return cls(index.iter_families(), index)
+
+    def parent_family(self, _id) -> Union[Family, str]:
+        """ return the first family listing an individual as a child, or "" like app.findParents """
+        families: List[Family] = self._parents.get(_id, [])
+        return families[0] if families and _id in families[0].chil else ""
+
+    def parent_families(self, _id) -> List[Family]:
+        """ return the families an individual is a child of """
+        return self._parents.get(_id, [])
+
+    def spouse_families(self, _id) -> List[Family]:
+        """ return the families an individual is a husband or wife in """
+        return self._spouses.get(_id, [])
+
+    def children(self, family_id) -> List[str]:
+        """ return the ids of the children of a family """
+        family: Optional[Family] = self.families.get(family_id)
+        return [] if family is None else family.chil
+
+    def parents(self, _id) -> List[str]:
+        """ return the ids of the husbands and wives of the families an individual is a child of """
+        return [parent for family in self.parent_families(_id) for parent in (family.husb, family.wife)
+                if parent not in (None, 'NA')]
+
+    def siblings(self, _id) -> List[str]:
+        """ return the ids of the other children of the families an individual is a child of """
+        return list(dict.fromkeys(child for family in self.parent_families(_id) for child in family.chil
+                                  if child != _id))
+
+    def offspring(self, _id) -> List[str]:
+        """ return the ids of the children of the families an individual is a husband or wife in """
+        return list(dict.fromkeys(child for family in self.spouse_families(_id) for child in family.chil))
+
+    def ancestors(self, _id, depth: Optional[int] = None) -> FrozenSet[str]:
+        """ return the ids of the ancestors of an individual up to depth generations (1: the parents) """
+        return closure(_id, depth, self.parents, self._ancestors)
+
+    def descendants(self, _id, depth: Optional[int] = None) -> FrozenSet[str]:
+        """ return the ids of the descendants of an individual down to depth generations (1: the children) """
+        return closure(_id, depth, self.offspring, self._descendants)
+
+    def is_ancestor(self, ancestor, _id, depth: Optional[int] = None) -> bool:
+        """ return True if ancestor is an ancestor of _id within depth generations """
+        return ancestor in self.ancestors(_id, depth)
+
+    def common_ancestors(self, id1, id2, depth: Optional[int] = None) -> FrozenSet[str]:
+        """ return the ids of the ancestors two individuals share within depth generations of both """
+        return self.ancestors(id1, depth) & self.ancestors(id2, depth)
+
+    def iter_ancestors(self, _id, depth: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+        """ yield (id, generation) for each ancestor once, nearest generation first, without memoizing """
+        return walk(_id, depth, self.parents)
+
+    def iter_descendants(self, _id, depth: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+        """ yield (id, generation) for each descendant once, nearest generation first, without memoizing """
+        return walk(_id, depth, self.offspring)
+
+    def clear_cache(self) -> None:
+        """ forget the memoized closures """
+        self._ancestors.clear()
+        self._descendants.clear()
+
+    def spouses_are_siblings(self, fam1: Family, fam2: Family) -> bool:
+        """ return True if a spouse of fam1 and a spouse of fam2 were born into the same family,
+            like app.checkIfSiblings """
+        return spouses_are_siblings(fam1, fam2, self.parent_family)
+
+
+def spouses_are_siblings(fam1: Family, fam2: Family, parent_family: ParentFamily) -> bool:
+    """ the comparison of app.checkIfSiblings, with the parent families looked up by parent_family """
+    if fam1.id == fam2.id:
+        return False
+    husb1fam = parent_family(fam1.husb)
+    husb2fam = parent_family(fam2.husb)
+    wife1fam = parent_family(fam1.wife)
+    wife2fam = parent_family(fam2.wife)
+
+    first = husb1fam or wife1fam  # the wife of fam1 is only compared when its husband has no parents
+    second = husb2fam or wife2fam
+    return bool(first and second and first.id == second.id)
+
+
+def closure(_id, depth: Optional[int], step: Callable[[str], List[str]], cache: Closures) -> FrozenSet[str]:
+    """ return the ids reached from _id by up to depth steps, memoizing the closure of every id on the way
+
+        the walk keeps its own stack, so deep trees do not hit the recursion limit; in a tree where
+        someone is their own ancestor, the closures of the people on the loop may miss part of it
+    """
+    if (_id, depth) in cache:
+        return cache[_id, depth]
+    stack: List[Tuple[str, Optional[int], bool]] = [(_id, depth, False)]
+    open_keys: Set[Tuple[str, Optional[int]]] = set()
+    while stack:
+        node, node_depth, expanded = stack.pop()
+        key: Tuple[str, Optional[int]] = (node, node_depth)
+        if key in cache or not expanded and key in open_keys:
+            continue
+        following: List[str] = [] if node_depth == 0 else step(node)
+        next_depth: Optional[int] = None if node_depth is None else node_depth - 1
+        if not expanded:
+            open_keys.add(key)
+            stack.append((node, node_depth, True))
+            stack.extend((other, next_depth, False) for other in following
+                         if (other, next_depth) not in cache and (other, next_depth) not in open_keys)
+        else:
+            reached: Set[str] = set(following)
+            for other in following:
+                reached.update(cache.get((other, next_depth), ()))
+            cache[key] = frozenset(reached)
+            open_keys.discard(key)
+    return cache[_id, depth]
+
+
+def walk(_id, depth: Optional[int], step: Callable[[str], List[str]]) -> Iterator[Tuple[str, int]]:
+    """ yield (id, steps) for each id reached from _id by up to depth steps, breadth first """
+    seen: Set[str] = {_id}
+    generation: List[str] = [_id]
+    steps: int = 0
+    while generation and (depth is None or steps < depth):
+        steps += 1
+        following: List[str] = []
+        for node in generation:
+            for other in step(node):
+                if other not in seen:
+                    seen.add(other)
+                    following.append(other)
+                    yield other, steps
+        generation = following
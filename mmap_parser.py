@@ -0,0 +1,114 @@
+""" Parse a .ged file from a memory map, scanning it as bytes
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import re
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+from models import Individual, Family
+from app import LAST_GROUP_PATTERNS, Token, assemble_records
+
+# the same alternation as app.LINE_REGEX, in bytes and matched line by line over the whole buffer
+LINE_REGEX: Pattern = re.compile(
+    rb'^(?:(?P<arg_level>0|1|2) (?P<arg_tag>NAME|SEX|FAMC|FAMS|MARR|HUSB|WIFE|CHIL|DATE) (?P<arg_value>[^\r\n]*)'
+    rb'|(?P<no_arg_level>0|1) (?P<no_arg_tag>BIRT|DEAT|MARR|DIV|HEAD|TRLR|NOTE)'
+    rb'|0 (?P<xref>[^\r\n]*) (?P<zero_1_tag>INDI|FAM)'
+    rb'|0 (?P<zero_2_tag>HEAD|TRLR|NOTE) ?(?P<zero_2_value>[^\r\n]*))\r?$', re.MULTILINE)
+
+# the start of any level-0 line; a record never continues past one, so the file can be cut there
+RECORD_START_REGEX: Pattern = re.compile(rb'^0 ', re.MULTILINE)
+
+# levels and tags come from a fixed set, so they are looked up instead of decoded
+LEVELS: Dict[bytes, str] = {b'0': '0', b'1': '1', b'2': '2'}
+TAGS: Dict[bytes, str] = {tag.encode(): tag for tag in ['INDI', 'NAME', 'SEX', 'BIRT', 'DEAT', 'FAMC', 'FAMS',
+                                                         'FAM', 'MARR', 'HUSB', 'WIFE', 'CHIL', 'DIV', 'DATE',
+                                                         'HEAD', 'TRLR', 'NOTE']}
+
+
+@contextmanager
+def open_mmap(path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """ map a .ged file read-only into memory and close it afterwards """
+    if os.path.getsize(path) == 0:  # an empty file can not be mapped
+        yield b''
+        return
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
+
+def tokenize_range(buffer, start: int = 0, end: Optional[int] = None,
+                   encoding: str = 'utf-8') -> Iterator[Token]:
+    """ tokenize the lines of buffer[start:end]; only xrefs and values are decoded """
+    end = len(buffer) if end is None else end
+
+    for match in LINE_REGEX.finditer(buffer, start, end):
+        pattern: str = LAST_GROUP_PATTERNS[match.lastgroup]
+        if pattern == 'ARGUMENT':
+            yield (pattern, LEVELS[match.group('arg_level')], None, TAGS[match.group('arg_tag')],
+                   match.group('arg_value').decode(encoding))
+        elif pattern == 'NO_ARGUMENT':
+            yield pattern, LEVELS[match.group('no_arg_level')], None, TAGS[match.group('no_arg_tag')], None
+        elif pattern == 'ZERO_1':
+            yield pattern, '0', match.group('xref').decode(encoding), TAGS[match.group('zero_1_tag')], None
+        else:  # the value of HEAD, NOTE and TRLR is never stored
+            yield pattern, '0', None, TAGS[match.group('zero_2_tag')], None
+
+
+def iter_records(path, encoding: str = 'utf-8') -> Iterator[Union[Individual, Family]]:
+    """ yield the records of a .ged file, scanning its memory map as bytes """
+    with open_mmap(path) as buffer:
+        yield from assemble_records(tokenize_range(buffer, encoding=encoding))
+
+
+def split_ranges(buffer, parts: int) -> List[Tuple[int, int]]:
+    """ cut buffer into at most parts byte ranges of similar size, each starting at a level-0 line """
+    size: int = len(buffer)
+    bounds: List[int] = [0]
+
+    for part in range(1, parts):
+        match = RECORD_START_REGEX.search(buffer, max(size * part // parts, bounds[-1] + 1))
+        if match is None:
+            break
+        bounds.append(match.start())
+
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def parse_range(path, start: int, end: Optional[int],
+                encoding: str = 'utf-8') -> Tuple[List[Individual], List[Family]]:
+    """ get the records of one byte range of a .ged file; runs in a worker process """
+    individuals: List[Individual] = []
+    families: List[Family] = []
+
+    with open_mmap(path) as buffer:
+        for record in assemble_records(tokenize_range(buffer, start, end, encoding)):
+            (individuals if isinstance(record, Individual) else families).append(record)
+
+    return individuals, families
+
+
+def generate_classes(path, encoding: str = 'utf-8', workers: int = 1) -> Tuple[List[Individual], List[Family]]:
+    """ get the Individual and Family records of a .ged file through its memory map,
+        parsing ranges split at level-0 lines in a pool of worker processes when workers > 1 """
+    if workers <= 1:
+        return parse_range(path, 0, None, encoding)
+
+    with open_mmap(path) as buffer:
+        ranges: List[Tuple[int, int]] = split_ranges(buffer, workers)
+
+    individuals: List[Individual] = []
+    families: List[Family] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(parse_range, [path] * len(ranges), *zip(*ranges), [encoding] * len(ranges))
+        for range_individuals, range_families in results:  # map keeps the order of the ranges
+            individuals.extend(range_individuals)
+            families.extend(range_families)
+
+    return individuals, families
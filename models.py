@@ -6,26 +6,125 @@
 
 import datetime
 from datetime import datetime, date
-from typing import Optional, Dict, List
+from functools import lru_cache
+from itertools import chain
+from typing import Optional, Dict, Iterable, Iterator, List, Union
+
+DATE_FORMAT: str = "%d %b %Y"
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(text: str) -> datetime:
+    """ parse a date like '9 NOV 1994', memoizing the most recent distinct strings """
+    return datetime.strptime(text, DATE_FORMAT)
+
+
+class Event:
+    """ holds the date of a BIRT, DEAT, MARR or DIV event
+
+        it is read like the {'date': ...} dict it replaces, in a fraction of the memory
+    """
+    __slots__ = ('date', '_datetime')
+
+    def __init__(self, date: Optional[str] = None):
+        """ store Event info, parsing the date once up front """
+        self.date = date
+        try:
+            self._datetime: Optional[datetime] = parse_date(date)
+        except (TypeError, ValueError):  # no date or a partial one: parse_date raises on access
+            self._datetime = None
+
+    @property
+    def datetime(self):
+        """ the date parsed to a datetime """
+        if self._datetime is None:
+            self._datetime = parse_date(self.date)
+        return self._datetime
+
+    def get(self, key, default=None):
+        """ return the date for the key 'date' like dict.get """
+        return self.date if key == 'date' and self.date is not None else default
+
+    def __getitem__(self, key) -> str:
+        if key != 'date' or self.date is None:
+            raise KeyError(key)
+        return self.date
+
+    def __contains__(self, key) -> bool:
+        return key == 'date' and self.date is not None
+
+    def __bool__(self) -> bool:
+        return self.date is not None
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Event):
+            return self.date == other.date
+        if isinstance(other, dict):
+            return other == ({} if self.date is None else {'date': self.date})
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.date)
+
+    def __repr__(self) -> str:
+        return f"Event({self.date!r})"
+
+
+def to_event(value):
+    """ store a {'date': ...} dict or a date string as an Event; False and None are kept as they are """
+    if isinstance(value, dict):
+        return Event(value.get('date'))
+    if isinstance(value, str):
+        return Event(value)
+    return value
 
 
 class Individual:
     """ holds an Individual record """
+    __slots__ = ('id', 'name', 'sex', '_birt', 'alive', '_deat', 'famc', 'fams')
+
+    # the level-1 tags generate_classes stores on an Individual
+    TAGS = frozenset({'name', 'sex', 'birt', 'deat', 'famc', 'fams'})
+
     def __init__(self, _id=None, name=None, sex=None, birt=None, alive=True, deat=False):
         """ store Individual info """
         self.id = _id
         self.name = name
         self.sex = sex
-        self.birt: Optional[Dict[str, str]] = birt
+        self.birt: Optional[Event] = birt
         self.alive = alive
-        self.deat: Optional[bool, Dict[str, str]] = deat
+        self.deat: Optional[bool, Event] = deat
         self.famc: List[str] = []
         self.fams: List[str] = []
 
+    @property
+    def _id(self):
+        return self.id
+
+    @_id.setter
+    def _id(self, value):
+        self.id = value
+
+    @property
+    def birt(self):
+        return self._birt
+
+    @birt.setter
+    def birt(self, value):
+        self._birt = to_event(value)
+
+    @property
+    def deat(self):
+        return self._deat
+
+    @deat.setter
+    def deat(self, value):
+        self._deat = to_event(value)
+
     def age(self):
         """ calculate age using the birth date """
         today = date.today()
-        birthday = datetime.strptime(self.birt['date'], "%d %b %Y")
+        birthday = self.birt.datetime
         age = today.year - birthday.year - \
               ((today.month, today.day) < (birthday.month, birthday.day))
         return age
@@ -42,20 +141,152 @@ class Individual:
 
 class Family:
     """ holds a Family record """
+    __slots__ = ('id', '_marr', 'husb', 'wife', 'chil', '_div', 'parent')
+
+    # the level-1 tags generate_classes stores on a Family
+    TAGS = frozenset({'marr', 'husb', 'wife', 'chil', 'div'})
+
     def __init__(self, _id=None, marr=None, husb=None, wife=None, div=False):
         """ store Family info """
         self.id = _id
-        self.marr = marr
+        self.marr: Optional[Event] = marr
         self.husb = husb
         self.wife = wife
         self.chil: List[str] = []
-        self.div: Optional[bool, Dict[str, str]] = div
+        self.div: Optional[bool, Event] = div
+
+    @property
+    def _id(self):
+        return self.id
+
+    @_id.setter
+    def _id(self, value):
+        self.id = value
 
-    def info(self, individuals: List[Individual]):
+    @property
+    def marr(self):
+        return self._marr
+
+    @marr.setter
+    def marr(self, value):
+        self._marr = to_event(value)
+
+    @property
+    def div(self):
+        return self._div
+
+    @div.setter
+    def div(self, value):
+        self._div = to_event(value)
+
+    def info(self, individuals: 'Individuals'):
         """ return Family info """
         div = 'NA' if self.div is False else self.div['date']
         chil = 'NA' if len(self.chil) == 0 else self.chil
-        h_name = next(individual.name for individual in individuals if individual.id == self.husb)
-        w_name = next(individual.name for individual in individuals if individual.id == self.wife)
+        h_name = find_individual(individuals, self.husb).name
+        w_name = find_individual(individuals, self.wife).name
 
         return [self.id, self.marr['date'], div, self.husb, h_name, self.wife, w_name, chil]
+
+
+class GedcomIndex:
+    """ id-keyed index over the records of a tree, built once after generate_classes
+
+        it can be passed wherever a list of individuals is expected: iterating it yields the
+        Individual records, and lookups by id (index[_id], index.get(_id), _id in index) are O(1);
+        a record that repeats an earlier id is iterated too, so US22 sees it, but never looked up
+    """
+    def __init__(self, individuals: Iterable[Individual] = (), families: Iterable[Family] = ()):
+        """ index the records by id; a repeated id is looked up as its first record and still iterated """
+        self._individuals: Dict[str, Individual] = {}
+        self._families: Dict[str, Family] = {}
+        self._repeated: Dict[str, List[Union[Individual, Family]]] = {}  # id -> records after its first one
+        for record in chain(individuals, families):
+            self.append(record)
+
+    def individual(self, _id) -> Individual:
+        """ return the Individual with the given id, raise KeyError if there is none """
+        return self._individuals[_id]
+
+    def family(self, _id) -> Family:
+        """ return the Family with the given id, raise KeyError if there is none """
+        return self._families[_id]
+
+    def get(self, _id, default=None) -> Optional[Individual]:
+        """ return the Individual with the given id or default """
+        return self._individuals.get(_id, default)
+
+    def iter_families(self) -> Iterator[Family]:
+        """ iterate over the Family records, repeated ids included """
+        return chain(self._families.values(), self.repeated(Family))
+
+    def repeated(self, kind: type) -> Iterator[Union[Individual, Family]]:
+        """ iterate over the records of a kind that repeat the id of an earlier record """
+        return (record for records in self._repeated.values() for record in records if isinstance(record, kind))
+
+    def append(self, record: Union[Individual, Family]) -> None:
+        """ index a record after the others; if its id is taken, lookups keep the first record """
+        records: Dict = self._individuals if isinstance(record, Individual) else self._families
+        if record.id in records:
+            self._repeated.setdefault(record.id, []).append(record)
+        else:
+            records[record.id] = record
+
+    def add(self, record: Union[Individual, Family]) -> None:
+        """ index a record, replacing the records with the same id; the first one in place """
+        self._repeated.pop(record.id, None)
+        (self._individuals if isinstance(record, Individual) else self._families)[record.id] = record
+
+    def discard(self, _id) -> None:
+        """ remove the Individuals and Families with the given id, if there are any """
+        self._individuals.pop(_id, None)
+        self._families.pop(_id, None)
+        self._repeated.pop(_id, None)
+
+    def records(self, _id) -> List[Union[Individual, Family]]:
+        """ return the Individual and the Family with the given id and the records repeating it """
+        first: List[Union[Individual, Family]] = [record for record in (self._individuals.get(_id),
+                                                                        self._families.get(_id)) if record is not None]
+        return first + self._repeated.get(_id, [])
+
+    def get_family(self, _id, default=None) -> Optional[Family]:
+        """ return the Family with the given id or default """
+        return self._families.get(_id, default)
+
+    def __getitem__(self, _id) -> Individual:
+        return self._individuals[_id]
+
+    def __contains__(self, _id) -> bool:
+        return _id in self._individuals
+
+    def __iter__(self) -> Iterator[Individual]:
+        return chain(self._individuals.values(), self.repeated(Individual))
+
+    def __len__(self) -> int:
+        return len(self._individuals) + sum(1 for _ in self.repeated(Individual))
+
+
+Individuals = Union[List[Individual], GedcomIndex]
+
+
+def find_individual(individuals: Individuals, _id) -> Individual:
+    """ find an Individual by id: O(1) in a GedcomIndex, a linear scan of a list """
+    if isinstance(individuals, GedcomIndex):
+        return individuals.individual(_id)
+    return next(individual for individual in individuals if individual.id == _id)
+
+
+def find_individuals(individuals: Individuals, ids: Iterable) -> List[Individual]:
+    """ find the Individuals with the given ids, skipping ids that have no record """
+    if isinstance(individuals, GedcomIndex):
+        return [individuals[_id] for _id in ids if _id in individuals]
+    ids = set(ids)
+    return [individual for individual in individuals if individual.id in ids]
+
+
+def find_all_individuals(individuals: Individuals, ids: Iterable) -> List[Individual]:
+    """ find the Individuals with the given ids, the records repeating an id included, by sorted id """
+    if isinstance(individuals, GedcomIndex):
+        return [record for _id in sorted(ids) for record in individuals.records(_id) if isinstance(record, Individual)]
+    ids = set(ids)
+    return sorted((individual for individual in individuals if individual.id in ids), key=lambda record: record.id)
@@ -0,0 +1,131 @@
+""" Persistent cache of the records parsed from a .ged file
+
+    The records are kept in a compact marshal file next to the source (tree.ged -> tree.ged.cache)
+    together with the size, mtime and content digest of the source. The cache is used when the
+    size matches and either the mtime or the content digest matches too.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import marshal
+import hashlib
+from typing import Callable, List, Optional, Tuple
+
+from models import Individual, Family, Event
+
+CACHE_SUFFIX: str = ".cache"
+MAGIC: bytes = b"GEDCACHE"
+VERSION: int = 1  # bump when the layout of the records changes
+
+Records = Tuple[List[Individual], List[Family]]
+
+
+def cache_path(path: str) -> str:
+    """ return the path of the cache of a .ged file """
+    return path + CACHE_SUFFIX
+
+
+def file_digest(path: str) -> bytes:
+    """ return the content digest of a file """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.digest()
+
+
+def encode_event(event):
+    """ keep an Event as a 1-tuple of its date, anything else (None, False) as it is """
+    return (event.date,) if isinstance(event, Event) else event
+
+
+def encode(individuals: List[Individual], families: List[Family]) -> Tuple[list, list]:
+    """ return the records as lists of tuples of builtins, which marshal writes and reads quickly """
+    return ([(ind.id, ind.name, ind.sex, encode_event(ind.birt), ind.alive, encode_event(ind.deat),
+              tuple(ind.famc), tuple(ind.fams)) for ind in individuals],
+            [(fam.id, encode_event(fam.marr), fam.husb, fam.wife, tuple(fam.chil), encode_event(fam.div))
+             for fam in families])
+
+
+def decode(individual_rows: list, family_rows: list) -> Records:
+    """ undo encode; the records are filled in slot by slot, which is much faster than through __init__ """
+    new_individual, new_family = Individual.__new__, Family.__new__
+    individuals: List[Individual] = []
+    for _id, name, sex, birt, alive, deat, famc, fams in individual_rows:
+        individual = new_individual(Individual)
+        individual.id, individual.name, individual.sex, individual.alive = _id, name, sex, alive
+        individual._birt = Event(birt[0]) if type(birt) is tuple else birt
+        individual._deat = Event(deat[0]) if type(deat) is tuple else deat
+        individual.famc, individual.fams = list(famc), list(fams)
+        individuals.append(individual)
+
+    families: List[Family] = []
+    for _id, marr, husb, wife, chil, div in family_rows:
+        family = new_family(Family)
+        family.id, family.husb, family.wife, family.chil = _id, husb, wife, list(chil)
+        family._marr = Event(marr[0]) if type(marr) is tuple else marr
+        family._div = Event(div[0]) if type(div) is tuple else div
+        families.append(family)
+
+    return individuals, families
+
+
+def store(path: str, individuals: List[Individual], families: List[Family],
+          digest: Optional[bytes] = None) -> None:
+    """ write the cache of a .ged file; the records must be the ones parsed from it as it is now """
+    stat = os.stat(path)
+    payload: bytes = marshal.dumps((VERSION, stat.st_size, stat.st_mtime_ns, digest or file_digest(path),
+                                    *encode(individuals, families)))
+    temporary: str = cache_path(path) + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC + payload)
+    os.replace(temporary, cache_path(path))  # a reader never sees a half-written cache
+
+
+def load(path: str) -> Optional[Records]:
+    """ return the cached records of a .ged file, or None if there is no valid cache for it """
+    try:
+        with open(cache_path(path), "rb") as file:
+            data: bytes = file.read()
+        if not data.startswith(MAGIC):
+            return None
+        version, size, mtime_ns, digest, individual_rows, family_rows = marshal.loads(data[len(MAGIC):])
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    stat = os.stat(path)
+    if version != VERSION or size != stat.st_size:
+        return None
+    if mtime_ns != stat.st_mtime_ns:
+        if digest != file_digest(path):
+            return None
+        records: Records = decode(individual_rows, family_rows)
+        try:
+            store(path, *records, digest=digest)  # touched but unchanged: record the new mtime
+        except OSError:
+            pass
+        return records
+
+    return decode(individual_rows, family_rows)
+
+
+def clear(path: str) -> None:
+    """ delete the cache of a .ged file, if there is one """
+    try:
+        os.remove(cache_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def cached(path: str, parse: Callable[[str], Records]) -> Records:
+    """ return the cached records of a .ged file, parsing it with parse and caching the result on a miss """
+    records: Optional[Records] = load(path)
+    if records is None:
+        records = parse(path)
+        try:
+            store(path, *records)
+        except OSError:  # a read-only directory: work without a cache
+            pass
+    return records
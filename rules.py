@@ -0,0 +1,237 @@
+""" Registry of the user-story checks and an engine running them in one pass over a tree
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import sys
+import time
+import importlib
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from models import Individual, Family, GedcomIndex, find_individuals
+from findings import PASS, Sink, CollectorSink, TextSink, JsonlSink, SummarySink, get_sink, reporting_to
+
+INDIVIDUAL: str = 'individual'  # called as check(individual)
+FAMILY: str = 'family'  # called as check(family) or check(family, individuals)
+GLOBAL: str = 'global'  # called once, with families, individuals, changed and state passed by parameter name
+
+
+class Rule:
+    """ holds a registered check """
+    def __init__(self, rule_id: str, scope: str, function: Callable, when: Optional[Callable] = None):
+        """ store Rule info """
+        self.id = rule_id
+        self.scope = scope
+        self.function = function
+        self.name: str = function.__name__
+        self.when = when  # the check only applies to records for which when(record) is true
+        code = function.__code__  # the positional parameter names; inspect.signature is slow to import and call
+        self.parameters: Tuple[str, ...] = code.co_varnames[:code.co_argcount]
+
+
+class RuleStats:
+    """ holds the calls, wall time and errors of one rule in a run """
+    def __init__(self):
+        """ store RuleStats info """
+        self.calls: int = 0
+        self.seconds: float = 0.0
+        self.errors: int = 0
+
+
+RULES: Dict[str, Rule] = {}  # by function name, in registration order
+
+
+def rule(rule_id: str, scope: str, when: Optional[Callable] = None) -> Callable:
+    """ register the decorated check as a rule of the validation engine """
+    def register(function: Callable) -> Callable:
+        RULES[function.__name__] = Rule(rule_id, scope, function, when)
+        return function
+    return register
+
+
+def registered_rules() -> List[Rule]:
+    """ return every rule, importing user_stories so its checks are registered """
+    importlib.import_module('user_stories')
+    # user_stories registers its checks in the rules module it imports, which is not this one when it runs as a script
+    return list(importlib.import_module('rules').RULES.values())
+
+
+def run_rules(index: GedcomIndex, rules: Optional[Iterable[Rule]] = None,
+              on_result: Optional[Callable] = None, only_families: Optional[Iterable[Family]] = None,
+              only_individuals: Optional[Iterable[Individual]] = None,
+              changed: Optional[Set[str]] = None, states: Optional[Dict[str, Dict]] = None) -> Dict[str, RuleStats]:
+    """ run the rules over the tree: every family rule during one pass over the families,
+        every individual rule during one pass over the individuals, then the global rules
+
+        on_result(rule, record_id, result) is called after each check; a check that raises
+        is counted as an error and gets the exception as its result. only_families and
+        only_individuals restrict the per-record passes to some of the records of the tree.
+        changed, the ids of the records changed since an earlier run and of their relatives, goes to
+        the global rules taking a changed parameter. Such a rule then only reports the findings that
+        name one of them, the findings that name no record, and the findings of other records whose
+        result changed with them; it may need what it kept in its state, a dict from states by rule
+        name that it fills on each run and gets again on the next. A rule taking state gets None
+        without states
+    """
+    rules = registered_rules() if rules is None else list(rules)
+    stats: Dict[str, RuleStats] = {rule.name: RuleStats() for rule in rules}
+
+    def call(rule: Rule, record_id, *args, **kwargs) -> None:
+        rule_stats: RuleStats = stats[rule.name]
+        start: float = time.perf_counter()
+        try:
+            result = rule.function(*args, **kwargs)
+        except Exception as error:  # a check crashing on bad data must not stop the run
+            result = error
+            rule_stats.errors += 1
+        rule_stats.seconds += time.perf_counter() - start
+        rule_stats.calls += 1
+        if on_result is not None:
+            on_result(rule, record_id, result)
+
+    family_rules: List[Rule] = [rule for rule in rules if rule.scope == FAMILY]
+    for family in index.iter_families() if only_families is None else only_families:
+        for rule in family_rules:
+            if rule.when is not None and not rule.when(family):
+                continue
+            if len(rule.parameters) > 1:
+                call(rule, family.id, family, index)
+            else:
+                call(rule, family.id, family)
+
+    individual_rules: List[Rule] = [rule for rule in rules if rule.scope == INDIVIDUAL]
+    for individual in index if only_individuals is None else only_individuals:
+        for rule in individual_rules:
+            if rule.when is None or rule.when(individual):
+                call(rule, individual.id, individual)
+
+    global_rules: List[Rule] = [rule for rule in rules if rule.scope == GLOBAL]
+    if global_rules:  # the only rules that need every family at once
+        arguments: Dict[str, object] = {'families': list(index.iter_families()), 'individuals': index,
+                                        'changed': changed}
+        for rule in global_rules:
+            arguments['state'] = None if states is None else states.setdefault(rule.name, {})
+            call(rule, None, **{name: arguments[name] for name in rule.parameters if name in arguments})
+
+    return stats
+
+
+def shard_families(index: GedcomIndex, shards: int) -> List[Tuple[List[Family], List[Individual]]]:
+    """ cut the families into at most shards runs of consecutive families, each with the husbands,
+        wives and children it refers to: everything a family rule reads """
+    families: List[Family] = list(index.iter_families())
+    size: int = -(-len(families) // max(shards, 1))  # ceiling division
+    result: List[Tuple[List[Family], List[Individual]]] = []
+
+    for start in range(0, len(families), size or 1):
+        shard: List[Family] = families[start:start + size]
+        ids: Dict[str, None] = {}  # ordered set
+        for family in shard:
+            ids.update(dict.fromkeys([family.husb, family.wife, *family.chil]))
+        result.append((shard, find_individuals(index, ids)))
+
+    return result
+
+
+def run_shard(rule_names: List[str], families: List[Family], individuals: List[Individual],
+              passes: bool = True) -> Tuple[List[Tuple[str, str, object]], Dict[str, RuleStats], CollectorSink]:
+    """ run the named family rules over one shard, collecting their findings; runs in a worker process """
+    registered: Dict[str, Rule] = {rule.name: rule for rule in registered_rules()}
+    rules: List[Rule] = [registered[name] for name in rule_names]
+    results: List[Tuple[str, str, object]] = []
+
+    def collect(rule: Rule, record_id, result) -> None:
+        results.append((rule.name, record_id, result))
+
+    with reporting_to(CollectorSink(passes)) as sink:
+        stats: Dict[str, RuleStats] = run_rules(GedcomIndex(individuals, families), rules, collect)
+    return results, stats, sink
+
+
+def run_rules_parallel(index: GedcomIndex, rules: Optional[Iterable[Rule]] = None,
+                       on_result: Optional[Callable] = None, workers: Optional[int] = None,
+                       shards_per_worker: int = 4) -> Dict[str, RuleStats]:
+    """ run the rules like run_rules, the family rules in a pool of worker processes
+
+        the families are cut into shards of consecutive families and each worker only gets the
+        records of its shard; on_result and the current findings sink see the results in the same
+        order as with run_rules. Workers look the family rules up by name, so they must be registered ones
+    """
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing is slow to import and rarely needed
+
+    rules = registered_rules() if rules is None else list(rules)
+    workers = workers or os.cpu_count() or 1
+    family_rules: List[Rule] = [rule for rule in rules if rule.scope == FAMILY]
+    stats: Dict[str, RuleStats] = {rule.name: RuleStats() for rule in family_rules}
+
+    if family_rules:
+        by_name: Dict[str, Rule] = {rule.name: rule for rule in family_rules}
+        names: List[str] = list(by_name)
+        shards = shard_families(index, workers * shards_per_worker)
+        sink: Sink = get_sink()
+        passes: bool = sink.wants(PASS)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map keeps the order of the shards, so the merge does not depend on which worker finishes first
+            for results, shard_stats, shard_sink in executor.map(run_shard, [names] * len(shards), *zip(*shards),
+                                                                 [passes] * len(shards)):
+                sink.counts.update(shard_sink.counts)
+                for finding in shard_sink.findings:
+                    sink.write(finding)
+                for name, rule_stats in shard_stats.items():
+                    stats[name].calls += rule_stats.calls
+                    stats[name].seconds += rule_stats.seconds
+                    stats[name].errors += rule_stats.errors
+                if on_result is not None:
+                    for name, record_id, result in results:
+                        on_result(by_name[name], record_id, result)
+
+    stats.update(run_rules(index, [rule for rule in rules if rule.scope != FAMILY], on_result))
+    return stats
+
+
+def format_stats(stats: Dict[str, RuleStats]) -> List[str]:
+    """ return one line per rule, the slowest first """
+    rules: Dict[str, Rule] = {rule.name: rule for rule in registered_rules()}
+    id_width: int = max([len('Rule')] + [len(rules[name].id) for name in stats])
+    name_width: int = max([len('Check')] + [len(name) for name in stats])
+    lines: List[str] = [f"{'Rule':<{id_width}} {'Check':<{name_width}} {'Calls':>9} {'Errors':>7} {'Seconds':>9} "
+                        f"{'us/call':>9}"]
+    for name, rule_stats in sorted(stats.items(), key=lambda item: item[1].seconds, reverse=True):
+        per_call: float = rule_stats.seconds / rule_stats.calls * 1e6 if rule_stats.calls else 0.0
+        lines.append(f"{rules[name].id:<{id_width}} {name:<{name_width}} {rule_stats.calls:>9} {rule_stats.errors:>7} "
+                     f"{rule_stats.seconds:>9.4f} {per_call:>9.1f}")
+    return lines
+
+
+def main(argv: List[str] = None) -> None:
+    """ validate a .ged file and print its findings and the time spent in each rule """
+    import argparse
+    from app import parse_file
+
+    parser = argparse.ArgumentParser(description="validate a .ged file against the user stories")
+    parser.add_argument("path", nargs='?', default="SSW555-P1-fizgi.ged")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--jsonl", action='store_true', help="write the findings as JSON lines")
+    parser.add_argument("--errors-only", action='store_true', help="count passing records without writing them")
+    parser.add_argument("--summary", action='store_true', help="only print the number of findings of each rule")
+    args = parser.parse_args(argv)
+
+    if args.summary:
+        sink: Sink = SummarySink()
+    else:
+        sink = (JsonlSink if args.jsonl else TextSink)(buffer_size=1024, passes=not args.errors_only)
+
+    individuals, families = parse_file(args.path)
+    index: GedcomIndex = GedcomIndex(individuals, families)
+    with reporting_to(sink):
+        stats: Dict[str, RuleStats] = run_rules(index) if args.workers <= 1 else \
+            run_rules_parallel(index, workers=args.workers)
+
+    print(*sink.summary(), sep="\n")
+    print(*format_stats(stats), sep="\n")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
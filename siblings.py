@@ -0,0 +1,93 @@
+""" Sort-based checks of the birth dates of siblings: US13, US14 and multiple births
+
+    The birth dates of the children of a family are turned into day ordinals and sorted once;
+    every check is then a sliding window over the sorted ordinals, O(k log k) for k children
+    instead of comparing each date with every date seen before it.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+
+from models import Family, Individuals, GedcomIndex, find_individuals
+
+MULTIPLE_BIRTH_DAYS: int = 1  # births at most this many days from another are one multiple birth
+MAX_MULTIPLE_BIRTH: int = 5  # US14: no more than five siblings born at the same time
+MIN_SPACING_DAYS: int = 280  # US13: siblings not born together are born at least this many days apart
+
+
+def birth_ordinals(family: Family, individuals: Individuals) -> List[int]:
+    """ return the sorted day ordinals of the readable birth dates of the children of a family """
+    ordinals: List[int] = []
+    for child in find_individuals(individuals, family.chil):
+        try:
+            ordinals.append(child.birt.datetime.toordinal())
+        except (AttributeError, TypeError, ValueError):  # no birth or an unreadable date
+            pass
+    ordinals.sort()
+    return ordinals
+
+
+def births_around(ordinals: List[int]) -> List[int]:
+    """ for each sorted ordinal, return the number of births within MULTIPLE_BIRTH_DAYS of it, itself included """
+    counts: List[int] = []
+    low: int = 0
+    high: int = 0
+    for ordinal in ordinals:
+        while ordinals[low] < ordinal - MULTIPLE_BIRTH_DAYS:
+            low += 1
+        while high < len(ordinals) and ordinals[high] <= ordinal + MULTIPLE_BIRTH_DAYS:
+            high += 1
+        counts.append(high - low)
+    return counts
+
+
+def largest_multiple_birth(ordinals: List[int]) -> int:
+    """ return the most births within MULTIPLE_BIRTH_DAYS of one birth """
+    return max(births_around(ordinals), default=0)
+
+
+def first_multiple_birth(ordinals: List[int]) -> Optional[int]:
+    """ return the earliest ordinal with another birth within MULTIPLE_BIRTH_DAYS of it, or None """
+    return next((ordinal for ordinal, count in zip(ordinals, births_around(ordinals)) if count > 1), None)
+
+
+def well_spaced(ordinals: List[int]) -> bool:
+    """ US13: False if two births are more than MULTIPLE_BIRTH_DAYS and less than MIN_SPACING_DAYS apart """
+    for ordinal in ordinals:
+        closest_far: int = bisect_right(ordinals, ordinal + MULTIPLE_BIRTH_DAYS)  # first birth not born together
+        if closest_far < len(ordinals) and ordinals[closest_far] - ordinal < MIN_SPACING_DAYS:
+            return False
+    return True
+
+
+class SiblingSpacing:
+    """ holds the results of the sibling birth checks of one family """
+    __slots__ = ('family_id', 'births', 'largest_multiple_birth', 'first_multiple_birth', 'well_spaced')
+
+    def __init__(self, family_id: str, ordinals: List[int]):
+        """ store SiblingSpacing info from the sorted birth ordinals of the children """
+        self.family_id = family_id
+        self.births: int = len(ordinals)
+        self.largest_multiple_birth: int = largest_multiple_birth(ordinals)
+        self.first_multiple_birth: Optional[int] = first_multiple_birth(ordinals)
+        self.well_spaced: bool = well_spaced(ordinals)
+
+    @property
+    def too_many_at_once(self) -> bool:
+        """ US14: more than MAX_MULTIPLE_BIRTH siblings born at the same time """
+        return self.largest_multiple_birth > MAX_MULTIPLE_BIRTH
+
+
+def check_family(family: Family, individuals: Individuals) -> SiblingSpacing:
+    """ run the sibling birth checks on one family """
+    return SiblingSpacing(family.id, birth_ordinals(family, individuals))
+
+
+def check_families(families: Iterable[Family], individuals: Individuals) -> Dict[str, SiblingSpacing]:
+    """ run the sibling birth checks on every family with two or more children, by family id """
+    if not isinstance(individuals, GedcomIndex):
+        individuals = GedcomIndex(individuals)  # one id lookup per child instead of a scan
+    return {family.id: check_family(family, individuals) for family in families if len(family.chil) > 1}
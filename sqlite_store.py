@@ -0,0 +1,303 @@
+""" SQLite-backed index of a tree, for trees too big to hold as Python objects
+
+    SqliteStore is a GedcomIndex whose records live in a SQLite database instead of dicts,
+    so find_individual, run_rules and the user stories work on it unchanged. Records are
+    built from their rows when they are looked up or iterated and are not kept, so changing
+    one does not change the database.
+
+    from_file keeps the database next to the source (tree.ged -> tree.ged.sqlite) with the
+    size and mtime of the source, and opens it again without reading the source while they match.
+
+    Memory limit: run_rules streams the records of the store through the family and individual
+    rules, but it hands the global rules every family at once as a list, and several of them
+    build lists or dicts over all the individuals. A tree that is bigger than memory can only
+    be checked by the per-record rules, run with run_rules(store, [rule for rule in rules if
+    rule.scope != GLOBAL]).
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import os
+import sqlite3
+from datetime import date
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from models import Individual, Family, Event, GedcomIndex
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS individuals (id TEXT NOT NULL UNIQUE, name TEXT, sex TEXT, alive INTEGER);
+CREATE TABLE IF NOT EXISTS families (id TEXT NOT NULL UNIQUE, husb TEXT, wife TEXT);
+CREATE TABLE IF NOT EXISTS child_links (family_row INTEGER NOT NULL, family TEXT NOT NULL,
+                                        child TEXT NOT NULL, position INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS family_links (individual_row INTEGER NOT NULL, individual TEXT NOT NULL,
+                                         family TEXT NOT NULL, tag TEXT NOT NULL, position INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS events (record TEXT NOT NULL, tag TEXT NOT NULL, date TEXT, ordinal INTEGER);
+CREATE TABLE IF NOT EXISTS source (size INTEGER NOT NULL, mtime REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS families_husb ON families (husb);
+CREATE INDEX IF NOT EXISTS families_wife ON families (wife);
+CREATE INDEX IF NOT EXISTS child_links_family ON child_links (family_row, position);
+CREATE INDEX IF NOT EXISTS child_links_child ON child_links (child);
+CREATE INDEX IF NOT EXISTS family_links_individual ON family_links (individual_row, tag, position);
+CREATE INDEX IF NOT EXISTS family_links_family ON family_links (family, tag);
+CREATE UNIQUE INDEX IF NOT EXISTS events_record ON events (record, tag);
+CREATE INDEX IF NOT EXISTS events_ordinal ON events (tag, ordinal);
+"""
+
+# the events of a record are joined to it by tag; a missing row is a missing event
+INDIVIDUALS_QUERY: str = """
+SELECT i.rowid, i.id, i.name, i.sex, i.alive, b.rowid, b.date, d.rowid, d.date FROM individuals i
+LEFT JOIN events b ON b.record = i.id AND b.tag = 'BIRT'
+LEFT JOIN events d ON d.record = i.id AND d.tag = 'DEAT'
+"""
+FAMILIES_QUERY: str = """
+SELECT f.rowid, f.id, f.husb, f.wife, m.rowid, m.date, d.rowid, d.date FROM families f
+LEFT JOIN events m ON m.record = f.id AND m.tag = 'MARR'
+LEFT JOIN events d ON d.record = f.id AND d.tag = 'DIV'
+"""
+
+BATCH_SIZE: int = 10_000  # records inserted per executemany
+DATABASE_SUFFIX: str = ".sqlite"
+TABLES: Tuple[str, ...] = ('individuals', 'families', 'child_links', 'family_links', 'events', 'source')
+
+
+def database_path(path: str) -> str:
+    """ return the path of the database of a .ged file """
+    return path + DATABASE_SUFFIX
+
+
+def to_ordinal(event: Event) -> Optional[int]:
+    """ return the day ordinal of an event, or None if its date is missing or unreadable """
+    try:
+        return event.datetime.toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class SqliteStore(GedcomIndex):
+    """ GedcomIndex over the records of a SQLite database; it keeps only the first record of a repeated id """
+    def __init__(self, database: str):
+        """ open or create the database; ":memory:" for one that is not kept """
+        super().__init__()  # the dicts stay empty: every lookup below goes to the database
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def from_file(cls, path: str, database: Optional[str] = None) -> 'SqliteStore':
+        """ open the database of a .ged file, by default next to it; if it was not loaded from the
+            file as it is now, load it again while the file is being read """
+        from app import stream_records
+
+        store = cls(database or database_path(path))
+        status = os.stat(path)
+        source: Tuple[int, float] = (status.st_size, status.st_mtime)
+        if store.connection.execute("SELECT size, mtime FROM source").fetchall() != [source]:
+            with store.connection:  # a load that fails leaves the database as it was
+                for table in TABLES:
+                    store.connection.execute(f"DELETE FROM {table}")
+                store.write(stream_records(path))
+                store.connection.execute("INSERT INTO source VALUES (?, ?)", source)
+        return store
+
+    def load(self, records: Iterable[Union[Individual, Family]]) -> None:
+        """ insert records in batches of BATCH_SIZE, in one transaction """
+        with self.connection:
+            self.write(records)
+
+    def write(self, records: Iterable[Union[Individual, Family]]) -> None:
+        """ insert records in batches of BATCH_SIZE, in the current transaction """
+        def last_row(table: str) -> Optional[int]:
+            return self.connection.execute(f"SELECT max(rowid) FROM {table}").fetchone()[0]
+
+        rows: Dict[type, int] = {Individual: last_row('individuals'), Family: last_row('families')}
+        fresh: bool = rows[Individual] is None and rows[Family] is None  # no id can be taken by an earlier load
+        rows = {kind: row or 0 for kind, row in rows.items()}
+        seen: Dict[type, set] = {Individual: set(), Family: set()}
+        records = iter(records)
+
+        for batch in iter(lambda: list(islice(records, BATCH_SIZE)), []):
+            individuals, families, child_links, family_links, events = [], [], [], [], []
+            for record in batch:
+                kind: type = type(record)
+                if record.id in seen[kind] or not fresh and self.taken(record):
+                    continue  # keep the first record of a repeated id
+                seen[kind].add(record.id)
+                rows[kind] += 1
+                if kind is Individual:
+                    individuals.append((rows[kind], record.id, record.name, record.sex, int(bool(record.alive))))
+                    family_links.extend((rows[kind], record.id, family, tag, position)
+                                        for tag, ids in (('FAMC', record.famc), ('FAMS', record.fams))
+                                        for position, family in enumerate(ids))
+                    record_events = (('BIRT', record.birt), ('DEAT', record.deat))
+                else:
+                    families.append((rows[kind], record.id, record.husb, record.wife))
+                    child_links.extend((rows[kind], record.id, child, position)
+                                       for position, child in enumerate(record.chil))
+                    record_events = (('MARR', record.marr), ('DIV', record.div))
+                events.extend((record.id, tag, event.date, to_ordinal(event))
+                              for tag, event in record_events if isinstance(event, Event))
+
+            self.connection.executemany("INSERT INTO individuals (rowid, id, name, sex, alive) "
+                                        "VALUES (?, ?, ?, ?, ?)", individuals)
+            self.connection.executemany("INSERT INTO families (rowid, id, husb, wife) VALUES (?, ?, ?, ?)",
+                                        families)
+            self.connection.executemany("INSERT INTO child_links VALUES (?, ?, ?, ?)", child_links)
+            self.connection.executemany("INSERT INTO family_links VALUES (?, ?, ?, ?, ?)", family_links)
+            self.connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", events)
+
+    def taken(self, record: Union[Individual, Family]) -> bool:
+        """ return True if the database already has a record of this kind with this id """
+        table: str = 'individuals' if isinstance(record, Individual) else 'families'
+        return self.connection.execute(f"SELECT 1 FROM {table} WHERE id = ?", (record.id,)).fetchone() is not None
+
+    def insert(self, record: Union[Individual, Family]) -> bool:
+        """ insert one record with its links and events; return False if its id is already taken """
+        if self.taken(record):
+            return False
+        self.load([record])
+        return True
+
+    def delete(self, _id, kinds: tuple = (Individual, Family)) -> None:
+        """ delete the rows of the records of kinds with the given id, in the current transaction """
+        statements: List[str] = []
+        if Individual in kinds:
+            statements += ["DELETE FROM family_links WHERE individual = ?",
+                           "DELETE FROM events WHERE record = ? AND tag IN ('BIRT', 'DEAT')",
+                           "DELETE FROM individuals WHERE id = ?"]
+        if Family in kinds:
+            statements += ["DELETE FROM child_links WHERE family = ?",
+                           "DELETE FROM events WHERE record = ? AND tag IN ('MARR', 'DIV')",
+                           "DELETE FROM families WHERE id = ?"]
+        for statement in statements:
+            self.connection.execute(statement, (_id,))
+
+    @staticmethod
+    def event(row: Optional[int], date_text: Optional[str], missing):
+        """ return the Event of a joined events row, or missing (None or False, as in a parsed record) """
+        return missing if row is None else Event(date_text)
+
+    def build_individual(self, row: Tuple, links: Dict[str, List[str]]) -> Individual:
+        """ return an Individual from a row of INDIVIDUALS_QUERY and its FAMC/FAMS links """
+        _, _id, name, sex, alive, birt_row, birt, deat_row, deat = row
+        individual = Individual(_id, name, sex, self.event(birt_row, birt, None), bool(alive),
+                                self.event(deat_row, deat, False))
+        individual.famc, individual.fams = links.get('FAMC', []), links.get('FAMS', [])
+        return individual
+
+    def build_family(self, row: Tuple, children: List[str]) -> Family:
+        """ return a Family from a row of FAMILIES_QUERY and its children """
+        _, _id, husb, wife, marr_row, marr, div_row, div = row
+        family = Family(_id, self.event(marr_row, marr, None), husb, wife, self.event(div_row, div, False))
+        family.chil = children
+        return family
+
+    def individual(self, _id) -> Individual:
+        """ return the Individual with the given id, raise KeyError if there is none """
+        row = self.connection.execute(INDIVIDUALS_QUERY + "WHERE i.id = ?", (_id,)).fetchone()
+        if row is None:
+            raise KeyError(_id)
+        links: Dict[str, List[str]] = {}
+        for family, tag in self.connection.execute(
+                "SELECT family, tag FROM family_links WHERE individual_row = ? ORDER BY tag, position", (row[0],)):
+            links.setdefault(tag, []).append(family)
+        return self.build_individual(row, links)
+
+    def family(self, _id) -> Family:
+        """ return the Family with the given id, raise KeyError if there is none """
+        row = self.connection.execute(FAMILIES_QUERY + "WHERE f.id = ?", (_id,)).fetchone()
+        if row is None:
+            raise KeyError(_id)
+        return self.build_family(row, self.children(_id))
+
+    def get(self, _id, default=None) -> Optional[Individual]:
+        """ return the Individual with the given id or default """
+        try:
+            return self.individual(_id)
+        except KeyError:
+            return default
+
+    def get_family(self, _id, default=None) -> Optional[Family]:
+        """ return the Family with the given id or default """
+        try:
+            return self.family(_id)
+        except KeyError:
+            return default
+
+    def iter_families(self) -> Iterator[Family]:
+        """ iterate over the Family records in insertion order, merging in their children """
+        links = groupby(self.connection.execute(
+            "SELECT family_row, child FROM child_links ORDER BY family_row, position"), key=lambda link: link[0])
+        link_row, children = next(links, (None, iter(())))
+
+        for row in self.connection.execute(FAMILIES_QUERY + "ORDER BY f.rowid"):
+            family_children: List[str] = []
+            if link_row == row[0]:
+                family_children = [child for _, child in children]
+                link_row, children = next(links, (None, iter(())))
+            yield self.build_family(row, family_children)
+
+    def append(self, record: Union[Individual, Family]) -> None:
+        """ index a record unless its id is taken: the database keeps the first record of a repeated id """
+        self.insert(record)
+
+    def add(self, record: Union[Individual, Family]) -> None:
+        """ index a record, replacing the record of its kind with the same id, in one transaction """
+        with self.connection:
+            self.delete(record.id, (type(record),))
+            self.write([record])
+
+    def discard(self, _id) -> None:
+        """ remove the Individual or Family with the given id, if there is one """
+        with self.connection:
+            self.delete(_id)
+
+    # queries answered by the indexes
+
+    def children(self, family_id) -> List[str]:
+        """ return the ids of the children of a family, in CHIL order """
+        return [child for child, in self.connection.execute(
+            "SELECT child FROM child_links WHERE family = ? ORDER BY position", (family_id,))]
+
+    def parent_families(self, _id) -> List[str]:
+        """ return the ids of the families that list an individual as a child """
+        return [family for family, in self.connection.execute(
+            "SELECT family FROM child_links WHERE child = ? ORDER BY family_row", (_id,))]
+
+    def spouse_families(self, _id) -> List[str]:
+        """ return the ids of the families with an individual as husband or wife """
+        return [family for family, in self.connection.execute(
+            "SELECT id FROM families WHERE husb = ? UNION SELECT id FROM families WHERE wife = ?", (_id, _id))]
+
+    def events_between(self, tag: str, start: date, end: date) -> List[Tuple[str, str]]:
+        """ return (record id, date) of the events with this tag dated from start to end inclusive, by date """
+        return self.connection.execute(
+            "SELECT record, date FROM events WHERE tag = ? AND ordinal BETWEEN ? AND ? ORDER BY ordinal, record",
+            (tag, start.toordinal(), end.toordinal())).fetchall()
+
+    def __getitem__(self, _id) -> Individual:
+        return self.individual(_id)
+
+    def __contains__(self, _id) -> bool:
+        return self.connection.execute("SELECT 1 FROM individuals WHERE id = ?", (_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[Individual]:
+        links = groupby(self.connection.execute(
+            "SELECT individual_row, tag, family FROM family_links ORDER BY individual_row, tag, position"),
+            key=lambda link: link[0])
+        link_row, rows = next(links, (None, iter(())))
+
+        for row in self.connection.execute(INDIVIDUALS_QUERY + "ORDER BY i.rowid"):
+            individual_links: Dict[str, List[str]] = {}
+            if link_row == row[0]:
+                for _, tag, family in rows:
+                    individual_links.setdefault(tag, []).append(family)
+                link_row, rows = next(links, (None, iter(())))
+            yield self.build_individual(row, individual_links)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM individuals").fetchone()[0]
+
+    def close(self) -> None:
+        """ close the database """
+        self.connection.close()
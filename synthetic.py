@@ -0,0 +1,535 @@
+""" Synthetic GEDCOM generator for scale and load testing
+
+    The tree is made of clans: a founder, the spouses they marry, their children and, generation
+    by generation, the spouses and children of their descendants. A clan is generated in memory,
+    written out and dropped before the next one, so a file of any size is streamed in the memory
+    of a single clan. The same seed and sizes always give the same file.
+
+    The dates follow the user stories: spouses marry after 18, children are born during the
+    marriage, at least a year apart and while their mother is under 46, twins a day apart, and
+    nothing happens after LAST_DATE. Anomalies can be planted per user story, at most one per
+    clan; they are spread over the file and their ids kept in TreeGenerator.planted. A file too
+    small for as many clans as anomalies gets fewer of them.
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import sys
+from datetime import date, timedelta
+from itertools import permutations
+from math import exp
+from random import Random
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+LAST_DATE: date = date(2020, 12, 31)  # no event is generated after it, so the output does not depend on today
+MONTHS: List[str] = ['', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+CHILDREN: float = 2.5  # average children of a couple
+GENERATIONS: int = 4  # generations of a clan, its founder's included
+REMARRIAGE: float = 0.3  # chance that a divorced or widowed person marries again
+DIVORCE: float = 0.15  # chance that a couple divorces
+TWINS: float = 0.02  # chance that a birth is of twins
+MARRIAGE: float = 0.85  # chance that a descendant marries
+MAX_CHILDREN: int = 14  # US15: fewer than 15 siblings
+MAX_MARRIAGES: int = 3
+GENERATION_YEARS: int = 28
+
+MALE_NAMES: List[str] = ['James', 'John', 'Robert', 'Michael', 'William', 'David', 'Richard', 'Joseph', 'Thomas',
+                         'Charles', 'Daniel', 'Matthew', 'Anthony', 'Mark', 'Paul', 'Steven', 'Andrew', 'Kenneth',
+                         'George', 'Edward', 'Brian', 'Ronald', 'Kevin', 'Jason', 'Gary', 'Fatih', 'Ahmet', 'Mehmet']
+FEMALE_NAMES: List[str] = ['Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 'Jessica',
+                           'Sarah', 'Karen', 'Nancy', 'Lisa', 'Betty', 'Margaret', 'Sandra', 'Ashley', 'Emily',
+                           'Donna', 'Michelle', 'Carol', 'Amanda', 'Melissa', 'Deborah', 'Laura', 'Ayse', 'Fatma']
+SURNAMES: List[str] = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'RODRIGUEZ',
+                       'MARTINEZ', 'HERNANDEZ', 'LOPEZ', 'GONZALEZ', 'WILSON', 'ANDERSON', 'THOMAS', 'TAYLOR',
+                       'MOORE', 'JACKSON', 'MARTIN', 'LEE', 'PEREZ', 'THOMPSON', 'WHITE', 'HARRIS', 'SANCHEZ',
+                       'CLARK', 'RAMIREZ', 'LEWIS', 'ROBINSON', 'WALKER', 'YOUNG', 'ALLEN', 'KING', 'WRIGHT',
+                       'SCOTT', 'TORRES', 'NGUYEN', 'HILL', 'FLORES', 'IZGI', 'YILMAZ', 'YAVUZ', 'OZTAS', 'ESKI']
+
+
+def years(count: float) -> timedelta:
+    """ return count years as a timedelta """
+    return timedelta(days=round(count * 365.25))
+
+
+def gedcom_date(day: date) -> str:
+    """ return a date in the format of the DATE lines, like '9 NOV 1994' """
+    return f"{day.day} {MONTHS[day.month]} {day.year}"
+
+
+def poisson(rng: Random, mean: float) -> int:
+    """ return a count drawn from a Poisson distribution """
+    limit: float = exp(-mean)
+    count: int = 0
+    product: float = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+class Person:
+    """ holds an individual of a clan """
+    __slots__ = ('id', 'given', 'surname', 'sex', 'birth', 'death', 'famc', 'fams')
+
+    def __init__(self, _id: str, given: str, surname: str, sex: str, birth: date, death: Optional[date],
+                 famc: Optional[str] = None):
+        """ store Person info """
+        self.id = _id
+        self.given = given
+        self.surname = surname
+        self.sex = sex
+        self.birth = birth
+        self.death = death
+        self.famc = famc
+        self.fams: List[str] = []
+
+    def lines(self) -> str:
+        """ return the INDI record """
+        text: str = (f"0 {self.id} INDI\n1 NAME {self.given} /{self.surname}/\n2 GIVN {self.given}\n"
+                     f"2 SURN {self.surname}\n1 SEX {self.sex}\n1 BIRT\n2 DATE {gedcom_date(self.birth)}\n")
+        if self.death is not None:
+            text += f"1 DEAT\n2 DATE {gedcom_date(self.death)}\n"
+        if self.famc is not None:
+            text += f"1 FAMC {self.famc}\n"
+        return text + "".join(f"1 FAMS {family_id}\n" for family_id in self.fams)
+
+
+class Couple:
+    """ holds a family of a clan """
+    __slots__ = ('id', 'husb', 'wife', 'marr', 'div', 'chil')
+
+    def __init__(self, _id: str, husb: Person, wife: Person, marr: date):
+        """ store Couple info """
+        self.id = _id
+        self.husb = husb
+        self.wife = wife
+        self.marr = marr
+        self.div: Optional[date] = None
+        self.chil: List[Person] = []
+
+    def lines(self) -> str:
+        """ return the FAM record """
+        text: str = f"0 {self.id} FAM\n1 HUSB {self.husb.id}\n1 WIFE {self.wife.id}\n"
+        text += "".join(f"1 CHIL {child.id}\n" for child in self.chil)
+        text += f"1 MARR\n2 DATE {gedcom_date(self.marr)}\n"
+        if self.div is not None:
+            text += f"1 DIV\n2 DATE {gedcom_date(self.div)}\n"
+        return text
+
+
+class Clan:
+    """ the people and couples generated together """
+    def __init__(self):
+        """ store Clan info """
+        self.people: List[Person] = []
+        self.couples: List[Couple] = []
+
+    def offspring(self, person: Person) -> List[Person]:
+        """ return the children of a person from all their marriages """
+        return [child for couple in self.couples if person in (couple.husb, couple.wife) for child in couple.chil]
+
+    def lines(self) -> str:
+        """ return the INDI records, then the FAM records """
+        return "".join(person.lines() for person in self.people) + "".join(couple.lines() for couple in self.couples)
+
+
+class TreeGenerator:
+    """ generates a tree of about individuals people as a stream of GEDCOM lines
+
+        anomalies maps a user story id, one of PLANTERS, to the number of its anomalies to plant;
+        planted records may add a few people and families to the tree
+    """
+    def __init__(self, individuals: int, seed: int = 0, children: float = CHILDREN,
+                 generations: int = GENERATIONS, remarriage: float = REMARRIAGE, divorce: float = DIVORCE,
+                 twins: float = TWINS, anomalies: Optional[Dict[str, int]] = None):
+        """ store TreeGenerator info; raise ValueError for a story that cannot be planted """
+        unknown: List[str] = [story for story in anomalies or {} if story not in PLANTERS]
+        if unknown:
+            raise ValueError(f"cannot plant {', '.join(unknown)}; stories: {', '.join(PLANTERS)}")
+        self.individuals = individuals
+        self.seed = seed
+        self.children = children
+        self.generations = max(1, generations)
+        self.remarriage = remarriage
+        self.divorce = divorce
+        self.twins = twins
+        self.anomalies: Dict[str, int] = dict(anomalies or {})
+        self.planted: Dict[str, List[str]] = {story: [] for story in self.anomalies}  # story -> planted record ids
+        self.people: int = 0  # written so far, planted records included
+        self.families: int = 0
+        self.rng: Random = Random(seed)
+        self.remaining: int = individuals
+        self.next_person: int = 1
+        self.next_family: int = 1
+        latest: int = LAST_DATE.year - 30 - GENERATION_YEARS * (self.generations - 1)
+        self.founder_years: Tuple[int, int] = (max(1000, latest - 20), max(1000, latest))
+
+    def lines(self) -> Iterator[str]:
+        """ yield the file a clan at a time, each as one string of lines """
+        self.rng = Random(self.seed)
+        self.remaining, self.next_person, self.next_family = self.individuals, 1, 1
+        self.people, self.families = 0, 0
+        self.planted = {story: [] for story in self.anomalies}
+        yield f"0 HEAD\n0 NOTE synthetic tree, seed {self.seed}\n"
+        while self.remaining > 0:
+            clan: Clan = self.clan()
+            self.plant(clan)
+            self.people += len(clan.people)
+            self.families += len(clan.couples)
+            yield clan.lines()
+        yield "0 TRLR\n"
+
+    def write(self, file: TextIO) -> None:
+        """ write the file to an open text file """
+        file.writelines(self.lines())
+
+    def person(self, clan: Clan, sex: str, surname: str, birth: date, famc: Optional[str] = None) -> Person:
+        """ add a person of the given sex, born on birth, with a random name and life span """
+        death: Optional[date] = birth + timedelta(days=self.rng.randint(50 * 365, 95 * 365))
+        given: str = self.rng.choice(MALE_NAMES if sex == 'M' else FEMALE_NAMES)
+        person: Person = Person(f"@I{self.next_person}@", given, surname, sex, birth,
+                                death if death <= LAST_DATE else None, famc)
+        self.next_person += 1
+        self.remaining -= 1
+        clan.people.append(person)
+        return person
+
+    def couple(self, clan: Clan, first: Person, second: Person, marr: date) -> Couple:
+        """ add a family of two people married on marr """
+        husb, wife = (first, second) if first.sex == 'M' else (second, first)
+        couple: Couple = Couple(f"@F{self.next_family}@", husb, wife, marr)
+        self.next_family += 1
+        husb.fams.append(couple.id)
+        wife.fams.append(couple.id)
+        clan.couples.append(couple)
+        return couple
+
+    def clan(self) -> Clan:
+        """ generate a founder and their descendants for the given number of generations """
+        clan: Clan = Clan()
+        born: date = date(self.rng.randint(*self.founder_years), 1, 1) + timedelta(days=self.rng.randint(0, 364))
+        generation: List[Person] = [self.person(clan, 'M', self.rng.choice(SURNAMES), born)]
+        for _ in range(self.generations - 1):
+            following: List[Person] = []
+            for person in generation:
+                if self.rng.random() < MARRIAGE:
+                    following.extend(self.marriages(clan, person))
+            generation = following
+        return clan
+
+    def marriages(self, clan: Clan, person: Person) -> List[Person]:
+        """ marry a descendant, again after a divorce or the death of their spouse; return the children """
+        children: List[Person] = []
+        marr: date = person.birth + years(self.rng.randint(20, 32))
+        for _ in range(MAX_MARRIAGES):
+            if self.remaining <= 0 or marr > LAST_DATE or (person.death is not None and marr >= person.death) \
+                    or marr - person.birth > years(60):
+                break
+            latest_birth: date = marr - years(18)
+            spouse_birth: date = min(latest_birth, person.birth + timedelta(days=self.rng.randint(-1825, 1825)))
+            spouse: Person = self.person(clan, 'F' if person.sex == 'M' else 'M', self.rng.choice(SURNAMES),
+                                         spouse_birth)
+            couple: Couple = self.couple(clan, person, spouse, marr)
+            children.extend(self.births(clan, couple))
+            self.separation(couple)
+            if self.rng.random() >= self.remarriage:
+                break
+            if couple.div is not None:
+                marr = couple.div + timedelta(days=self.rng.randint(180, 1825))
+            elif spouse.death is not None:
+                marr = spouse.death + timedelta(days=self.rng.randint(365, 1825))
+            else:
+                break
+        return children
+
+    def births(self, clan: Clan, couple: Couple) -> List[Person]:
+        """ add the children of a couple, at least a year apart, twins a day apart """
+        husb, wife = couple.husb, couple.wife
+        ends: List[date] = [LAST_DATE, wife.birth + years(46)] + [death for death in (husb.death, wife.death) if death]
+        end: date = min(ends)
+        born: date = couple.marr + timedelta(days=self.rng.randint(300, 1095))
+        count: int = min(MAX_CHILDREN, poisson(self.rng, self.children))
+        while len(couple.chil) < count and born < end and self.remaining > 0:
+            twins: bool = self.rng.random() < self.twins and len(couple.chil) + 1 < MAX_CHILDREN
+            for day in ([born, born + timedelta(days=1)] if twins else [born]):
+                if self.remaining > 0 and day <= LAST_DATE:
+                    couple.chil.append(self.person(clan, self.rng.choice('MF'), husb.surname, day, couple.id))
+            born += timedelta(days=self.rng.randint(365, 1460))
+        return couple.chil
+
+    def separation(self, couple: Couple) -> None:
+        """ divorce a couple after their last child, if neither spouse dies first """
+        if self.rng.random() < self.divorce:
+            last: date = couple.chil[-1].birth if couple.chil else couple.marr
+            div: date = last + timedelta(days=self.rng.randint(180, 3650))
+            deaths: List[date] = [death for death in (couple.husb.death, couple.wife.death) if death]
+            if div <= min([LAST_DATE] + deaths):
+                couple.div = div
+
+    def plant(self, clan: Clan) -> None:
+        """ plant the anomaly that has waited longest for its share of the people, one per clan so that
+            anomalies do not overwrite each other; the k-th of count is due after (k - 1) / count of the file """
+        done: int = self.people
+        due: List[Tuple[float, str]] = [(len(self.planted[story]) / count, story)
+                                        for story, count in self.anomalies.items()
+                                        if len(self.planted[story]) < count
+                                        and done * count >= len(self.planted[story]) * self.individuals]
+        for _, story in sorted(due):
+            record_id: Optional[str] = PLANTERS[story](self, clan)
+            if record_id is not None:  # else no record of the clan fits; try the next story
+                self.planted[story].append(record_id)
+                return
+
+
+def unmarried(people: List[Person], sex: str, adult_by: date = LAST_DATE) -> List[Person]:
+    """ return the people of a sex with no family of their own who are 20 by adult_by """
+    return [person for person in people
+            if person.sex == sex and not person.fams and person.birth + years(20) <= adult_by]
+
+
+def pick(generator: TreeGenerator, candidates: List) -> Optional[object]:
+    """ return a random candidate, None if there is none """
+    return generator.rng.choice(candidates) if candidates else None
+
+
+def plant_us01(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US01: a birth after the current date """
+    person: Optional[Person] = pick(generator, [person for person in clan.people if not person.fams])
+    if person is None:
+        return None
+    person.birth, person.death = date(generator.rng.randint(2100, 2200), person.birth.month, 1), None
+    return person.id
+
+
+def plant_us03(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US03: a death before the birth """
+    person: Optional[Person] = pick(generator, [person for person in clan.people if not person.fams])
+    if person is None:
+        return None
+    person.death = person.birth - timedelta(days=generator.rng.randint(1, 3650))
+    return person.id
+
+
+def plant_us04(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US04: a divorce before the marriage """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    couple.div = couple.marr - timedelta(days=generator.rng.randint(1, 3650))
+    return couple.id
+
+
+def plant_us05(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US05: a marriage after the deaths of both spouses """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    for spouse in (couple.husb, couple.wife):
+        spouse.death = max(spouse.birth, couple.marr - timedelta(days=generator.rng.randint(1, 365)))
+    return couple.id
+
+
+def plant_us06(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US06: a divorce after the deaths of both spouses """
+    couple: Optional[Couple] = pick(generator, [couple for couple in clan.couples
+                                                if couple.husb.death and couple.wife.death
+                                                and max(couple.husb.death, couple.wife.death) < LAST_DATE])
+    if couple is None:
+        return None
+    last: date = max(couple.husb.death, couple.wife.death)
+    couple.div = last + timedelta(days=generator.rng.randint(1, (LAST_DATE - last).days))
+    return couple.id
+
+
+def plant_us07(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US07: a person living for more than 150 years """
+    person: Optional[Person] = pick(generator, [person for person in clan.people if not person.fams])
+    if person is None:
+        return None
+    person.birth, person.death = LAST_DATE - years(generator.rng.randint(151, 200)), None
+    return person.id
+
+
+def plant_us08(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US08: the first child born before the marriage of the parents """
+    couple: Optional[Couple] = pick(generator, [couple for couple in clan.couples if couple.chil])
+    if couple is None:
+        return None
+    couple.chil[0].birth = couple.marr - timedelta(days=generator.rng.randint(30, 3650))
+    return couple.id
+
+
+def plant_us09(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US09: the last child born after the death of the mother """
+    couple: Optional[Couple] = pick(generator, [couple for couple in clan.couples if couple.chil])
+    if couple is None:
+        return None
+    couple.wife.death = max(couple.wife.birth, couple.chil[-1].birth - timedelta(days=generator.rng.randint(1, 365)))
+    return couple.id
+
+
+def plant_us10(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US10: a spouse who married into the clan married before 14 """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    spouse: Person = couple.wife if couple.wife.famc is None else couple.husb
+    spouse.birth = couple.marr - timedelta(days=generator.rng.randint(10 * 365, 13 * 365))
+    return couple.id
+
+
+def plant_us13(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US13: a child born less than eight months after the first one """
+    couple: Optional[Couple] = pick(generator, [couple for couple in clan.couples if len(couple.chil) > 1])
+    if couple is None:
+        return None
+    first: Person = min(couple.chil, key=lambda child: child.birth)
+    second: Person = next(child for child in couple.chil if child is not first)
+    second.birth = first.birth + timedelta(days=generator.rng.randint(30, 240))
+    return couple.id
+
+
+def plant_us14(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US14: six children born on the same day """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    born: date = min(LAST_DATE, couple.marr + years(1))
+    for _ in range(6):
+        couple.chil.append(generator.person(clan, generator.rng.choice('MF'), couple.husb.surname, born, couple.id))
+    return couple.id
+
+
+def plant_us15(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US15: fifteen siblings """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    born: date = max([couple.marr] + [child.birth for child in couple.chil])
+    while len(couple.chil) < 15:
+        born += timedelta(days=generator.rng.randint(365, 500))
+        couple.chil.append(generator.person(clan, generator.rng.choice('MF'), couple.husb.surname, born, couple.id))
+    return couple.id
+
+
+def plant_us16(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US16: a son with another last name than his father """
+    couple: Optional[Couple] = pick(generator, [couple for couple in clan.couples
+                                                if any(child.sex == 'M' and not child.fams for child in couple.chil)])
+    if couple is None:
+        return None
+    son: Person = next(child for child in couple.chil if child.sex == 'M' and not child.fams)
+    son.surname = generator.rng.choice([surname for surname in SURNAMES if surname != couple.husb.surname])
+    return couple.id
+
+
+def plant_us19(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US19: first cousins married to each other """
+    for grandparents in clan.couples:
+        married: List[Person] = [child for child in grandparents.chil if child.fams]
+        for parent1, parent2 in permutations(married, 2):
+            men: List[Person] = unmarried(clan.offspring(parent1), 'M')
+            women: List[Person] = unmarried(clan.offspring(parent2), 'F')
+            if men and women:
+                marr: date = max(men[0].birth, women[0].birth) + years(20)
+                return generator.couple(clan, men[0], women[0], marr).id
+    return None
+
+
+def plant_us20(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US20: an aunt or uncle married to a niece or nephew """
+    for grandparents in clan.couples:
+        for parent in grandparents.chil:
+            for nephew in [child for child in clan.offspring(parent) if not child.fams]:
+                sex: str = 'F' if nephew.sex == 'M' else 'M'
+                aunts: List[Person] = [aunt for aunt in unmarried(grandparents.chil, sex) if aunt is not parent]
+                if aunts and nephew.birth + years(20) <= LAST_DATE:
+                    marr: date = max(aunts[0].birth, nephew.birth) + years(20)
+                    return generator.couple(clan, aunts[0], nephew, marr).id
+    return None
+
+
+def plant_us21(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US21: a husband recorded as female """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    couple.husb.sex = 'F'
+    return couple.id
+
+
+def plant_us22(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US22: a second individual with the id of another """
+    person: Optional[Person] = pick(generator, clan.people)
+    if person is None:
+        return None
+    clan.people.append(Person(person.id, generator.rng.choice(MALE_NAMES), generator.rng.choice(SURNAMES), 'M',
+                              person.birth + years(1), None))
+    return person.id
+
+
+def plant_us23(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US23: a second individual with the name and birth date of another """
+    person: Optional[Person] = pick(generator, clan.people)
+    if person is None:
+        return None
+    twin: Person = generator.person(clan, person.sex, person.surname, person.birth)
+    twin.given = person.given
+    return twin.id
+
+
+def plant_us24(generator: TreeGenerator, clan: Clan) -> Optional[str]:
+    """ US24: a second family with the spouses and marriage date of another """
+    couple: Optional[Couple] = pick(generator, clan.couples)
+    if couple is None:
+        return None
+    return generator.couple(clan, couple.husb, couple.wife, couple.marr).id
+
+
+PLANTERS: Dict[str, Callable[[TreeGenerator, Clan], Optional[str]]] = {
+    'US01': plant_us01, 'US03': plant_us03, 'US04': plant_us04, 'US05': plant_us05, 'US06': plant_us06,
+    'US07': plant_us07, 'US08': plant_us08, 'US09': plant_us09, 'US10': plant_us10, 'US13': plant_us13,
+    'US14': plant_us14, 'US15': plant_us15, 'US16': plant_us16, 'US19': plant_us19, 'US20': plant_us20,
+    'US21': plant_us21, 'US22': plant_us22, 'US23': plant_us23, 'US24': plant_us24}
+
+
+def write_file(path: str, individuals: int, **options) -> TreeGenerator:
+    """ write a synthetic .ged file of about individuals people; options go to TreeGenerator """
+    generator: TreeGenerator = TreeGenerator(individuals, **options)
+    with open(path, "w") as file:
+        generator.write(file)
+    return generator
+
+
+def main(argv: List[str] = None) -> None:
+    """ write a synthetic .ged file and print what was planted in it """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="write a synthetic .ged file")
+    parser.add_argument("path")
+    parser.add_argument("--individuals", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--children", type=float, default=CHILDREN, help="average children of a couple")
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--remarriage", type=float, default=REMARRIAGE)
+    parser.add_argument("--divorce", type=float, default=DIVORCE)
+    parser.add_argument("--twins", type=float, default=TWINS)
+    parser.add_argument("--plant", action='append', default=[], metavar="STORY=COUNT",
+                        help=f"plant anomalies of a user story, one of {', '.join(PLANTERS)}")
+    args = parser.parse_args(argv)
+
+    anomalies: Dict[str, int] = {story: int(count) for story, _, count in
+                                 (plant.partition("=") for plant in args.plant)}
+    generator: TreeGenerator = write_file(args.path, args.individuals, seed=args.seed, children=args.children,
+                                          generations=args.generations, remarriage=args.remarriage,
+                                          divorce=args.divorce, twins=args.twins, anomalies=anomalies)
+    print(f"{args.path}: {generator.people} individuals, {generator.families} families")
+    for story, record_ids in generator.planted.items():
+        more: str = ", ..." if len(record_ids) > 5 else ""
+        print(f"{story}: {len(record_ids)} planted ({', '.join(record_ids[:5])}{more})")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+""" Implement test cases for the synthetic tree generator
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from typing import Dict
+
+import app
+import synthetic
+import user_stories as us
+from models import GedcomIndex
+from findings import CollectorSink, ERROR, reporting_to
+from rules import run_rules
+
+
+class TestSynthetic(unittest.TestCase):
+    """ test class of the generator """
+
+    def test_synthetic(self):
+        """ test the synthetic files are reproducible and parse into linked records """
+        text: str = "".join(synthetic.TreeGenerator(2000, seed=7).lines())
+        self.assertEqual(text, "".join(synthetic.TreeGenerator(2000, seed=7).lines()))
+        self.assertNotEqual(text, "".join(synthetic.TreeGenerator(2000, seed=8).lines()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "synthetic.ged")
+            generator = synthetic.write_file(path, 2000, seed=7, twins=0.5, divorce=0.5)
+            individuals, families = app.parse_file(path)
+        self.assertEqual((len(individuals), len(families)), (generator.people, generator.families))
+        self.assertEqual(len(individuals), 2000)
+        index: GedcomIndex = GedcomIndex(individuals, families)
+        last: datetime = datetime.combine(synthetic.LAST_DATE, datetime.min.time())
+        for family in families:
+            self.assertIn(family.id, index[family.husb].fams)
+            self.assertIn(family.id, index[family.wife].fams)
+            self.assertLessEqual(family.marr.datetime, last)
+            self.assertTrue(all(index[child].famc == [family.id] for child in family.chil))
+        self.assertTrue(any(family.div for family in families))
+        self.assertTrue(all(individual.birt.datetime <= last for individual in individuals))
+        self.assertRaises(ValueError, synthetic.TreeGenerator, 10, anomalies={'US99': 1})
+
+    def test_synthetic_anomalies(self):
+        """ test the anomalies planted in a synthetic tree are the ones the user stories find """
+        generator = synthetic.TreeGenerator(3000, seed=2, anomalies={story: 1 for story in synthetic.PLANTERS})
+        individuals, families = app.generate_classes("".join(generator.lines()).splitlines(keepends=True))
+        self.assertEqual({story: len(ids) for story, ids in generator.planted.items()},
+                         {story: 1 for story in synthetic.PLANTERS})
+        planted: Dict[str, str] = {story: ids[0] for story, ids in generator.planted.items()}
+
+        index: GedcomIndex = GedcomIndex(individuals, families)
+        with reporting_to(CollectorSink()) as sink:
+            run_rules(index)
+        errors: Dict[str, set] = {}
+        for finding in sink.findings:
+            if finding.severity == ERROR:
+                errors.setdefault(finding.rule_id, set()).update(finding.record_ids)
+
+        for story in ['US01', 'US03', 'US04', 'US07', 'US08', 'US09', 'US10', 'US13', 'US14', 'US15', 'US19',
+                      'US21', 'US22', 'US23', 'US24']:
+            self.assertIn(planted[story], errors[story], story)
+        for story in ['US05', 'US06']:  # reported by the ids of the spouses
+            self.assertIn(index.family(planted[story]).husb, errors[story], story)
+        self.assertFalse(us.male_last_names(index.family(planted['US16']), index))
+        self.assertIn(planted['US20'], errors['CONSANG'])  # US20 only compares the spouses' parent families
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False, verbosity=2)
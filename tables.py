@@ -0,0 +1,89 @@
+""" Streaming text tables for printing large trees
+
+    PrettyTable keeps every row and measures every cell before it prints the first line. The
+    renderer here measures a sample of the first rows only (or takes fixed widths), then writes
+    each row as soon as it is made, so memory does not grow with the tree and the output starts
+    at once. A cell wider than its column is cut short with "...".
+
+    date: 16-Oct-2026
+    python: v3.8.4
+"""
+
+import sys
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from models import Individual, Family, GedcomIndex
+
+INDIVIDUAL_FIELDS: List[str] = ["ID", "Name", "Gender", "Birthday", "Age", "Alive", "Death", "Child", "Spouse"]
+FAMILY_FIELDS: List[str] = ["ID", "Married", "Divorced", "Husband ID", "Husband Name",
+                            "Wife ID", "Wife Name", "Child"]
+SAMPLE_ROWS: int = 1000  # rows measured to size the columns
+MAX_WIDTH: int = 40  # widest column a sample can ask for
+PRETTY_TABLE_ROWS: int = 10_000  # up to this many records, pretty_print uses PrettyTable
+
+Row = Sequence[object]
+
+
+def individual_rows(individuals: Iterable[Individual]) -> Iterator[Row]:
+    """ yield the row of each Individual """
+    for individual in individuals:
+        yield individual.info()
+
+
+def family_rows(families: Iterable[Family], index: GedcomIndex) -> Iterator[Row]:
+    """ yield the row of each Family, the spouse names looked up by id; 'NA' for a spouse with no record """
+    for family in families:
+        div = 'NA' if family.div is False else family.div['date']
+        chil = 'NA' if len(family.chil) == 0 else family.chil
+        husband: Optional[Individual] = index.get(family.husb)
+        wife: Optional[Individual] = index.get(family.wife)
+        yield [family.id, family.marr['date'] if family.marr else 'NA', div,
+               family.husb, husband.name if husband else 'NA', family.wife, wife.name if wife else 'NA', chil]
+
+
+def page(rows: Iterable[Row], offset: int = 0, limit: Optional[int] = None) -> Iterator[Row]:
+    """ skip offset rows and yield up to limit rows after them, all of them when limit is None """
+    return islice(rows, offset, None if limit is None else offset + limit)
+
+
+def sampled_widths(header: Sequence[str], rows: Iterable[Row], max_width: int = MAX_WIDTH) -> List[int]:
+    """ return the width of each column: its widest cell in rows, at most max_width, and never less than its name """
+    widths: List[int] = [0] * len(header)
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(str(cell)))
+    return [max(len(name), min(width, max_width)) for name, width in zip(header, widths)]
+
+
+def fit(cell: object, width: int) -> str:
+    """ return a cell centered in width characters, cut short with '...' when it is wider """
+    text: str = str(cell)
+    if len(text) > width:
+        text = text[:width - 3] + "..." if width > 3 else text[:width]
+    return text.center(width)
+
+
+def render(header: Sequence[str], rows: Iterable[Row], widths: Optional[Sequence[int]] = None,
+           sample: int = SAMPLE_ROWS, max_width: int = MAX_WIDTH) -> Iterator[str]:
+    """ yield the lines of a table, without line ends; without widths, the first sample rows size the columns """
+    rows = iter(rows)
+    if widths is None:
+        head: List[Row] = list(islice(rows, sample))
+        widths = sampled_widths(header, head, max_width)
+        rows = chain(head, rows)
+    border: str = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    yield border
+    yield "| " + " | ".join(fit(name, width) for name, width in zip(header, widths)) + " |"
+    yield border
+    for row in rows:
+        yield "| " + " | ".join(fit(cell, width) for cell, width in zip(row, widths)) + " |"
+    yield border
+
+
+def write_table(title: str, header: Sequence[str], rows: Iterable[Row], file: Optional[TextIO] = None,
+                **options) -> None:
+    """ write a titled table line by line to file, sys.stdout by default; options go to render """
+    file = file or sys.stdout
+    file.write(title + "\n")
+    file.writelines(line + "\n" for line in render(header, rows, **options))
@@ -3,142 +3,167 @@
     date: 30-Sep-2020
     python: v3.8.4
 """
+import os
 import operator
-from typing import List, Dict, TextIO, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional, Set, TextIO, Tuple, Union
 from datetime import datetime, timedelta
 
-from dateutil.relativedelta import relativedelta
+from models import Individual, Family, GedcomIndex, Individuals, find_individual, find_individuals, \
+    find_all_individuals, parse_date
+from app import get_lines, parse_file
+from rules import rule, INDIVIDUAL, FAMILY, GLOBAL
+from findings import report, PASS, ERROR, INFO
 
-from models import Individual, Family
-from app import get_lines, generate_classes, findParents, checkIfSiblings
+if TYPE_CHECKING:  # the helper modules are imported by the checks that use them
+    from events import EventIndex
 
-lines = get_lines('SSW555-P1-fizgi.ged')
-individuals, families = generate_classes(lines)
-individuals.sort(key=operator.attrgetter('id'))
-families.sort(key=operator.attrgetter('id'))
+DATA_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'SSW555-P1-fizgi.ged')
 
 
-def birth_before_death_of_parents(family: Family, individuals: List[Individual]) -> bool:
+@lru_cache(maxsize=None)
+def load_dataset(path: str = DATA_PATH) -> Tuple[List[Individual], List[Family]]:
+    """ parse a .ged file the first time it is needed, records sorted by id """
+    individuals, families = parse_file(path)
+    individuals.sort(key=operator.attrgetter('id'))
+    families.sort(key=operator.attrgetter('id'))
+    return individuals, families
+
+
+def __getattr__(name: str):
+    """ load the module-level lines, individuals and families on first access """
+    if name == 'lines':
+        return get_lines(DATA_PATH)
+    if name == 'individuals':
+        return load_dataset()[0]
+    if name == 'families':
+        return load_dataset()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@rule('US09', FAMILY)
+def birth_before_death_of_parents(family: Family, individuals: Individuals) -> bool:
     """ US09: verify that children are born before death of mother
         and before 9 months after death of father """
 
-    husb = next(ind for ind in individuals if ind.id == family.husb)
-    wife = next(ind for ind in individuals if ind.id == family.wife)
+    husb = find_individual(individuals, family.husb)
+    wife = find_individual(individuals, family.wife)
 
     if not husb.deat and not wife.alive:
         return True
 
     for child_id in family.chil:
-        child_birth_date = next(ind.birt['date'] for ind in individuals if ind.id == child_id)
-        child_birth_date = datetime.strptime(child_birth_date, "%d %b %Y")
+        child_birth_date = find_individual(individuals, child_id).birt.datetime
 
         if husb.deat:
-            husb_death_date = husb.deat['date']
-            husb_death_date = datetime.strptime(husb_death_date, "%d %b %Y")
+            husb_death_date = husb.deat.datetime
 
             if child_birth_date > husb_death_date + timedelta(days=270):
-                print(f"✘ Family ({family.id}): Child ({child_id}) should be born "
-                      f"before 9 months after death of father")
+                report('US09', ERROR, (family.id, child_id),
+                       "Family ({}): Child ({}) should be born before 9 months after death of father")
                 return False
 
         if wife.deat:
-            wife_death_date = wife.deat['date']
-            wife_death_date = datetime.strptime(wife_death_date, "%d %b %Y")
+            wife_death_date = wife.deat.datetime
 
             if child_birth_date > wife_death_date:
-                print(f"✘ Family ({family.id}): Child ({child_id}) should be born before death of mother")
+                report('US09', ERROR, (family.id, child_id),
+                       "Family ({}): Child ({}) should be born before death of mother")
                 return False
     else:
-        print(f"✔ Family ({family.id}): Children are born before death of mother "
-              f"and before 9 months after death of father")
+        report('US09', PASS, family.id, "Family ({}): Children are born before death of mother "
+                                        "and before 9 months after death of father")
         return True
 
 
-def were_parents_over_14(family: Family, individuals: List[Individual]) -> bool:
+@rule('US10', FAMILY, when=lambda family: family.marr)
+def were_parents_over_14(family: Family, individuals: Individuals) -> bool:
     """ US10: verify that parents were at least 14 years old at the marriage date """
-    marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")
+    marr_date: datetime = family.marr.datetime
 
-    husb_birthday = next(ind.birt['date'] for ind in individuals if ind.id == family.husb)
-    husb_birthday = datetime.strptime(husb_birthday, "%d %b %Y")
+    husb_birthday = find_individual(individuals, family.husb).birt.datetime
     husb_marr_age = marr_date.year - husb_birthday.year - \
                     ((marr_date.month, marr_date.day) < (husb_birthday.month, husb_birthday.day))
 
-    wife_birthday = next(ind.birt['date'] for ind in individuals if ind.id == family.wife)
-    wife_birthday = datetime.strptime(wife_birthday, "%d %b %Y")
+    wife_birthday = find_individual(individuals, family.wife).birt.datetime
     wife_marr_age = marr_date.year - wife_birthday.year - \
                     ((marr_date.month, marr_date.day) < (wife_birthday.month, wife_birthday.day))
 
     if husb_marr_age >= 14 and wife_marr_age >= 14:
-        print(f"✔ Family ({family.id}): Both parents were at least 14 at the marriage date")
+        report('US10', PASS, family.id, "Family ({}): Both parents were at least 14 at the marriage date")
         return True
 
     if husb_marr_age < 14 and wife_marr_age < 14:
-        print(f"✘ Family ({family.id}): Husband ({husb_marr_age}) "
-              f"and Wife ({wife_marr_age}) can not be less than 14")
+        report('US10', ERROR, family.id, "Family ({}): Husband ({}) and Wife ({}) can not be less than 14",
+               family.id, husb_marr_age, wife_marr_age)
     elif husb_marr_age < 14:
-        print(f"✘ Family ({family.id}): Husband ({husb_marr_age}) can not be less than 14")
+        report('US10', ERROR, family.id, "Family ({}): Husband ({}) can not be less than 14", family.id, husb_marr_age)
     elif wife_marr_age < 14:
-        print(f"✘ Family ({family.id}): Wife ({wife_marr_age}) can not be less than 14")
+        report('US10', ERROR, family.id, "Family ({}): Wife ({}) can not be less than 14", family.id, wife_marr_age)
 
     return False
 
 
+@rule('US15', FAMILY)
 def fewer_than_15_siblings(family: Family) -> bool:
     if len(family.chil) < 15:
-        print(f"✔ Family ({family.id}): Siblings are less than 15")
+        report('US15', PASS, family.id, "Family ({}): Siblings are less than 15")
         return True
     else:
-        print(f"✘ Family ({family.id}): Siblings are greater than 15")
+        report('US15', ERROR, family.id, "Family ({}): Siblings are greater than 15")
         return False
 
 
-def male_last_names(family: Family, individuals: List[Individual]):
+@rule('US16', FAMILY)
+def male_last_names(family: Family, individuals: Individuals):
     ids = [family.husb, family.wife]
     ids.extend(family.chil)
-    males = [individual for individual in individuals if individual.sex == 'M' and individual.id in ids]
+    males = [individual for individual in find_individuals(individuals, ids) if individual.sex == 'M']
     names = [male.name.split('/')[1] for male in males]
     return len(set(names)) == 1
 
 
-def marriage_before_death(family: Family, individuals: List[Individual]) -> bool:
+@rule('US05', FAMILY, when=lambda family: family.marr)
+def marriage_before_death(family: Family, individuals: Individuals) -> bool:
     """ user story: verify that marrriage before death of either spouse """
-    mrgDate = datetime.strptime(family.marr.get('date'), "%d %b %Y")
+    mrgDate = family.marr.datetime
 
-    husb = list(filter(lambda x: x.id == family.husb, individuals))[0]
-    wife = list(filter(lambda x: x.id == family.wife, individuals))[0]
+    husb = find_individual(individuals, family.husb)
+    wife = find_individual(individuals, family.wife)
 
-    husbandDeathDate = datetime.strptime(husb.deat.get('date'), "%d %b %Y") if husb.deat else None
-    wifeDeathDate = datetime.strptime(wife.deat.get('date'), "%d %b %Y") if wife.deat else None
+    husbandDeathDate = husb.deat.datetime if husb.deat else None
+    wifeDeathDate = wife.deat.datetime if wife.deat else None
 
     if (husbandDeathDate and husbandDeathDate - mrgDate > timedelta(minutes=0)) or (
             wifeDeathDate and wifeDeathDate - mrgDate > timedelta(minutes=0)):
-        print(
-            f"✔ Family ({family.husb}) and ({family.wife}):Their marriage took place, before either of their death, So the condition is valid.")
+        report('US05', PASS, (family.husb, family.wife),
+               "Family ({}) and ({}):Their marriage took place, before either of their death, So the condition is valid.")
         return True
     else:
-        print(
-            f"✘ Husband ({family.husb}): Wife ({family.wife}) Marriage did not take place before either of their death, So that is not valid.")
+        report('US05', ERROR, (family.husb, family.wife),
+               "Husband ({}): Wife ({}) Marriage did not take place before either of their death, So that is not valid.")
         return False
 
 
-def divorce_before_death(family: Family, individuals: List[Individual]) -> bool:
+@rule('US06', FAMILY, when=lambda family: family.div)
+def divorce_before_death(family: Family, individuals: Individuals) -> bool:
     """ user story: verify that divorce before death of either spouse """
-    divdate = datetime.strptime(family.div.get('date'), "%d %b %Y")
+    divdate = family.div.datetime
 
-    husb = list(filter(lambda x: x.id == family.husb, individuals))[0]
-    wife = list(filter(lambda x: x.id == family.wife, individuals))[0]
+    husb = find_individual(individuals, family.husb)
+    wife = find_individual(individuals, family.wife)
 
-    husbandDeathDate = datetime.strptime(husb.deat.get('date'), "%d %b %Y") if husb.deat else None
-    wifeDeathDate = datetime.strptime(wife.deat.get('date'), "%d %b %Y") if wife.deat else None
+    husbandDeathDate = husb.deat.datetime if husb.deat else None
+    wifeDeathDate = wife.deat.datetime if wife.deat else None
 
     if (husbandDeathDate and husbandDeathDate - divdate > timedelta(minutes=0)) \
             or (wifeDeathDate and wifeDeathDate - divdate > timedelta(minutes=0)):
-        print(f"✔ Family ({family.husb}) and ({family.wife}): Their divorce took place, "
-              f"before either of their death, So the condition is valid.")
+        report('US06', PASS, (family.husb, family.wife), "Family ({}) and ({}): Their divorce took place, "
+                                                         "before either of their death, So the condition is valid.")
         return True
     else:
-        print(f"✘ Husband ({family.husb}) and Wife ({family.wife}): Divorce did not take place "
-              f"before either of their death, So that is not valid.")
+        report('US06', ERROR, (family.husb, family.wife), "Husband ({}) and Wife ({}): Divorce did not take place "
+                                                          "before either of their death, So that is not valid.")
         return False
 
 
@@ -169,7 +194,7 @@ def checkBigamy(family: Dict):
 
 def getAge(born):
     """returns age of individual"""
-    born = datetime.strptime(born, '%d %b %Y')
+    born = parse_date(born)
     today = datetime.today()
     return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
 
@@ -209,42 +234,43 @@ def checkForOldParents(fam: Dict, ind: Dict, file: TextIO):
 
 def birth_before_marriage_of_parents(family: Family, individuals: List[Individual]) -> bool:
     """ user story: verify that divorce before death of either spouse """
-    mrgdate = datetime.strptime(family.marr.get('date'), "%d %b %Y")
-    divdate = datetime.strptime(family.div.get('date'), "%d %b %Y")
-    birthdate_child = datetime.strptime(individuals.birt.get('date'), "%d %b %Y")
+    mrgdate = family.marr.datetime
+    divdate = family.div.datetime
+    birthdate_child = individuals.birt.datetime
 
     if family.marr:
         if birthdate_child - mrgdate > timedelta(minutes=0) and birthdate_child - divdate < timedelta(days=275):
-            print(f"({family.id}) : birth_before_marriage_of_parents")
+            report('US08', PASS, family.id, "({}) : birth_before_marriage_of_parents", marked=False)
             return True
         else:
-            print(f"({family.id}) : not birth_before_marriage_of_parents")
+            report('US08', ERROR, family.id, "({}) : not birth_before_marriage_of_parents", marked=False)
             return False
     else:
-        print(f"({family.id}) : marrige is not happen")
+        report('US08', ERROR, family.id, "({}) : marrige is not happen", marked=False)
         return False
 
 
+@rule('US07', INDIVIDUAL)
 def less_than_150(individual: Individual) -> bool:
-    birth_date: datetime = datetime.strptime(individual.birt['date'], "%d %b %Y")
+    birth_date: datetime = individual.birt.datetime
     current_date: datetime = datetime.now()
     years_150 = timedelta(days=54750)
 
     if individual.deat:
-        death_date: datetime = datetime.strptime(individual.deat['date'], "%d %b %Y")
+        death_date: datetime = individual.deat.datetime
         if birth_date - death_date > timedelta(days=0):
-            print(f"✘ individual ({individual.id}): The person's age is grater than 150 ")
+            report('US07', ERROR, individual.id, "individual ({}): The person's age is grater than 150 ")
             return False
         elif death_date - birth_date < years_150:
-            print(f"✔ individual ({individual.id}): The person's age is less than 150 ")
+            report('US07', PASS, individual.id, "individual ({}): The person's age is less than 150 ")
             return True
 
     else:
         if current_date - birth_date < years_150:
-            print(f"✔ individual ({individual.id}): The person's age is less than 150 ")
+            report('US07', PASS, individual.id, "individual ({}): The person's age is less than 150 ")
             return True
 
-    print(f"✘ individual ({individual.id}): The person's age is not than than 150 ")
+    report('US07', ERROR, individual.id, "individual ({}): The person's age is not than than 150 ")
 
     return False
 
@@ -253,283 +279,341 @@ today: datetime = datetime.now()
 year: timedelta = timedelta(minutes=0)
 
 
+@rule('US01', FAMILY, when=lambda family: family.marr)
 def marriage(family: Family) -> bool:
     if family.marr:
-        marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")
+        marr_date: datetime = family.marr.datetime
         if today - marr_date > timedelta(minutes=0):
-            print(f"✔ ({family.id}): marrige take place before current date ")
+            report('US01', PASS, family.id, "({}): marrige take place before current date ")
             return True
         else:
-            print(f"✘ ({family.id}): marrige didn't take place before current date ")
+            report('US01', ERROR, family.id, "({}): marrige didn't take place before current date ")
 
     else:
-        print(f"✘ ({family.id}): marrige didn't take place ")
+        report('US01', ERROR, family.id, "({}): marrige didn't take place ")
 
 
+@rule('US01', FAMILY, when=lambda family: family.div)
 def divo(family: Family) -> bool:
     if family.div:
-        div_date: datetime = datetime.strptime(family.div['date'], "%d %b %Y")
+        div_date: datetime = family.div.datetime
         if today - div_date > timedelta(minutes=0):
-            print(f"✔ ({family.id}): divorce take place before current date ")
+            report('US01', PASS, family.id, "({}): divorce take place before current date ")
             return True
         else:
-            print(f"✘ ({family.id}): divorce didn't take place before current date ")
+            report('US01', ERROR, family.id, "({}): divorce didn't take place before current date ")
 
     else:
-        print(f"✘ ({family.id}): divorce didn't take place ")
+        report('US01', ERROR, family.id, "({}): divorce didn't take place ")
 
 
+@rule('US01', INDIVIDUAL, when=lambda indi: indi.birt)
 def birth(indi: Individual) -> bool:
     if indi.birt:
-        birt_date: datetime = datetime.strptime(indi.birt['date'], "%d %b %Y")
+        birt_date: datetime = indi.birt.datetime
         if today - birt_date > timedelta(minutes=0):
-            print(f"✔ ({indi.id}): birth take place before current date ")
+            report('US01', PASS, indi.id, "({}): birth take place before current date ")
             return True
         else:
-            print(f"✘ ({indi.id}): birth didn't take place before current date ")
+            report('US01', ERROR, indi.id, "({}): birth didn't take place before current date ")
 
     else:
-        print(f"✘ ({indi.id}): birth didn't take place ")
+        report('US01', ERROR, indi.id, "({}): birth didn't take place ")
 
 
+@rule('US01', INDIVIDUAL, when=lambda indi: indi.deat)
 def death(indi: Individual) -> bool:
     if indi.deat:
-        death_date: datetime = datetime.strptime(indi.deat['date'], "%d %b %Y")
+        death_date: datetime = indi.deat.datetime
         if today - death_date > timedelta(minutes=0):
-            print(f"✔ ({indi.id}): death take place before current date ")
+            report('US01', PASS, indi.id, "({}): death take place before current date ")
             return True
         else:
-            print(f"✘ ({indi.id}): death didn't take place before current date ")
+            report('US01', ERROR, indi.id, "({}): death didn't take place before current date ")
 
     else:
-        print(f"✘ ({indi.id}): death didn't take place ")
+        report('US01', ERROR, indi.id, "({}): death didn't take place ")
 
 
 def birth_before_mrg(family: Family, individuals: Individual) -> bool:
-    birth_date: datetime = datetime.strptime(individuals.birt['date'], "%d %b %Y")
+    birth_date: datetime = individuals.birt.datetime
 
     if family.marr:  # condition for the divorce
-        marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")
+        marr_date: datetime = family.marr.datetime
         if marr_date - birth_date > timedelta(minutes=0):
-            print(f"✔ ({individuals.id}):birth is before mrg")
+            report('US02', PASS, individuals.id, "({}):birth is before mrg")
             return True
         else:
-            print(f"✘ ({individuals.id}):birth is not before mrg")
+            report('US02', ERROR, individuals.id, "({}):birth is not before mrg")
             return False
     else:
-        print(f"✘ ({individuals.id}):no mrg")
+        report('US02', INFO, individuals.id, "({}):no mrg")
         return True
 
 
+@rule('US04', FAMILY, when=lambda family: family.marr)
 def marriage_before_divorce(family: Family) -> bool:
-    marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")  # get the marriage date
+    marr_date: datetime = family.marr.datetime  # get the marriage date
 
     if family.div:  # condition for the divorce
-        div_date: datetime = datetime.strptime(family.div['date'], "%d %b %Y")
+        div_date: datetime = family.div.datetime
         if div_date - marr_date > timedelta(minutes=0):
-            print(f"Individual:({family.id}):marriage is before divorce")
+            report('US04', PASS, family.id, "Individual:({}):marriage is before divorce", marked=False)
             return True
         else:
-            print(f"({family.id}):marriage can not take place before divorce")
+            report('US04', ERROR, family.id, "({}):marriage can not take place before divorce", marked=False)
             return False
     else:
-        print(f"({family.id}):There is no divorce")
+        report('US04', PASS, family.id, "({}):There is no divorce", marked=False)
         return True
 
 
 # US14 no more than 5 siblings born the same day
 def verifySiblingsDates(allDates):
-    retValue = True
-    datesDict = {}
-    for d in allDates:
-        if d in datesDict:
-            datesDict[d] = datesDict.get(d) + 1
-            if datesDict[d] > 5:
-                return False
-        else:  # if we did not find this date, we first check if we have date within day of already found dates
-            found = False
-            for d2 in datesDict:
-                delta = d2 - d
-                if abs(delta.days) < 2:
-                    datesDict[d2] = datesDict.get(d2) + 1
-                    found = True
-                    if datesDict[d2] > 5:
-                        retValue = False
-                        break
-            if not found:
-                datesDict[d] = 1
+    import siblings
 
-    return retValue
+    return siblings.largest_multiple_birth(sorted(d.toordinal() for d in allDates)) <= siblings.MAX_MULTIPLE_BIRTH
 
 
 # US13 Sbiling space
 def verifySiblingsSpace(allDates):
-    retValue = True
-    datesSet = set()
-    for d in allDates:
-        if d in datesSet:
-            retValue = False
-            break
-        else:
-            found = False
-            for d2 in datesSet:
-                delta = d2 - d
-                if abs(delta.days) > 1 and abs(delta.days) < 280:
-                    retValue = False
-                    break
-            if retValue:
-                datesSet.add(d)
-            else:
-                break
+    import siblings
+
+    ordinals: List[int] = sorted(d.toordinal() for d in allDates)
+    return len(set(ordinals)) == len(ordinals) and siblings.well_spaced(ordinals)  # same-day births fail here
+
+
+@rule('US13', FAMILY, when=lambda family: len(family.chil) > 1)
+def siblings_spacing(family: Family, individuals: Individuals) -> bool:
+    """ US13: siblings are born less than 2 days or more than 8 months apart """
+    import siblings
+
+    if siblings.check_family(family, individuals).well_spaced:
+        report('US13', PASS, family.id, "Family ({}): siblings are born less than 2 days or more than 8 months apart")
+        return True
+    report('US13', ERROR, family.id, "Family ({}): siblings are born less than 8 months apart")
+    return False
 
-    return retValue
+
+@rule('US14', FAMILY, when=lambda family: len(family.chil) > 5)
+def multiple_births_limit(family: Family, individuals: Individuals) -> bool:
+    """ US14: no more than five siblings are born at the same time """
+    import siblings
+
+    if siblings.check_family(family, individuals).too_many_at_once:
+        report('US14', ERROR, family.id, "Family ({}): more than five siblings are born at the same time")
+        return False
+    report('US14', PASS, family.id, "Family ({}): no more than five siblings are born at the same time")
+    return True
 
 
 # siblingsDates = (datetime.date(1990, 1, 1), datetime.date(1991, 1, 1))
 # print(verifySiblingsDates(siblingsDates))
 
 
+@rule('US03', INDIVIDUAL)
 def birth_before_death(individuals: Individual) -> bool:
-    birth_date: datetime = datetime.strptime(individuals.birt['date'], "%d %b %Y")
+    birth_date: datetime = individuals.birt.datetime
 
     if individuals.deat:  # condition for the divorce
-        deat_date: datetime = datetime.strptime(individuals.deat['date'], "%d %b %Y")
+        deat_date: datetime = individuals.deat.datetime
         if deat_date - birth_date > timedelta(minutes=0):
-            print(f"({individuals.id}):birth is before death")
+            report('US03', PASS, individuals.id, "({}):birth is before death", marked=False)
             return True
         else:
-            print(f"({individuals.id}):birth can not take place not before death")
+            report('US03', ERROR, individuals.id, "({}):birth can not take place not before death", marked=False)
             return False
     else:
-        print(f"({individuals.id}):no death")
+        report('US03', PASS, individuals.id, "({}):no death", marked=False)
         return True
 
 
-def correct_gender_for_role(family: Family, individuals: List[Individual]) -> bool:
+@rule('US21', FAMILY)
+def correct_gender_for_role(family: Family, individuals: Individuals) -> bool:
     """ US21: verify that Husband in family is male and wife in family is female """
-    husb_gender = next(ind.sex for ind in individuals if ind.id == family.husb)
-    wife_gender = next(ind.sex for ind in individuals if ind.id == family.wife)
+    husb_gender = find_individual(individuals, family.husb).sex
+    wife_gender = find_individual(individuals, family.wife).sex
 
     if husb_gender == 'M' and wife_gender == 'F':
-        print(f"✔ Family ({family.id}): Both parents have the correct gender for the role")
+        report('US21', PASS, family.id, "Family ({}): Both parents have the correct gender for the role")
         return True
 
     if husb_gender == 'F' and wife_gender == 'M':
-        print(f"✘ Family ({family.id}): Husband should be Male and Wife should be Female")
+        report('US21', ERROR, family.id, "Family ({}): Husband should be Male and Wife should be Female")
     elif husb_gender == 'F':
-        print(f"✘ Family ({family.id}): Husband should be Male")
+        report('US21', ERROR, family.id, "Family ({}): Husband should be Male")
     elif wife_gender == 'M':
-        print(f"✘ Family ({family.id}): Wife should be Female")
+        report('US21', ERROR, family.id, "Family ({}): Wife should be Female")
 
     return False
 
 
-def unique_ids(families: List[Family], individuals: List[Individual]) -> bool:
-    """ US22: verify that All individual IDs are unique and all family IDs are unique """
-    ids = [family.id for family in families] + [individual.id for individual in individuals]
+@rule('US22', GLOBAL)
+def unique_ids(families: List[Family], individuals: List[Individual], changed: Set[str] = None,
+               state: Dict = None) -> bool:
+    """ US22: verify that All individual IDs are unique and all family IDs are unique; given changed,
+        only the changed ids are counted again, the others recurring as they did in the last run """
+    from duplicates import DuplicateFinder, id_key
+
+    if changed is not None and state and isinstance(individuals, GedcomIndex):
+        recurrent: Dict[str, None] = state['recurrent']  # ordered set
+        for _id in sorted(changed):
+            if len(individuals.records(_id)) > 1:
+                recurrent.setdefault(_id)
+            else:
+                recurrent.pop(_id, None)
+    else:
+        finder: DuplicateFinder = DuplicateFinder(id_key).update(families).update(individuals)
+        recurrent = dict.fromkeys(group[0] for group in finder.duplicates())
+        if state is not None:
+            state['recurrent'] = recurrent
 
-    recurrent_ids = list(set([_id for _id in ids if ids.count(_id) > 1]))
+    recurrent_ids = list(recurrent)
 
     if len(recurrent_ids) > 0:
-        print(f"✘ ID check: Recurrent ids detected", recurrent_ids)
+        report('US22', ERROR, tuple(recurrent_ids), "ID check: Recurrent ids detected {}", recurrent_ids)
         return False
 
-    print(f"✔ ID check: No recurrent ids detected")
+    report('US22', PASS, (), "ID check: No recurrent ids detected")
     return True
 
 
-def individual_ages(individuals: List[Individual]):
-    list_of_ages = []
-    for individual in individuals:
-        list_of_ages.append(individual.age())
-    print("List of individual age -", list_of_ages)
+def listing(state: Dict, name: str, entries: List[Tuple[str, object]], changed: Set[str] = None) -> List:
+    """ return the entries of a list a global rule reports, from the (record id, entry) pairs it found;
+        given changed and a state with the list of the last run, the pairs are only those of the changed
+        records, which replace theirs in the list, kept in state by record id; a record new to the list comes last """
+    if state is None:
+        return [entry for _, entry in entries]
+    found: Dict[str, List] = {}
+    for _id, entry in entries:
+        found.setdefault(_id, []).append(entry)
+    if changed is None or name not in state:
+        state[name] = found
+        return [entry for _, entry in entries]
+    kept: Dict[str, List] = state[name]
+    for _id in sorted(changed):
+        if _id in found:
+            kept[_id] = found[_id]
+        else:
+            kept.pop(_id, None)
+    return [entry for record_entries in kept.values() for entry in record_entries]
+
+
+@rule('US27', GLOBAL)
+def individual_ages(individuals: List[Individual], changed: Set[str] = None, state: Dict = None):
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+    list_of_ages = listing(state, 'ages', [(individual.id, individual.age()) for individual in individuals], changed)
+    report('US27', INFO, (), "List of individual age - {}", list_of_ages)
     return list_of_ages
 
 
-def order_sibling_by_age(family: Family, individuals: List[Individual]):
+@rule('US28', FAMILY)
+def order_sibling_by_age(family: Family, individuals: Individuals):
     children = []
     for child in family.chil:
-        children.append(next(ind for ind in individuals if ind.id == child))
+        children.append(find_individual(individuals, child))
     children.sort(key=lambda x: x.age(), reverse=True)
-    print(
-        f"Family[{family.id}] age of sibling in descending order " + " ".join([str(child.age()) for child in children]))
+    report('US28', INFO, family.id, "Family[{}] age of sibling in descending order {}",
+           family.id, " ".join([str(child.age()) for child in children]))
     return children
 
 
-def firstCousinShouldNotMarry() -> List:
+@rule('US19', GLOBAL)
+def firstCousinShouldNotMarry(families: List[Family] = None) -> List:
     """ check if parents of husband and spouse. If parents are siblings in each others families then first cousins.
     Return """
+    from kinship import Kinship
 
-    listFam: List = families
+    listFam: List = load_dataset()[1] if families is None else families
 
+    kinship: Kinship = Kinship(listFam)
     individualError: List = []
 
     for fam in listFam:
         if fam.husb != 'NA' and fam.wife != 'NA':
-            husbParents: str = findParents(fam.husb, listFam)
-            wifeParents: str = findParents(fam.wife, listFam)
+            husbParents: str = kinship.parent_family(fam.husb)
+            wifeParents: str = kinship.parent_family(fam.wife)
             if husbParents and wifeParents:
-                siblings: bool = checkIfSiblings(husbParents, wifeParents, listFam)
+                siblings: bool = kinship.spouses_are_siblings(husbParents, wifeParents)
                 if siblings:
+                    report('US19', ERROR, (fam.id, fam.husb, fam.wife),
+                           "Family {}: husband {} and wife {} are first cousins", fam.id, fam.husb, fam.wife)
                     individualError.append(fam)
+    if not individualError:
+        report('US19', PASS, (), "First cousin check: no first cousins are married")
     return individualError
 
 
-def auntsAndUncle() -> List:
-    listFam: List = families
+@rule('US20', GLOBAL)
+def auntsAndUncle(families: List[Family] = None) -> List:
+    from kinship import Kinship
+
+    listFam: List = load_dataset()[1] if families is None else families
 
+    kinship: Kinship = Kinship(listFam)
     individualError: List = []
     for fam in listFam:
         if fam.husb != 'NA' and fam.wife != 'NA':
-            husbParents: str = findParents(fam.husb, listFam)
-            wifeParents: str = findParents(fam.wife, listFam)
+            husbParents: str = kinship.parent_family(fam.husb)
+            wifeParents: str = kinship.parent_family(fam.wife)
             if husbParents and wifeParents:
-                hSiblings: bool = checkIfSiblings(husbParents, fam, listFam)
-                wSiblings: bool = checkIfSiblings(wifeParents, fam, listFam)
-                if hSiblings:
-                    individualError.append(fam)
-                elif wSiblings:
+                hSiblings: bool = kinship.spouses_are_siblings(husbParents, fam)
+                wSiblings: bool = kinship.spouses_are_siblings(wifeParents, fam)
+                if hSiblings or wSiblings:
+                    report('US20', ERROR, (fam.id, fam.husb, fam.wife),
+                           "Family {}: husband {} and wife {} are aunt or uncle and niece or nephew",
+                           fam.id, fam.husb, fam.wife)
                     individualError.append(fam)
+    if not individualError:
+        report('US20', PASS, (), "Aunt and uncle check: no aunt or uncle is married to a niece or nephew")
     return individualError
 
 
+# CONSANG No consanguineous marriages - no couple shares an ancestor, to any degree (US19 and US20 check two degrees)
+@rule('CONSANG', GLOBAL)
+def consanguineousMarriages(families: List[Family] = None, individuals: Individuals = None) -> List:
+    """ check every couple for a shared ancestor within GENERATIONS generations of both (US19 and US20
+        to any degree), or for one spouse descending from the other; return the families that have one """
+    from consanguinity import GENERATIONS, related_couples
+
+    if families is None:
+        individuals, families = load_dataset()
+
+    related: List[Family] = []
+    for family, shared in related_couples(families, individuals or (), GENERATIONS):
+        report('CONSANG', ERROR, (family.id, family.husb, family.wife),
+               "Family {}: husband {} and wife {} are related through {}",
+               family.id, family.husb, family.wife, ", ".join(shared))
+        related.append(family)
+    if not related:
+        report('CONSANG', PASS, (), "Consanguinity check: no couple shares an ancestor")
+    return related
+
+
 def hasMultipleBirths(siblingDates):
-    retValue = True
-    datesDict = {}
-    for d in siblingDates:
-        if d in datesDict:
-            datesDict[d] = datesDict.get(d) + 1
-        else:  # if we did not find this date, we first check if we have date within day of already found dates
-            found = False
-            for d2 in datesDict:
-                delta = d2 - d
-                if (abs(delta.days) < 2):
-                    datesDict[d2] = datesDict.get(d2) + 1
-                    found = True
-            if not found:
-                datesDict[d] = 1
-    for birthDate in datesDict.keys():
-        if datesDict[birthDate] > 1:
-            return birthDate.strftime('%d %b %Y')
-    return False
+    import siblings
+
+    dates = {d.toordinal(): d for d in reversed(siblingDates)}  # the first date given of each day
+    first = siblings.first_multiple_birth(sorted(d.toordinal() for d in siblingDates))
+    return False if first is None else dates[first].strftime('%d %b %Y')
 
 
 # US24 Uniqye families by spouses - No more than one family with the same spouses by name and the same marriage date
+@rule('US24', GLOBAL)
 def uniqueFamilyBySpouses(families: List[Family]):
-    names_marr = {}
+    from duplicates import DuplicateFinder, family_key
+
+    finder: DuplicateFinder = DuplicateFinder(family_key)
     same_data = []
     for family in families:
-        if (family.husb, family.wife) in names_marr:
-            if names_marr[family.husb, family.wife] == family.marr["date"]:
-                same_data.append([family.id, family.husb, family.wife, family.marr["date"]])
-                print(f"✘ Family ({family.id}): duplicate family having same data")
-
+        if finder.add(family):
+            same_data.append([family.id, family.husb, family.wife, family.marr["date"]])
+            report('US24', ERROR, family.id, "Family ({}): duplicate family having same data")
         else:
-            names_marr[family.husb, family.wife] = family.marr["date"]
-            print(f"✔ Family ({family.id}): No duplicate family having same data")
+            report('US24', PASS, family.id, "Family ({}): No duplicate family having same data")
 
-    print("Duplicate family: ")
-    print(same_data)
+    report('US24', INFO, (), "Duplicate family: \n{}", same_data)
     return same_data
 
 
@@ -553,10 +637,10 @@ def no_parents_marry_child(families: List[Family]):
     parent_pairs = families[:2]
     for child in families[2]:
         if child in parent_pairs:  # If their ids are not same that means that they have not married each other
-            print("✘ In family such type of marriages cannot take place where parents marry their.")
+            report('US17', ERROR, (), "In family such type of marriages cannot take place where parents marry their.")
             return False  # if their ids match means they have married which is not true So it returns False
         else:
-            print("✔ In Family such marriages are allowed and valid.")
+            report('US17', PASS, (), "In Family such marriages are allowed and valid.")
             return True
 
 
@@ -566,31 +650,75 @@ def no_sibilings_can_marry(families: List[Family]):
     for child1 in families[2]:
         for child2 in families[3]:
             if child1 in parent_pairs or child2 in parent_pairs or child1 in child2:  # If their ids are not same that means that they have not married each other
-                print("✘ In family such type of marriages cannot take place where sibilings marry each other.")
+                report('US18', ERROR, (),
+                       "In family such type of marriages cannot take place where sibilings marry each other.")
                 return False  # if their ids match means they have married which is not true So it returns False
             else:
-                print("✔ In Family such marriages are allowed and valid.")
+                report('US18', PASS, (), "In Family such marriages are allowed and valid.")
                 return True
 
             # US23 Unique name and birth date - No more than one individual with the same name and birth date
 
 
-def AreIndividualsUnique(individuals: List[Individual]):
-    names_bdays = {}
+@rule('US23', GLOBAL)
+def AreIndividualsUnique(individuals: List[Individual], changed: Set[str] = None, state: Dict = None):
+    """ US23: report the individuals with the name and birth date of an earlier one; given changed, only
+        the changed individuals and the ones sharing their old or new name and birth date, as grouped in state """
+    from duplicates import DuplicateFinder, DuplicateIndex, individual_key
+
+    found: Dict[str, List[Individual]] = {} if changed is None or not state else {
+        _id: find_all_individuals(individuals, [_id]) for _id in changed}
+    if found and all(len(records) < 2 for records in found.values()):  # else a repeated id needs a full run
+        groups: DuplicateIndex = state['groups']
+        ids: Set[str] = set()
+        for _id, records in found.items():
+            ids.update(groups.add(records[0]) if records else groups.remove(_id))
+        for _id in sorted(ids, key=groups.places.__getitem__):
+            if groups.is_first(_id):
+                report('US23', PASS, _id, "Individual ({}): No duplicate individual having same name and birth_date")
+            else:
+                report('US23', ERROR, _id, "Individual ({}): duplicate individual having same name and birth_date")
+        same_data = [[individual.id, individual.name, individual.birt["date"]]
+                     for individual in find_individuals(individuals, groups.duplicates())]
+        report('US23', INFO, (), "{}", same_data)
+        return same_data
+
+    if state is not None:
+        state.clear()
+        groups = DuplicateIndex(individual_key)
+        for individual in individuals:
+            groups.add(individual)
+        if groups.count == len(groups.places):  # one record per id
+            state['groups'] = groups
+    finder: DuplicateFinder = DuplicateFinder(individual_key)
     same_data = []
     for individual in individuals:
-        if individual.name in names_bdays:
-            if names_bdays[individual.name] == individual.birt["date"]:
-                same_data.append([individual.id, individual.name, individual.birt["date"]])
-                print(f"✘ Individual ({individual.id}): duplicate individual having same name and birth_date")
+        if finder.add(individual):
+            same_data.append([individual.id, individual.name, individual.birt["date"]])
+            report('US23', ERROR, individual.id,
+                   "Individual ({}): duplicate individual having same name and birth_date")
         else:
-            names_bdays[individual.name] = individual.birt["date"]
-            print(f"✔ Individual ({individual.id}): No duplicate individual having same name and birth_date")
+            report('US23', PASS, individual.id,
+                   "Individual ({}): No duplicate individual having same name and birth_date")
 
-    print(same_data)
+    report('US23', INFO, (), "{}", same_data)
     return same_data
 
 
+# NEARDUP Near-duplicate individuals - list the people whose names sound alike and whose birth dates are close
+@rule('NEARDUP', GLOBAL)
+def nearDuplicateIndividuals(individuals: List[Individual], changed: Set[str] = None) -> List:
+    """ list the pairs of individuals whose names sound alike and whose birth dates are close, best match first;
+        given the ids of changed records, only the pairs with one of them """
+    from duplicates import fuzzy_duplicates
+
+    candidates = fuzzy_duplicates(individuals, only=changed)
+    for id1, id2, score in candidates:
+        report('NEARDUP', INFO, (id1, id2), "Individuals ({}) and ({}) may be the same person (score {})",
+               id1, id2, score)
+    return candidates
+
+
 # User Story 26
 def validateFamilyRoles(fam: Family, individuals: List[Individual]) -> bool:
     if fam.husb not in individuals:
@@ -657,13 +785,13 @@ def oneForOneFamilyIndividualRecords(individualDict, familyDict):
         indiExists = False
         indiExists = [True for j in sorted(familyDict.keys()) if isIndividualInFamily(indi.id, familyDict[j])]
         if indiExists == False:
-            print(f"✘  ({indi.id}): individual is not exit in the familt member")
+            report('US26', ERROR, indi.id, " ({}): individual is not exit in the familt member")
             missingIndividuals.append(indi.id)
     missedFamilies = []
     for i in sorted(familyDict.keys()):
         fam = familyDict[i]
         if not familyMembersExist(fam, individualDict):
-            print(f"✘  ({fam.id}): family member is not part of individual")
+            report('US26', ERROR, fam.id, " ({}): family member is not part of individual")
             missedFamilies.append(fam.id)
     l_1 = len(missingIndividuals)
     l_2 = len(missedFamilies)
@@ -686,7 +814,7 @@ def validateCorrespondingRecords(individualDict, familyDict):
             l_1 = len(individ.spouse)
             if s_Count != l_1:
                 err += 1
-                print(f"✘  ({individ.id}): spouse is not in family")
+                report('US26', ERROR, individ.id, " ({}): spouse is not in family")
 
         if len(individ.children) > 0:
             childrenFoundInFamily = False
@@ -694,7 +822,7 @@ def validateCorrespondingRecords(individualDict, familyDict):
                                      childrenExistInFamily(individ.children, familyDict[j].children)]
             if childrenFoundInFamily == False:
                 errors = errors + 1
-                print(f"✘  ({individ.id}): childer is not part of family member")
+                report('US26', ERROR, individ.id, " ({}): childer is not part of family member")
     return oneForOneFamilyIndividualRecords(individualDict, familyDict) and errors == 0
 
 
@@ -707,93 +835,144 @@ def are_child_names_unique(family: Family, individuals):
         fname = child.name.split(' ')[0]
         bdate = child.birt
         if (fname, bdate) in childInfoSet:
-            print("✘ children having same name or birth day date in the family")
+            report('US25', ERROR, family.id, "children having same name or birth day date in the family")
             return False
         childInfoSet.add((fname, bdate))
-    print("✔ children name nad birth day date is unique")
+    report('US25', PASS, family.id, "children name nad birth day date is unique")
     return True
 
 
-def deceased(individuals: List[Individual]):
+@rule('US29', GLOBAL)
+def deceased(individuals: List[Individual], changed: Set[str] = None, state: Dict = None):
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
     deceased_list = []
     for individual in individuals:
         if individual.deat is not False:
-            deceased_list.append(individual.name)
-
-    for i in deceased_list:
-        print(f"{i} :  is deaceaed person in the family")
-    return deceased_list
+            deceased_list.append((individual.id, individual.name))
+            report('US29', INFO, individual.id, "{} :  is deaceaed person in the family", individual.name)
+    return listing(state, 'deceased', deceased_list, changed)
 
 
-def living_marr(families: List[Family], individuals: List[Individual]):
+@rule('US30', GLOBAL)
+def living_marr(families: List[Family], individuals: Individuals, changed: Set[str] = None, state: Dict = None):
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+        families = [family for family in families if family.id in changed]
     living_mrr_list_d = []
     indi = [indi.id for indi in individuals if indi.alive]
 
-    idf = [family.id for family in families if not family.div]
+    idf = {family.id for family in families if not family.div}
 
     for i in indi:
         if i in idf:
             living_mrr_list_d.append(i)
 
     for i in living_mrr_list_d:
-        print(f"{i} :  is married and alive in the family")
-
-    return living_mrr_list_d
-
-
-def aunt_uncle_birth_year(families: List[Family], individuals: List[Individual]):
-    """ US47: verify that aunts and uncles birth year are not same """
+        report('US30', INFO, i, "{} :  is married and alive in the family")
+
+    return listing(state, 'married', [(i, i) for i in living_mrr_list_d], changed)
+
+
+@rule('US47', GLOBAL)
+def aunt_uncle_birth_year(families: List[Family], individuals: Individuals, changed: Set[str] = None,
+                          state: Dict = None):
+    """ US47: verify that aunts and uncles birth year are not same; given changed, only the couples of the
+        changed families are checked again, with the parent families and the pairs of the others kept in state """
+
+    def single(_id: str) -> bool:
+        return len([record for record in individuals.records(_id) if isinstance(record, Family)]) < 2
+
+    incremental: bool = changed is not None and bool(state) and isinstance(individuals, GedcomIndex) and \
+        all(map(single, changed))
+    if incremental:
+        known: Dict[str, Family] = state['families']
+        parent_families: Dict[str, List[Family]] = state['parents']
+        pairs: Dict[str, List[Tuple[str, str]]] = state['pairs']
+        couples: List[Family] = []
+        for _id in sorted(changed):
+            old: Optional[Family] = known.get(_id)
+            new: Optional[Family] = individuals.get_family(_id)
+            if old is not new:
+                for child in set(old.chil if old else ()):  # a kept child keeps the place of the family in its list
+                    parent_families[child] = [new if fam is old else fam for fam in parent_families[child]
+                                              if fam is not old or (new and child in new.chil)]
+                    if not parent_families[child]:
+                        del parent_families[child]
+                for child in dict.fromkeys(new.chil if new else ()):
+                    if not old or child not in old.chil:
+                        parent_families.setdefault(child, []).append(new)
+            if new:
+                known[_id] = new
+                couples.append(new)  # its spouses may have new siblings even when it did not change
+            else:
+                known.pop(_id, None)
+                pairs.pop(_id, None)
+    else:
+        parent_families = {}  # child id -> the families listing it, instead of a scan per spouse
+        for fam in families:
+            for child in fam.chil:
+                parent_families.setdefault(child, []).append(fam)
+        couples = families
+        pairs = {}
+        if state is not None:
+            state.clear()
+            if len({fam.id for fam in families}) == len(families):  # one family per id
+                state.update(families={fam.id: fam for fam in families}, parents=parent_families, pairs=pairs)
 
     def get_aunts_and_uncles(family: Family):
         aunt_list = []
         uncle_list = []
 
-        try:
-            husb_sibling_ids = next(fam for fam in families if family.husb in fam.chil).chil
-        except StopIteration:
-            husb_sibling_ids = []
+        husb_parents = parent_families.get(family.husb, [None])[0]
+        husb_sibling_ids = list(husb_parents.chil) if husb_parents else []  # a copy
 
         if family.husb in husb_sibling_ids:
             husb_sibling_ids.remove(family.husb)
 
-        try:
-            wife_sibling_ids = next(fam for fam in families if family.wife in fam.chil).chil
-        except StopIteration:
-            wife_sibling_ids = []
+        wife_parents = parent_families.get(family.wife, [None])[0]
+        wife_sibling_ids = list(wife_parents.chil) if wife_parents else []  # a copy
 
         if family.wife in wife_sibling_ids:
             wife_sibling_ids.remove(family.wife)
 
         for husb_sibling_id in husb_sibling_ids:
-            husb_sibling = next(ind for ind in individuals if ind.id == husb_sibling_id)
+            husb_sibling = find_individual(individuals, husb_sibling_id)
             (aunt_list if husb_sibling.sex == 'F' else uncle_list).append(husb_sibling)
 
         for wife_sibling_id in wife_sibling_ids:
-            wife_sibling = next(ind for ind in individuals if ind.id == wife_sibling_id)
+            wife_sibling = find_individual(individuals, wife_sibling_id)
             (aunt_list if wife_sibling.sex == 'F' else uncle_list).append(wife_sibling)
 
         return aunt_list, uncle_list
 
-    same_aunt_uncle = []
-    for fam in families:
+    found: List[Tuple[str, str]] = []
+    for fam in couples:
         aunt_list, uncle_list = get_aunts_and_uncles(fam)
-        for aunt in aunt_list:
-            for uncle in uncle_list:
-                if aunt.birt['date'][-4:] == uncle.birt['date'][-4:]:
-                    same_aunt_uncle.append((aunt.id, uncle.id))
-                    print(f"Aunt({aunt.id}) and Uncle({uncle.id}) can not have the same birth year")
-
+        family_pairs = [(aunt.id, uncle.id) for aunt in aunt_list for uncle in uncle_list
+                        if aunt.birt['date'][-4:] == uncle.birt['date'][-4:]]
+        pairs[fam.id] = family_pairs
+        found.extend(family_pairs)
+    if incremental:
+        found = [pair for family_pairs in pairs.values() for pair in family_pairs]
+
+    same_aunt_uncle = list(dict.fromkeys(found))
+    for aunt_id, uncle_id in same_aunt_uncle:
+        if not incremental or aunt_id in changed or uncle_id in changed:
+            report('US47', ERROR, (aunt_id, uncle_id),
+                   "Aunt({}) and Uncle({}) can not have the same birth year", marked=False)
     return same_aunt_uncle
 
 
-def all_dead_people(individuals: List[Individual]):
+@rule('US48', GLOBAL)
+def all_dead_people(individuals: List[Individual], changed: Set[str] = None, state: Dict = None):
     """ US48: verify that aunts and uncles birth year are not same """
-    dead_list = []
-    for individual in individuals:
-        if individual.deat is not False:
-            dead_list.append(individual.name)
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+    dead_list = listing(state, 'dead', [(individual.id, individual.name) for individual in individuals
+                                        if individual.deat is not False], changed)
 
-    print(f"List of all dead people: {dead_list}")
+    report('US48', INFO, (), "List of all dead people: {}", dead_list)
     return dead_list
 
 
@@ -853,107 +1032,119 @@ def partialDates(individual: Dict, family: Dict) -> List[str]:
 
 
 # US39 List of all upcoming anniversaries - List all living couples whose marriage anniversaries occur in the next 30 days
-def List_anniversary(families: List[Family]):
-    today: datetime = datetime.now()
-    print(today)
+@rule('US39', GLOBAL)
+def List_anniversary(families: List[Family], events: 'EventIndex' = None, changed: Set[str] = None,
+                     state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        families = [family for family in families if family.id in changed]
+    events = events or EventIndex(families, ['MARR'])
+    upcoming = {_id for _id, _, _ in events.upcoming('MARR')}
     anniv_list = []
     for family in families:
         if family.marr is not None:
             if family.marr:
-                marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")
-                marr_date = datetime(today.year, marr_date.month, marr_date.day)
-                upcoming_ann = (marr_date - today).days
-                if upcoming_ann <= 30 and upcoming_ann >= 0:
-                    anniv_list.append([family.id, family.husb, family.wife, family.marr["date"]])
-                    print(f"✔ Family ({family.id}): Anniversary is in upcoming days")
+                if family.id in upcoming:
+                    anniv_list.append((family.id, [family.id, family.husb, family.wife, family.marr["date"]]))
+                    report('US39', PASS, family.id, "Family ({}): Anniversary is in upcoming days")
                 else:
-                    print(f"✘ Family ({family.id}): Anniversaery is not in upcoming days")
+                    report('US39', INFO, family.id, "Family ({}): Anniversaery is not in upcoming days")
         else:
-            print(f"✘ Family ({family.id}): marrige didn't take place ")
+            report('US39', INFO, family.id, "Family ({}): marrige didn't take place ")
 
-    print("List of couple who have Upcoming anniversary: ")
-    print(anniv_list)
+    anniv_list = listing(state, 'anniversaries', anniv_list, changed)
+    report('US39', INFO, (), "List of couple who have Upcoming anniversary: \n{}", anniv_list)
     return anniv_list
 
 
 # marriage date and child's birth date should not be same
-def marriage_date_and_child(family: Family, individuals: List[Individual]):
+@rule('US08', FAMILY, when=lambda family: family.marr)
+def marriage_date_and_child(family: Family, individuals: Individuals):
     childIdsList = []
     for childId in family.chil:
         childIdsList.append(childId)
 
-    marriageDate = family.marr["date"]
-    marriageDate = datetime.strptime(marriageDate, "%d %b %Y")
+    marriageDate = family.marr.datetime
 
     chilBirthDates = []
     for chil in childIdsList:
-        childBirth = next(ind.birt["date"] for ind in individuals if ind.id == chil)
-        child_birth_date = datetime.strptime(childBirth, "%d %b %Y")
+        child_birth_date = find_individual(individuals, chil).birt.datetime
         chilBirthDates.append(child_birth_date)
 
     dangerous_child = []
     for chilBirt, childId in zip(chilBirthDates, childIdsList):
         if chilBirt <= marriageDate:
             dangerous_child.append(childId)
-            print(f"✘ Family ({family.id}): Child ({childId}) born before marriage")
+            report('US08', ERROR, (family.id, childId), "Family ({}): Child ({}) born before marriage")
         else:
-            print(f"✔  Family ({family.id}): Child ({childId}) born after marriage")
+            report('US08', PASS, (family.id, childId), " Family ({}): Child ({}) born after marriage")
 
     return dangerous_child
 
 
 # grandparents can't marry their grandchildren
-def grandparents_marriage_and_grandchildren_birthday(families: List[Family], individuals: List[Individual]):
+def grandparents_marriage_and_grandchildren_birthday(families: List[Family], individuals: Individuals):
     for family in families:
-        husband = next(ind.birt["date"] for ind in individuals if ind.id == family.husb)
-        wife = next(ind.birt["date"] for ind in individuals if ind.id == family.wife)
-        husband = datetime.strptime(husband, "%d %b %Y")
-        wife = datetime.strptime(wife, "%d %b %Y")
+        husband = find_individual(individuals, family.husb).birt.datetime
+        wife = find_individual(individuals, family.wife).birt.datetime
         forbidden_marriages = []
         if husband < wife + timedelta(days=18250):
             forbidden_marriages.append(family.id)
-            print(f"✘ Child marriage alert!!! ({family.id})")
+            report('GRANDMARR', ERROR, family.id, "Child marriage alert!!! ({})")
         else:
-            print(f"✔ Not Child marriage ({family.id})")
+            report('GRANDMARR', PASS, family.id, "Not Child marriage ({})")
         return forbidden_marriages
 
 
 # User_Story 35
-def List_recent_death(individuals: List[Individual]):
-    today: datetime = datetime.now()
+@rule('US35', GLOBAL)
+def List_recent_death(individuals: List[Individual], events: 'EventIndex' = None, changed: Set[str] = None,
+                      state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+    events = events or EventIndex(individuals, ['DEAT'])
+    recent = {_id for _id, _ in events.recent('DEAT')}
     death_list = []
 
     for individual in individuals:
 
         if individual.deat:
-            death_date: datetime = datetime.strptime(individual.deat['date'], "%d %b %Y")
-            if today - death_date < timedelta(days=30):
-                death_list.append(individual.name)
-                print("✔ This is the recent death within last 30 days")
+            if individual.id in recent:
+                death_list.append((individual.id, individual.name))
+                report('US35', PASS, individual.id, "This is the recent death within last 30 days")
 
             else:
-                print("✘ This is not the recent death its not within 30 days")
+                report('US35', INFO, individual.id, "This is not the recent death its not within 30 days")
 
-    return death_list
+    return listing(state, 'deaths', death_list, changed)
 
 
 # User_Story 36
-def List_recent_birth(individuals: List[Individual]):
-    today: datetime = datetime.now()
+@rule('US36', GLOBAL)
+def List_recent_birth(individuals: List[Individual], events: 'EventIndex' = None, changed: Set[str] = None,
+                      state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+    events = events or EventIndex(individuals, ['BIRT'])
+    recent = {_id for _id, _ in events.recent('BIRT')}
     birth_list = []
 
     for individual in individuals:
 
         if individual.birt:
-            birth_date: datetime = datetime.strptime(individual.birt['date'], "%d %b %Y")
-            if today - birth_date <= timedelta(days=30):
-                birth_list.append(individual.name)
-                print("✔ This is the recent birth within last 30 days")
+            if individual.id in recent:
+                birth_list.append((individual.id, individual.name))
+                report('US36', PASS, individual.id, "This is the recent birth within last 30 days")
 
             else:
-                print("✘ This is not the recent birth its not within 30 days")
+                report('US36', INFO, individual.id, "This is not the recent birth its not within 30 days")
 
-    return birth_list
+    return listing(state, 'births', birth_list, changed)
 
 
 def all_alive_people(individuals: List[Individual]):
@@ -961,174 +1152,195 @@ def all_alive_people(individuals: List[Individual]):
     for indivi in individuals:
         if indivi.alive:
             all_alive.append(indivi.id)
-            print(f"{indivi.id}:: people is alive")
+            report('ALIVE', PASS, indivi.id, "{}:: people is alive", marked=False)
         else:
-            print(f"{indivi.id}:: not alive")
+            report('ALIVE', INFO, indivi.id, "{}:: not alive", marked=False)
 
     return all_alive
 
 
-def all_marr_couple(individuals: List[Individual], families: List[Family]):
-    ind = []
+def all_marr_couple(individuals: Individuals, families: List[Family]):
+    ind = set()
 
     for indi in individuals:
-        ind.append(indi.id)
+        ind.add(indi.id)
 
     mrra = []
     for family in families:
         if family.marr:
             if family.husb in ind and family.wife in ind:
                 mrra.append(family.id)
-                print("{family.id}:: in this family hubs and wife are alive")
+                report('MARRIED', PASS, family.id, "{}:: in this family hubs and wife are alive", marked=False)
 
             else:
-                print("{family.id}:: in this family hubs and wife are not alive")
+                report('MARRIED', INFO, family.id, "{}:: in this family hubs and wife are not alive", marked=False)
     return mrra
 
 
 # US_37
-def List_recent_death_family(individuals: List[Individual], families: List[Family]):
-    today: datetime = datetime.now()
+@rule('US37', GLOBAL)
+def List_recent_death_family(individuals: Individuals, families: List[Family], events: 'EventIndex' = None,
+                             changed: Set[str] = None, state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+        families = [family for family in families if family.id in changed]
+    events = events or EventIndex(individuals, ['DEAT'])
+    recent = {_id for _id, _ in events.recent('DEAT')}
     death_list = []
 
     for individual in individuals:
 
         if individual.deat:
-            death_date: datetime = datetime.strptime(individual.deat['date'], "%d %b %Y")
-            if today - death_date < timedelta(days=30):
-                death_list.append(individual.id)
-                print("✔ This is the recent death within last 30 days")
+            if individual.id in recent:
+                death_list.append((individual.id, individual.id))
+                report('US37', PASS, individual.id, "This is the recent death within last 30 days")
 
             else:
-                print("✘ This is not the recent death its not within 30 days")
+                report('US37', INFO, individual.id, "This is not the recent death its not within 30 days")
 
-    print(death_list)
+    death_list = listing(state, 'deaths', death_list, changed)
+    report('US37', INFO, (), "{}", death_list)
 
     fam_list = []
     for family in families:
         if family.marr:
             if family.husb in death_list and family.wife in death_list or family.chil in death_list:
-                fam_list.append(family.id)
-    print(fam_list)
+                fam_list.append((family.id, family.id))
+    fam_list = listing(state, 'families', fam_list, changed)
+    report('US37', INFO, (), "{}", fam_list)
 
     return fam_list
 
 
 # US_38
 
-def List_Upcoming_birthday(individuals: List[Individual]):
-    today: datetime = datetime.now()
-    print(today)
+@rule('US38', GLOBAL)
+def List_Upcoming_birthday(individuals: List[Individual], events: 'EventIndex' = None, changed: Set[str] = None,
+                           state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        individuals = find_all_individuals(individuals, changed)
+    events = events or EventIndex(individuals, ['BIRT'])
+    upcoming = {_id for _id, _, _ in events.upcoming('BIRT')}
     birth_list = []
     for individual in individuals:
         if individual.birt is not None:
             if individual.birt:
-                birt_date: datetime = datetime.strptime(individual.birt['date'], "%d %b %Y")
-                birt_date = datetime(today.year, birt_date.month, birt_date.day)
-                upcoming_birt = (birt_date - today).days
-                if upcoming_birt <= 30 and upcoming_birt >= 0:
-                    birth_list.append([individual.id, individual.name, individual.birt["date"]])
-                    print(f"✔ ({individual.id}): birthday is in upcoming days")
+                if individual.id in upcoming:
+                    birth_list.append((individual.id, [individual.id, individual.name, individual.birt["date"]]))
+                    report('US38', PASS, individual.id, "({}): birthday is in upcoming days")
                 else:
-                    print(f"✘ ({individual.id}): birthday is not in upcoming days")
+                    report('US38', INFO, individual.id, "({}): birthday is not in upcoming days")
         else:
-            print(f"✘ ({individual.id}): birth didn't take place ")
+            report('US38', INFO, individual.id, "({}): birth didn't take place ")
 
-    print(birth_list)
+    birth_list = listing(state, 'birthdays', birth_list, changed)
+    report('US38', INFO, (), "{}", birth_list)
     return birth_list
 
 
-def List_recent_divorce(families: List[Family]):
-    today: datetime = datetime.now()
+# US_40
+def List_recent_divorce(families: List[Family], events: 'EventIndex' = None):
+    from events import EventIndex
+
+    events = events or EventIndex(families, ['DIV'])
+    recent = {_id for _id, _ in events.recent('DIV')}
     div_list = []
     for family in families:
         if family.div is not None:
             if family.div:
-                div_date: datetime = datetime.strptime(family.div['date'], "%d %b %Y")
-                if today - div_date <= timedelta(days=30) and today - div_date >= timedelta(days=0):
+                if family.id in recent:
                     div_list.append([family.id, family.husb, family.wife, family.div["date"]])
-                    print(f"✔ Family ({family.id}): Divorce take place in last 30 days")
+                    report('US40', PASS, family.id, "Family ({}): Divorce take place in last 30 days")
                 else:
-                    print(f"✘ Family ({family.id}): Divorce didn't take place in last 30 days")
+                    report('US40', INFO, family.id, "Family ({}): Divorce didn't take place in last 30 days")
         else:
-            print(f"✘ Family ({family.id}): divorce didn't take place ")
+            report('US40', INFO, family.id, "Family ({}): divorce didn't take place ")
 
-    print("List of couple who had recent divorce: ")
-    print(div_list)
+    report('US40', INFO, (), "List of couple who had recent divorce: \n{}", div_list)
     return div_list
 
 
 # US 45
-def Parents_and_child(family: Family, individuals: List[Individual]):
+def Parents_and_child(family: Family, individuals: Individuals):
     childIdsList = []
     for childId in family.chil:
         childIdsList.append(childId)
 
     ParentsBirthDate = family.parent["date"]
-    ParentsBirthDate = datetime.strptime(ParentsBirthDate, "%d %b %Y")
+    ParentsBirthDate = parse_date(ParentsBirthDate)
 
     chilBirthDates = []
     for chil in childIdsList:
-        childBirth = next(ind.birt["date"] for ind in individuals if ind.id == chil)
-        child_birth_date = datetime.strptime(childBirth, "%d %b %Y")
+        child_birth_date = find_individual(individuals, chil).birt.datetime
         chilBirthDates.append(child_birth_date)
 
     dangerous_child = []
     for chilBirt, childId in zip(chilBirthDates, childIdsList):
         if chilBirt <= ParentsBirthDate:
             dangerous_child.append(childId)
-            print(f"✘ Family ({family.id}): Child ({childId}) parents and child birth date it is not same")
+            report('US45', ERROR, (family.id, childId),
+                   "Family ({}): Child ({}) parents and child birth date it is not same")
         else:
-            print(f"✔  Family ({family.id}): Child ({childId}) Parents and child birth date it is same ")
+            report('US45', PASS, (family.id, childId),
+                   " Family ({}): Child ({}) Parents and child birth date it is same ")
 
     return dangerous_child
 
 
-def Grand_Parents_and_Parents(family: Family, individuals: List[Individual]):
+# US 46
+def Grand_Parents_and_Parents(family: Family, individuals: Individuals):
     ParetntIdList = []
     for parentID in family.chil:
         ParetntIdList.append(parentID)
 
     ParentsBirthDate = family.parent["date"]
-    ParentsBirthDate = datetime.strptime(ParentsBirthDate, "%d %b %Y")
+    ParentsBirthDate = parse_date(ParentsBirthDate)
 
     parentBirthDates = []
     for parent in ParetntIdList:
-        ParentBirth = next(ind.birt["date"] for ind in individuals if ind.id == parent)
-        parent_birth_date = datetime.strptime(ParentBirth, "%d %b %Y")
+        parent_birth_date = find_individual(individuals, parent).birt.datetime
         parentBirthDates.append(parent_birth_date)
 
     dangerous_family = []
     for parentBirth, parentID in zip(parentBirthDates, ParetntIdList):
         if parentBirth <= ParentsBirthDate:
             dangerous_family.append(parentID)
-            print(f"✘ Family ({family.id}): Child ({parentID}) Grand parents and parents birth date it is not same")
+            report('US46', ERROR, (family.id, parentID),
+                   "Family ({}): Child ({}) Grand parents and parents birth date it is not same")
         else:
-            print(f"✔  Family ({family.id}): Child ({parentID}) Grand Parents and parents birth date it is same ")
+            report('US46', PASS, (family.id, parentID),
+                   " Family ({}): Child ({}) Grand Parents and parents birth date it is same ")
 
     return dangerous_family
 
 
-def girls_gender_check(individuals: List[Individual]) -> List:
-    """ US63: girls gender should be female """
+@rule('US63', GLOBAL)
+def girls_gender_check(individuals: List[Individual], changed: Set[str] = None) -> List:
+    """ US63: girls gender should be female; given changed, only the changed records are checked """
+    if changed is not None:
+        individuals = find_all_individuals(individuals, changed)
 
     girls = [ind for ind in individuals if ind.sex == 'F']
     did_not_match = []
 
     for girl in girls:
         if girl.sex != 'F':
-            print(f"✘ {girl.id}: Gender does not match!")
+            report('US63', ERROR, girl.id, "{}: Gender does not match!")
             did_not_match.append(girl.id)
 
     return did_not_match
 
 
-def list_of_twins(family: Family, individuals: List[Individual]) -> List:
+def list_of_twins(family: Family, individuals: Individuals) -> List:
     """ US63: find twins """
 
     children_id_birthday = {}
     for child_id in family.chil:
-        child = next(ind for ind in individuals if ind.id == child_id)
+        child = find_individual(individuals, child_id)
         children_id_birthday[child_id] = child.birt['date']
 
     twins = {}
@@ -1148,41 +1360,46 @@ def listExHusb(fam):
 
 
 def girlMrgeAftr18(fam, ind):
+    from dateutil.relativedelta import relativedelta  # only this check and mrgeAfter18 need dateutil
+
     l = set()
     for i in fam:
-        mrg_date = datetime.strptime(fam[i]['MARR'], "%d %b %Y")
+        mrg_date = parse_date(fam[i]['MARR'])
         if 'WIFE' in fam[i]:
             w_id = fam[i]['WIFE']
         for j in ind:
             if i == ind[j]['family']:
                 if j == w_id:
-                    birt_date = datetime.strptime(ind[j]['BIRT'], "%d %b %Y")
+                    birt_date = parse_date(ind[j]['BIRT'])
                     diff = relativedelta(mrg_date, birt_date)
                     if diff.years > 18:
                         l.add(j)
     return l
 
 
-def boys_gender_check(individuals: List[Individual]) -> List:
-    """ US62: boys gender should be male """
+@rule('US62', GLOBAL)
+def boys_gender_check(individuals: List[Individual], changed: Set[str] = None) -> List:
+    """ US62: boys gender should be male; given changed, only the changed records are checked """
+    if changed is not None:
+        individuals = find_all_individuals(individuals, changed)
 
     boys = [ind for ind in individuals if ind.sex == 'M']
     did_not_match = []
 
     for boi in boys:
         if boi.sex != 'M':
-            print(f"✘ {boi.id}: Gender does not match!")
+            report('US62', ERROR, boi.id, "{}: Gender does not match!")
             did_not_match.append(boi.id)
 
     return did_not_match
 
 
-def step_sib_birth_diff(family: Family, individuals: List[Individual]):
+def step_sib_birth_diff(family: Family, individuals: Individuals):
     """ US61: step brother and sister should not have same birth date """
 
     children_id_birthday = {}
     for child_id in family.chil:
-        child = next(ind for ind in individuals if ind.id == child_id)
+        child = find_individual(individuals, child_id)
         children_id_birthday[child_id] = child.birt['date']
 
     twins = {}
@@ -1194,119 +1411,130 @@ def step_sib_birth_diff(family: Family, individuals: List[Individual]):
     return False if len(res[0]) > 1 else True
 
 #US_51
-def all_divorce_couple(individuals: List[Individual], families:List[Family]):
-    ind = []
-    for indi in individuals:
-        ind.append(indi.id)
+@rule('US51', GLOBAL)
+def all_divorce_couple(individuals: Individuals, families:List[Family], changed: Set[str] = None, state: Dict = None):
+    ind = individuals if isinstance(individuals, GedcomIndex) else {indi.id for indi in individuals}
+    if changed is not None and state:
+        families = [family for family in families if family.id in changed]
     div = []
     for family in families:
         if family.div:
             if family.husb in ind and family.wife in ind:
-                div.append(family.id)
-                print("✔{family.id}:: in this family hubs and wife have no divorce")
+                div.append((family.id, family.id))
+                report('US51', PASS, family.id, "{}:: in this family hubs and wife have no divorce")
 
             else:
-                print("✘{family.id}:: in this family hubs and wife have divorce")
-    return div
+                report('US51', ERROR, family.id, "{}:: in this family hubs and wife have divorce")
+    return listing(state, 'divorced', div, changed)
 
 #US52
 def birth_before_div(family: Family, individuals: Individual) -> bool:
-    birth_date: datetime = datetime.strptime(individuals.birt['date'], "%d %b %Y")
+    birth_date: datetime = individuals.birt.datetime
 
     if family.div:  # condition for the divorce
-        div_date: datetime = datetime.strptime(family.div['date'], "%d %b %Y")
+        div_date: datetime = family.div.datetime
         if div_date - birth_date > timedelta(minutes=0):
-            print(f"✔ ({individuals.id}):birth is before divorce")
+            report('US52', PASS, individuals.id, "({}):birth is before divorce")
             return True
         else:
-            print(f"✘ ({individuals.id}):birth is not before divorce")
+            report('US52', ERROR, individuals.id, "({}):birth is not before divorce")
             return False
     else:
-        print(f"✘ ({individuals.id}):no divorce")
+        report('US52', INFO, individuals.id, "({}):no divorce")
         return True
 
 #us53
-def List_recent_anniversary(families: List[Family]):
-    today: datetime = datetime.now()
+@rule('US53', GLOBAL)
+def List_recent_anniversary(families: List[Family], events: 'EventIndex' = None, changed: Set[str] = None,
+                            state: Dict = None):
+    from events import EventIndex
+
+    if changed is not None and state:
+        families = [family for family in families if family.id in changed]
+    events = events or EventIndex(families, ['MARR'])
+    recent = {_id for _id, _ in events.recent('MARR')}
     marr_list = []
     for family in families:
         if family.marr is not None:
             if family.marr:
-                marr_date: datetime = datetime.strptime(family.marr['date'], "%d %b %Y")
-                if today - marr_date <= timedelta(days=30) and today - marr_date >= timedelta(days=0):
-                    marr_list.append([family.id, family.husb, family.wife, family.marr["date"]])
-                    print(f"✔ Family ({family.id}): Anniversary come in last 30 days")
+                if family.id in recent:
+                    marr_list.append((family.id, [family.id, family.husb, family.wife, family.marr["date"]]))
+                    report('US53', PASS, family.id, "Family ({}): Anniversary come in last 30 days")
                 else:
-                    print(f"✘ Family ({family.id}): Anniversary didn't come in last 30 days")
+                    report('US53', INFO, family.id, "Family ({}): Anniversary didn't come in last 30 days")
         else:
-            print(f"✘ Family ({family.id}): Marrige didn't take place ")
+            report('US53', INFO, family.id, "Family ({}): Marrige didn't take place ")
 
-    print("List of couple who had recent anniversaries: ")
-    print(marr_list)
+    marr_list = listing(state, 'anniversaries', marr_list, changed)
+    report('US53', INFO, (), "List of couple who had recent anniversaries: \n{}", marr_list)
     return marr_list
 
 
 ##US54
-def divorce_14(family: Family, individuals: List[Individual]) -> bool:
+@rule('US54', FAMILY, when=lambda family: family.div)
+def divorce_14(family: Family, individuals: Individuals) -> bool:
     
-    divo_date: datetime = datetime.strptime(family.div['date'], "%d %b %Y")
+    divo_date: datetime = family.div.datetime
 
-    husb_birthday = next(ind.birt['date'] for ind in individuals if ind.id == family.husb)
-    husb_birthday = datetime.strptime(husb_birthday, "%d %b %Y")
+    husb_birthday = find_individual(individuals, family.husb).birt.datetime
     husb_divo_age = divo_date.year - husb_birthday.year - \
                     ((divo_date.month, divo_date.day) < (husb_birthday.month, husb_birthday.day))
 
-    wife_birthday = next(ind.birt['date'] for ind in individuals if ind.id == family.wife)
-    wife_birthday = datetime.strptime(wife_birthday, "%d %b %Y")
+    wife_birthday = find_individual(individuals, family.wife).birt.datetime
     wife_divo_age = divo_date.year - wife_birthday.year - \
                     ((divo_date.month, divo_date.day) < (wife_birthday.month, wife_birthday.day))
 
     if husb_divo_age >= 14 and wife_divo_age >= 14:
-        print(f"✔ Family ({family.id}): Both parents were at least 14 at the divorce date")
+        report('US54', PASS, family.id, "Family ({}): Both parents were at least 14 at the divorce date")
         return True
 
     if husb_divo_age < 14 and wife_divo_age < 14:
-        print(f"✘ Family ({family.id}): Husband ({husb_divo_age}) "
-              f"and Wife ({wife_divo_age}) can not be less than 14")
+        report('US54', ERROR, family.id, "Family ({}): Husband ({}) and Wife ({}) can not be less than 14",
+               family.id, husb_divo_age, wife_divo_age)
     elif husb_divo_age < 14:
-        print(f"✘ Family ({family.id}): Husband ({husb_divo_age}) can not be less than 14")
+        report('US54', ERROR, family.id, "Family ({}): Husband ({}) can not be less than 14", family.id, husb_divo_age)
     elif wife_divo_age < 14:
-        print(f"✘ Family ({family.id}): Wife ({wife_divo_age}) can not be less than 14")
+        report('US54', ERROR, family.id, "Family ({}): Wife ({}) can not be less than 14", family.id, wife_divo_age)
 
     return False    
 
 ##US55
 
-def all_sister(individuals: List[Individual]) -> List:
+@rule('US55', GLOBAL)
+def all_sister(individuals: List[Individual], changed: Set[str] = None) -> List:
+    if changed is not None:
+        individuals = find_all_individuals(individuals, changed)
     girls = [ind for ind in individuals if ind.sex == 'F']
     sis = []
 
     for boi in girls:
         if boi.sex != 'F':
-            print(f"✘ {boi.name}: it not a sister !")
+            report('US55', ERROR, boi.id, "{}: it not a sister !", boi.name)
             sis.append(boi.name)
 
     return sis
 def mrgeAfter18(fam, ind):
+        from dateutil.relativedelta import relativedelta
+
         l = set()
         for i in fam:
-            mrg_date = datetime.strptime(fam[i]['MARR'], "%d %b %Y")
+            mrg_date = parse_date(fam[i]['MARR'])
             if 'HUSB' in fam[i]:
                 h_id = fam[i]['HUSB']
             for j in ind:
                 if i == ind[j]['family']:
                     if j == h_id:
-                        birt_date = datetime.strptime(ind[j]['BIRT'], "%d %b %Y")
+                        birt_date = parse_date(ind[j]['BIRT'])
                         diff = relativedelta(mrg_date, birt_date)
                         if diff.years > 18:
                             l.add(j)
         return l
 
-def twins_birth_date(family: Family, individuals: List[Individual]):
+def twins_birth_date(family: Family, individuals: Individuals):
 
     children_id_birthday = {}
     for child_id in family.chil:
-        child = next(ind for ind in individuals if ind.id == child_id)
+        child = find_individual(individuals, child_id)
         children_id_birthday[child_id] = child.birt['date']
 
     twins = {}
@@ -1334,9 +1562,9 @@ def list_male(individuals: List[Individual]):
     for indivi in individuals:
         if indivi.sex == "Male":
             male.append(indivi.id)
-            print(f"{indivi.id}:: people is male")
+            report('MALE', PASS, indivi.id, "{}:: people is male", marked=False)
         else:
-            print(f"{indivi.id}:: not male")
+            report('MALE', INFO, indivi.id, "{}:: not male", marked=False)
 
     return male
 
@@ -1346,8 +1574,8 @@ def list_female(individuals: List[Individual]):
     for indivi in individuals:
         if indivi.sex == "Female":
             female.append(indivi.id)
-            print(f"{indivi.id}:: people is female")
+            report('FEMALE', PASS, indivi.id, "{}:: people is female", marked=False)
         else:
-            print(f"{indivi.id}:: not female")
+            report('FEMALE', INFO, indivi.id, "{}:: not female", marked=False)
 
     return female   
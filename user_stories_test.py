@@ -3,13 +3,38 @@
     date: 30-Sep-2020
     python: v3.8.4
 """
+import io
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
 import datetime
 import unittest
 from typing import List, Dict
 
 import user_stories
 import user_stories as us
-from models import Individual, Family
+from models import Event, Individual, Family, GedcomIndex
+from incremental import Validation
+from sqlite_store import SqliteStore
+from findings import Finding, CollectorSink, JsonlSink, SummarySink, TextSink, PASS, ERROR, INFO, reporting_to
+from rules import RULES, INDIVIDUAL, FAMILY, GLOBAL, run_rules, run_rules_parallel, shard_families, format_stats
+
+try:
+    import columnar
+except ImportError:  # NumPy is optional
+    columnar = None
+
+
+def family_tree(families: int) -> List[Family]:
+    """ return families linked as a binary tree: the husband of family 2f+1 and the wife of 2f+2 are children of f """
+    tree: List[Family] = []
+    for f in range(families):
+        family = Family(f"F{f}", husb=f"I{2 * f}", wife=f"I{2 * f + 1}")
+        family.chil = [f"I{2 * child + side}" for side, child in ((0, 2 * f + 1), (1, 2 * f + 2)) if child < families]
+        tree.append(family)
+    return tree
 
 
 class TestApp(unittest.TestCase):
@@ -735,6 +760,12 @@ class TestApp(unittest.TestCase):
                                                                                          "Wife " + fam.wife)
         self.assertTrue(len(errorList) == 0, "US19: No first cousins are married!")
 
+    def test_lazy_dataset(self):
+        """ test the sample file is parsed on first use instead of at import """
+        self.assertNotIn('families', vars(us))
+        self.assertIs(us.families, us.load_dataset()[1])
+        self.assertEqual([ind.id for ind in us.individuals], sorted(ind.id for ind in us.individuals))
+
     def test_auntsAndUncle(self):
         errorList: List = us.auntsAndUncle()
         for fam in errorList:
@@ -1468,6 +1499,503 @@ class TestApp(unittest.TestCase):
 
         self.assertEqual(us.list_female(indi), ["I1","I2"])
 
+    def test_gedcom_index(self):
+        """ test checks give the same answers with a GedcomIndex as with a list """
+        husband: Individual = Individual(_id="I0", sex='M', name="John /Doe/", birt={'date': "19 SEP 1995"})
+        wife: Individual = Individual(_id="I1", sex='F', name="Jane /Roe/", birt={'date': "3 JAN 2000"})
+        child: Individual = Individual(_id="I2", sex='M', name="Jim /Doe/", birt={'date': "5 MAY 2016"})
+        individuals: List[Individual] = [husband, wife, child]
+        family: Family = Family(_id="F0", husb=husband.id, wife=wife.id, marr={'date': "11 FEB 2015"})
+        family.chil = [child.id]
+        index: GedcomIndex = GedcomIndex(individuals, [family])
+
+        self.assertIs(index["I1"], wife)
+        self.assertIs(index.family("F0"), family)
+        self.assertIsNone(index.get("I9"))
+        self.assertIn("I2", index)
+        self.assertEqual(list(index), individuals)
+        self.assertRaises(KeyError, index.individual, "I9")
+
+        for check in [us.were_parents_over_14, us.correct_gender_for_role, us.male_last_names,
+                      us.birth_before_death_of_parents, us.marriage_date_and_child]:
+            self.assertEqual(check(family, index), check(family, individuals), check.__name__)
+        self.assertEqual(family.info(index), family.info(individuals))
+
+    def test_sqlite_store(self):
+        """ test the SQLite store gives back the parsed records and the same findings as a GedcomIndex """
+        individuals, families = us.parse_file(us.DATA_PATH)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path: str = shutil.copy(us.DATA_PATH, directory.name)
+        store: SqliteStore = SqliteStore.from_file(path)
+        self.addCleanup(lambda: store.close())
+
+        def fields(record) -> Dict:
+            return {name: getattr(record, name, None) for name in type(record).__slots__}
+
+        self.assertEqual(len(store), len(individuals))
+        self.assertEqual(list(map(fields, store)), list(map(fields, individuals)))
+        self.assertEqual(list(map(fields, store.iter_families())), list(map(fields, families)))
+        self.assertEqual(fields(store["@I10@"]), fields(us.find_individual(individuals, "@I10@")))
+        self.assertIn("@I10@", store)
+        self.assertIsNone(store.get("@I99@"))
+        self.assertRaises(KeyError, store.family, "@F99@")
+
+        self.assertEqual(store.children("@F1@"), ["@I1@", "@I8@"])
+        self.assertEqual(store.parent_families("@I10@"), ["@F2@"])
+        self.assertEqual(store.spouse_families("@I2@"), ["@F1@"])
+        self.assertEqual(store.events_between('BIRT', datetime.date(1960, 1, 1), datetime.date(1970, 1, 1)),
+                         [("@I12@", "9 DEC 1963"), ("@I2@", "10 JUL 1965"), ("@I10@", "8 FEB 1966")])
+
+        with reporting_to(CollectorSink()) as in_memory:
+            run_rules(GedcomIndex(individuals, families))
+        with reporting_to(CollectorSink()) as in_sqlite:
+            run_rules(store)
+        self.assertEqual(in_sqlite.findings, in_memory.findings)
+
+        # a replacement that fails leaves the record as it was
+        self.assertRaises(sqlite3.Error, store.add, Individual(_id="@I10@", name=["not", "text"]))
+        self.assertEqual(fields(store["@I10@"]), fields(us.find_individual(individuals, "@I10@")))
+
+        # a replacement only replaces the record of its kind with the id
+        store.add(Family(_id="@I10@", husb="@I1@", marr={'date': "1 JAN 2000"}))
+        store.add(Individual(_id="@I10@", name="Ann /Lee/", birt={'date': "2 FEB 1990"}))
+        self.assertEqual(store.family("@I10@").marr, {'date': "1 JAN 2000"})
+        self.assertEqual((store["@I10@"].name, store["@I10@"].birt), ("Ann /Lee/", {'date': "2 FEB 1990"}))
+        store.discard("@I10@")
+        self.assertEqual((store.get("@I10@"), store.get_family("@I10@")), (None, None))
+
+        # the database next to the file is opened again as it is while the file does not change
+        store.add(Individual(_id="@I99@"))
+        store.close()
+        store = SqliteStore.from_file(path)
+        self.assertIn("@I99@", store)
+        store.close()
+        os.utime(path, (0, 0))
+        store = SqliteStore.from_file(path)
+        self.assertNotIn("@I99@", store)
+        self.assertEqual(len(store), len(individuals))
+
+    def test_event(self):
+        """ test events are stored compactly and still read like {'date': ...} """
+        individual: Individual = Individual(_id="I0", birt={'date': "19 SEP 1995"})
+        self.assertIsInstance(individual.birt, Event)
+        self.assertEqual(individual.birt['date'], "19 SEP 1995")
+        self.assertEqual(individual.birt.get('date'), "19 SEP 1995")
+        self.assertEqual(individual.birt, {'date': "19 SEP 1995"})
+        self.assertIs(individual.deat, False)
+        self.assertRaises(AttributeError, setattr, individual, 'nickname', "Jo")
+
+        individual.deat = {}  # a DEAT line without a DATE line
+        self.assertFalse(individual.deat)
+        self.assertIsNone(individual.deat.get('date'))
+
+        individual._id = "I1"
+        self.assertEqual(individual.id, "I1")
+
+        self.assertEqual(individual.birt.datetime, datetime.datetime(1995, 9, 19))
+        self.assertIs(Individual(birt={'date': "19 SEP 1995"}).birt.datetime, individual.birt.datetime)  # memoized
+        self.assertRaises(ValueError, lambda: Event("SEP 1995").datetime)
+
+    @unittest.skipIf(columnar is None, "NumPy is not installed")
+    def test_columnar(self):
+        """ test the vectorized checks agree with the checks on records """
+        individuals: List[Individual] = [
+            Individual(_id="I0", sex='M', birt={'date': "19 SEP 1995"}),
+            Individual(_id="I1", sex='F', birt={'date': "3 JAN 2000"}, deat={'date': "1 JAN 1999"}),
+            Individual(_id="I2", sex='M', birt={'date': "2 MAR 2007"}),
+            Individual(_id="I3", sex='F', birt={'date': "11 FEB 1850"}, deat={'date': "11 FEB 2001"}),
+            Individual(_id="I4", sex='F', birt={'date': "12 FEB 2001"}, deat={'date': "12 FEB 2080"}),
+        ]
+        families: List[Family] = [
+            Family(_id="F0", husb="I0", wife="I1", marr={'date': "3 JAN 2014"}, div={'date': "3 JAN 2019"}),
+            Family(_id="F1", husb="I0", wife="I1", marr={'date': "2 JAN 2014"}, div={'date': "2 JAN 2014"}),
+            Family(_id="F2", husb="I2", wife="I4", marr={'date': "11 FEB 2019"}, div={'date': "11 FEB 2023"}),
+        ]
+        store = columnar.ColumnarStore(individuals, families)
+
+        self.assertEqual(list(columnar.birth_before_death(store)), list(map(us.birth_before_death, individuals)))
+        self.assertEqual(list(columnar.less_than_150(store)), list(map(us.less_than_150, individuals)))
+        self.assertEqual(list(columnar.were_parents_over_14(store)),
+                         [us.were_parents_over_14(family, individuals) for family in families])
+        self.assertEqual(list(columnar.divorce_14(store)), [us.divorce_14(family, individuals) for family in families])
+        self.assertEqual(store.failing_individuals(columnar.birth_before_death(store)), ["I1"])
+
+    def test_findings(self):
+        """ test the checks report structured findings to the current sink """
+        family: Family = Family(_id="F0")
+        family.chil = [f"I{i}" for i in range(15)]
+
+        with reporting_to(CollectorSink()) as sink:
+            self.assertFalse(us.fewer_than_15_siblings(family))
+            self.assertTrue(us.fewer_than_15_siblings(Family(_id="F1")))
+        self.assertEqual(sink.findings, [Finding('US15', ("F0",), ERROR, "Family (F0): Siblings are greater than 15"),
+                                         Finding('US15', ("F1",), PASS, "Family (F1): Siblings are less than 15")])
+
+        stream: io.StringIO = io.StringIO()
+        with reporting_to(JsonlSink(stream, buffer_size=100, passes=False)) as sink:
+            us.fewer_than_15_siblings(family)
+            us.fewer_than_15_siblings(Family(_id="F1"))
+        self.assertEqual([json.loads(line)['record_ids'] for line in stream.getvalue().splitlines()], [["F0"]])
+        self.assertEqual(sink.summary(), ["US15: 1 passed, 1 errors, 0 infos"])
+
+        with reporting_to(SummarySink()) as sink:
+            us.fewer_than_15_siblings(family)
+        self.assertEqual(sink.counts, {('US15', ERROR): 1})
+
+        stream = io.StringIO()
+        with reporting_to(TextSink(stream)):
+            us.fewer_than_15_siblings(family)
+            us.marriage_before_divorce(Family(_id="F1", marr={'date': "1 JAN 2000"}))  # never had a mark
+        self.assertEqual(stream.getvalue().splitlines(), ["✘ Family (F0): Siblings are greater than 15",
+                                                          "(F1):There is no divorce"])
+
+        # a record left out of a listing is not an error, and every finding carries its story id
+        with reporting_to(CollectorSink()) as sink:
+            us.List_recent_death([Individual(_id="I1", deat={'date': "1 JAN 1990"})])
+            us.List_recent_divorce([Family(_id="F1", div={'date': "1 JAN 1990"})])
+            us.list_male([Individual(_id="I2", sex='F')])
+        self.assertEqual([(finding.rule_id, finding.severity) for finding in sink.findings],
+                         [('US35', INFO), ('US40', INFO), ('US40', INFO), ('MALE', INFO)])
+
+    def test_incremental(self):
+        """ test an update after an edit only checks the edited records and ends like a full validation """
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tree.ged")
+            shutil.copy(us.DATA_PATH, path)
+            checks = [rule for rule in RULES.values() if rule.scope != GLOBAL]
+
+            def full_validation() -> List[Finding]:
+                individuals, families = us.parse_file(path)
+                with reporting_to(CollectorSink()) as sink:
+                    run_rules(GedcomIndex(individuals, families), checks)
+                return sink.findings
+
+            validation: Validation = Validation(path, checks)
+            global_validation: Validation = Validation(path, [RULES['uniqueFamilyBySpouses'], RULES['individual_ages']])
+            with reporting_to(CollectorSink()):
+                self.assertEqual(len(validation.update()), 16)
+                self.assertEqual(validation.update(), set())
+                global_validation.update()
+            self.assertEqual(list(validation.iter_findings()), full_validation())
+
+            with open(path) as file:
+                text: str = file.read()
+            with open(path, "w") as file:
+                file.write(text.replace("2 DATE 8 FEB 1966", "2 DATE 8 FEB 2016", 1))
+            with reporting_to(CollectorSink()):
+                self.assertEqual(validation.update(), {"@I10@"})
+                global_validation.update()
+            self.assertEqual(validation.stats['birth_before_death'].calls, 13)  # 12 individuals, then @I10@
+            # only the global rule taking the individuals runs again after an edit of an individual
+            self.assertEqual(global_validation.stats['uniqueFamilyBySpouses'].calls, 1)
+            self.assertEqual(global_validation.stats['individual_ages'].calls, 2)
+            self.assertEqual(list(validation.iter_findings()), full_validation())
+
+    def test_incremental_global_rules(self):
+        """ test the global rules taking changed continue from their state and end like a full validation """
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tree.ged")
+            shutil.copy(us.DATA_PATH, path)
+            checks = [RULES[name] for name in ('unique_ids', 'AreIndividualsUnique', 'aunt_uncle_birth_year',
+                                               'List_Upcoming_birthday', 'all_dead_people')]
+
+            def findings(validation: Validation) -> List[tuple]:
+                return sorted((finding.rule_id, finding.record_ids, finding.severity, finding.message)
+                              for finding in validation.iter_findings())
+
+            validation: Validation = Validation(path, checks)
+            with reporting_to(CollectorSink()):
+                validation.update()
+            self.assertTrue(all(validation.states[rule.name] for rule in checks if 'state' in rule.parameters))
+
+            with open(path) as file:
+                text: str = file.read()
+            with open(path, "w") as file:  # @I8@ gets the name and birth date of @I1@
+                file.write(text.replace("1 NAME Kardes /IZGI/", "1 NAME Fatih /IZGI/", 1))
+            fresh: Validation = Validation(path, checks)
+            with reporting_to(CollectorSink()):
+                self.assertEqual(validation.update(), {"@I8@"})
+                fresh.update()
+            self.assertIn(('US23', ("@I8@",), ERROR), [finding[:3] for finding in findings(validation)])
+            self.assertEqual(findings(validation), findings(fresh))
+
+    def test_run_rules(self):
+        """ test the rules run once per matching record and report their results """
+        individuals: List[Individual] = [
+            Individual(_id="I0", sex='M', birt={'date': "19 SEP 1995"}),
+            Individual(_id="I1", sex='F', birt={'date': "3 JAN 2000"}, deat={'date': "1 JAN 1999"}),
+        ]
+        families: List[Family] = [
+            Family(_id="F0", husb="I0", wife="I1", marr={'date': "3 JAN 2014"}),
+            Family(_id="F1", husb="I0", wife="I1"),
+        ]
+        rules = [RULES['birth_before_death'], RULES['were_parents_over_14'], RULES['unique_ids']]
+        self.assertEqual([rule.scope for rule in rules], [INDIVIDUAL, FAMILY, GLOBAL])
+
+        results: List = []
+        stats = run_rules(GedcomIndex(individuals, families), rules,
+                          lambda rule, record_id, result: results.append((rule.id, record_id, result)))
+        self.assertEqual(results, [('US10', 'F0', True), ('US03', 'I0', True), ('US03', 'I1', False),
+                                   ('US22', None, True)])
+        self.assertEqual([stats[rule.name].calls for rule in rules], [2, 1, 1])  # F1 has no marriage
+        self.assertEqual([stats[rule.name].errors for rule in rules], [0, 0, 0])
+        self.assertEqual(len({len(line) for line in format_stats(stats)}), 1)  # the columns line up
+
+        results.clear()
+        run_rules(GedcomIndex(individuals, families), [RULES['death'], RULES['divo']],
+                  lambda rule, record_id, result: results.append((rule.id, record_id, result)))
+        self.assertEqual(results, [('US01', 'I1', True)])  # I0 is alive and neither family is divorced
+
+    def test_run_rules_repeated_ids(self):
+        """ test US22 finds a repeated id when run by run_rules and by an incremental validation """
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tree.ged")
+            with open(path, "w") as file:
+                file.write("0 @I1@ INDI\n1 NAME Ann /Lee/\n1 SEX F\n"
+                           "0 @I1@ INDI\n1 NAME Bob /Lee/\n1 SEX M\n"
+                           "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I1@\n0 TRLR\n")
+            individuals, families = us.parse_file(path)
+            index: GedcomIndex = GedcomIndex(individuals, families)
+            self.assertEqual(index["@I1@"].name, "Ann /Lee/")
+            self.assertEqual(len(index), 2)
+
+            results: List = []
+            with reporting_to(CollectorSink()) as sink:
+                run_rules(index, [RULES['unique_ids']], lambda rule, record_id, result: results.append(result))
+            self.assertEqual(results, [False])
+            self.assertEqual([(finding.severity, finding.record_ids) for finding in sink.findings],
+                             [(ERROR, ("@I1@",))])
+
+            validation: Validation = Validation(path, [RULES['unique_ids']])
+            with reporting_to(CollectorSink()):
+                validation.update()
+            self.assertEqual([finding.severity for finding in validation.iter_findings()], [ERROR])
+
+    def test_run_rules_parallel(self):
+        """ test the parallel run reports the same results in the same order as run_rules """
+        individuals, families = us.load_dataset()
+        index: GedcomIndex = GedcomIndex(individuals, families)
+        shards = shard_families(index, 3)
+        self.assertEqual([family.id for shard, _ in shards for family in shard], [family.id for family in families])
+        self.assertEqual({individual.id for individual in shards[0][1]},
+                         {_id for family in shards[0][0] for _id in [family.husb, family.wife, *family.chil]})
+
+        def collect(results: List):
+            """ the workers return copies of the records, so the records are compared by id """
+            return lambda rule, record_id, result: results.append(
+                (rule.id, record_id, [record.id for record in result] if isinstance(result, list) else result))
+
+        rules = [rule for rule in RULES.values() if rule.scope != GLOBAL]
+        sequential: List = []
+        parallel: List = []
+        run_rules(index, rules, collect(sequential))
+        stats = run_rules_parallel(index, rules, collect(parallel), workers=2)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(sum(rule_stats.calls for rule_stats in stats.values()), len(sequential))
+
+    def test_kinship(self):
+        """ test the kinship index answers like findParents and checkIfSiblings """
+        from app import findParents, checkIfSiblings
+        from kinship import Kinship
+
+        def family(_id: str, husb: str, wife: str, *chil: str) -> Family:
+            fam: Family = Family(_id=_id, husb=husb, wife=wife)
+            fam.chil = list(chil)
+            return fam
+
+        # I6 and I8 are first cousins
+        families: List[Family] = [family("F1", "I1", "I2", "I3", "I4"), family("F2", "I3", "I5", "I6"),
+                                  family("F3", "I7", "I4", "I8"), family("F4", "I6", "I8")]
+        kinship: Kinship = Kinship(families)
+        self.assertIs(kinship.parent_family("I6"), families[1])
+        self.assertEqual(kinship.parent_family("I1"), "")
+        self.assertEqual([fam.id for fam in kinship.spouse_families("I6")], ["F4"])
+        self.assertEqual(kinship.children("F1"), ["I3", "I4"])
+        self.assertEqual(kinship.siblings("I3"), ["I4"])
+        self.assertEqual(kinship.parents("I8"), ["I7", "I4"])
+        with reporting_to(CollectorSink()) as sink:
+            self.assertEqual([fam.id for fam in us.firstCousinShouldNotMarry(families)], ["F4"])
+            self.assertEqual(us.auntsAndUncle(families), [])
+        self.assertEqual([(finding.rule_id, finding.severity, finding.record_ids) for finding in sink.findings],
+                         [('US19', ERROR, ("F4", "I6", "I8")), ('US20', PASS, ())])
+
+        for listFam in (families, us.load_dataset()[1]):
+            kinship = Kinship(listFam)
+            for fam in listFam:
+                self.assertEqual(kinship.parent_family(fam.husb), findParents(fam.husb, listFam))
+                for other in listFam:
+                    self.assertEqual(kinship.spouses_are_siblings(fam, other), checkIfSiblings(fam, other, listFam))
+
+    def test_kinship_closures(self):
+        """ test the memoized ancestor and descendant closures """
+        from kinship import Kinship
+
+        kinship: Kinship = Kinship(family_tree(7))  # F0 <- F1, F2 <- F3 .. F6
+        self.assertEqual(kinship.parents("I2"), ["I0", "I1"])
+        self.assertEqual(kinship.ancestors("I2"), {"I0", "I1"})
+        self.assertEqual(kinship.ancestors("I6", depth=1), {"I2", "I3"})
+        self.assertEqual(kinship.ancestors("I6"), {"I0", "I1", "I2", "I3"})
+        self.assertEqual(kinship.ancestors("I0"), set())
+        self.assertEqual(kinship.ancestors("I6", depth=0), set())
+        self.assertEqual(kinship.descendants("I0", depth=1), {"I2", "I5"})
+        self.assertEqual(kinship.descendants("I0"), {"I2", "I5", "I6", "I9", "I10", "I13"})
+        self.assertTrue(kinship.is_ancestor("I1", "I13"))
+        self.assertFalse(kinship.is_ancestor("I1", "I13", depth=1))
+        self.assertFalse(kinship.is_ancestor("I13", "I1"))
+        self.assertEqual(kinship.common_ancestors("I6", "I13"), {"I0", "I1"})
+        self.assertEqual(list(kinship.iter_ancestors("I6")), [("I2", 1), ("I3", 1), ("I0", 2), ("I1", 2)])
+        self.assertEqual({_id for _id, _ in kinship.iter_descendants("I0")}, kinship.descendants("I0"))
+
+        looped: Family = Family(_id="F7", husb="I6", wife="I15")
+        looped.chil = ["I0"]  # I0 is his own great-grandfather
+        kinship = Kinship(family_tree(7) + [looped])
+        self.assertIn("I0", kinship.ancestors("I0"))
+
+    def test_consanguinity(self):
+        """ test the bitset pass finds the related couples the closures find """
+        from consanguinity import AncestorBits, related_couples, members
+        from kinship import Kinship
+
+        self.assertEqual(list(members(0b101010)), [1, 3, 5])
+
+        tree: List[Family] = family_tree(15)
+        cousins: Family = Family(_id="F15", husb="I6", wife="I13")  # grandchildren of I0 and I1
+        cousins.chil = ["I30"]
+        distant: Family = Family(_id="F16", husb="I18", wife="I29")  # great-grandchildren of I0 and I1
+        nephew: Family = Family(_id="F17", husb="I9", wife="I5")  # I5 is the sister of I9's father I2
+        tree += [cousins, distant, nephew]
+        with reporting_to(CollectorSink()) as sink:
+            related = us.consanguineousMarriages(tree, [])
+        self.assertEqual([family.id for family in related], ["F15", "F16", "F17"])
+        self.assertEqual([finding.record_ids for finding in sink.findings],
+                         [("F15", "I6", "I13"), ("F16", "I18", "I29"), ("F17", "I9", "I5")])
+        self.assertEqual([(family.id, shared) for family, shared in related_couples(tree, generations=2)],
+                         [("F15", ["I0", "I1"]), ("F17", ["I0", "I1"])])
+        self.assertEqual(related_couples(tree, batch_size=1), related_couples(tree))
+
+        kinship: Kinship = Kinship(tree)
+        for generations in (1, 2, None):
+            bits: AncestorBits = AncestorBits(kinship, [(f"I{i}", "I0") for i in range(31)], generations)
+            self.assertEqual(set(bits.shared("I6", "I13")), kinship.common_ancestors("I6", "I13", generations))
+            for i in range(31):
+                self.assertEqual({bits.ids[n] for n in members(bits.ancestors.get(f"I{i}", 0))},
+                                 kinship.ancestors(f"I{i}", generations))
+        self.assertEqual(us.consanguineousMarriages(), [])
+
+    def test_event_index(self):
+        """ test the window queries of the event index, across the end of the year and on 29 February """
+        from events import EventIndex
+
+        dates: List[str] = ["29 FEB 2000", "1 JAN 1990", "31 DEC 1980", "15 OCT 2026", "20 OCT 2026", "1 JAN 2030",
+                            "30 FEB 2001"]
+        individuals: List[Individual] = [Individual(_id=f"I{i}", birt={'date': text}) for i, text in enumerate(dates)]
+        events: EventIndex = EventIndex(individuals, ['BIRT'])
+        self.assertEqual(len(events), 6)  # 30 FEB is unreadable
+        self.assertEqual(events.upcoming('BIRT', datetime.date(2026, 12, 20)),
+                         [("I2", datetime.date(1980, 12, 31), datetime.date(2026, 12, 31)),
+                          ("I1", datetime.date(1990, 1, 1), datetime.date(2027, 1, 1))])
+        self.assertEqual(events.upcoming('BIRT', datetime.date(2027, 2, 1), 26), [])
+        self.assertEqual(events.upcoming('BIRT', datetime.date(2027, 2, 1), 27),
+                         [("I0", datetime.date(2000, 2, 29), datetime.date(2027, 2, 28))])
+        self.assertEqual(events.upcoming('BIRT', datetime.date(2028, 2, 28), 1),
+                         [("I0", datetime.date(2000, 2, 29), datetime.date(2028, 2, 29))])
+        self.assertEqual(events.upcoming('BIRT', datetime.date(2026, 10, 10), 10),
+                         [("I3", datetime.date(2026, 10, 15), datetime.date(2026, 10, 15)),
+                          ("I4", datetime.date(2026, 10, 20), datetime.date(2026, 10, 20))])
+        self.assertEqual(events.recent('BIRT', datetime.date(2026, 10, 16)), [("I3", datetime.date(2026, 10, 15))])
+        self.assertEqual(events.between('BIRT', datetime.date(1980, 1, 1), datetime.date(1999, 12, 31)),
+                         [("I2", datetime.date(1980, 12, 31)), ("I1", datetime.date(1990, 1, 1))])
+
+        today: datetime.date = datetime.date.today()
+        birthday: datetime.date = today + datetime.timedelta(days=5)
+        soon: Individual = Individual(_id="I7", name="Soon", birt={
+            'date': birthday.replace(year=birthday.year - 28).strftime("%d %b %Y").upper()})
+        past: Individual = Individual(_id="I8", name="Past", birt={
+            'date': (today - datetime.timedelta(days=3)).strftime("%d %b %Y").upper()})
+        with reporting_to(CollectorSink()):
+            self.assertEqual(us.List_recent_birth([soon, past]), ["Past"])
+            self.assertEqual([row[0] for row in us.List_Upcoming_birthday([soon, past])], ["I7"])
+
+    def test_duplicates(self):
+        """ test the single-pass duplicate finders report every duplicate group """
+        from duplicates import find_duplicates
+
+        individuals: List[Individual] = [Individual(_id="I1", name="John /Doe/", birt={'date': "14 OCT 1990"}),
+                                         Individual(_id="I2", name="John /Doe/", birt={'date': "1 JAN 1950"}),
+                                         Individual(_id="I3", name="John /Doe/", birt={'date': "1 JAN 1950"}),
+                                         Individual(_id="I1", name="John /Doe/", birt={'date': "14 OCT 1990"}),
+                                         Individual(_id="I4", name="Jane /Doe/")]
+        families: List[Family] = [Family(_id="F1", husb="I1", wife="I4", marr={'date': "1 MAY 2010"}),
+                                  Family(_id="I4", husb="I1", wife="I4", marr={'date': "1 MAY 2010"}),
+                                  Family(_id="F2", husb="I1", wife="I4")]
+        finders = find_duplicates(individuals + families)
+        self.assertEqual(finders['US22'].duplicates(), [["I1", "I1"], ["I4", "I4"]])
+        self.assertEqual(finders['US23'].duplicates(), [["I2", "I3"], ["I1", "I1"]])
+        self.assertEqual(finders['US24'].duplicates(), [["F1", "I4"]])
+
+        with reporting_to(CollectorSink()):
+            self.assertEqual(us.AreIndividualsUnique(individuals), [["I3", "John /Doe/", "1 JAN 1950"],
+                                                                    ["I1", "John /Doe/", "14 OCT 1990"]])
+            self.assertEqual(us.uniqueFamilyBySpouses(families), [["I4", "I1", "I4", "1 MAY 2010"]])
+            self.assertFalse(us.unique_ids(families, individuals))
+            many: List[Individual] = [Individual(_id=f"I{i}") for i in range(100_000)]
+            self.assertTrue(us.unique_ids([], many))
+
+    def test_fuzzy_duplicates(self):
+        """ test near-duplicates are found within and across the Soundex and birth year blocks """
+        from duplicates import soundex, split_name, fuzzy_duplicates
+
+        self.assertEqual([soundex(name) for name in ["Robert", "Rupert", "Ashcraft", "Tymczak", "Pfister", "Lee", ""]],
+                         ["R163", "R163", "A261", "T522", "P236", "L000", ""])
+        self.assertEqual(split_name("John /Smith/"), ("John", "Smith"))
+        individuals: List[Individual] = [
+            Individual("I1", "John /Smith/", "M", {'date': "3 MAY 1900"}),
+            Individual("I2", "Jon /Smyth/", "M", {'date': "4 MAY 1900"}),
+            Individual("I3", "Jane /Smith/", "F", {'date': "3 MAY 1900"}),  # another sex
+            Individual("I4", "John /Smith/", "M", {'date': "31 DEC 1899"}),  # the year before
+            Individual("I5", "John /Smith/", "M", {'date': "1 JAN 1920"}),
+            Individual("I6", "John /Jones/", "M", {'date': "3 MAY 1900"})]
+        self.assertEqual(fuzzy_duplicates(individuals), [("I4", "I1", 0.899), ("I1", "I2", 0.879)])
+        self.assertEqual(fuzzy_duplicates(individuals, only={"I2"}), [("I1", "I2", 0.879)])
+        self.assertEqual(fuzzy_duplicates(individuals, only={"I4"}), [("I4", "I1", 0.899)])  # across the new year
+        self.assertEqual(fuzzy_duplicates(individuals, only={"I5", "I6"}), [])
+        with reporting_to(CollectorSink()) as sink:
+            self.assertEqual(len(us.nearDuplicateIndividuals(individuals)), 2)
+        self.assertEqual([finding.record_ids for finding in sink.findings], [("I4", "I1"), ("I1", "I2")])
+
+    def test_sibling_spacing(self):
+        """ test the sorted sibling checks against a comparison of every pair of dates """
+        import random
+        import siblings
+
+        rng = random.Random(1)
+        for _ in range(300):
+            ordinals: List[int] = sorted(rng.randint(0, 600) for _ in range(rng.randint(0, 8)))
+            gaps: List[int] = [b - a for i, a in enumerate(ordinals) for b in ordinals[i + 1:]]
+            self.assertEqual(siblings.well_spaced(ordinals), all(gap <= 1 or gap >= 280 for gap in gaps))
+            around: List[int] = [sum(1 for other in ordinals if abs(other - ordinal) <= 1) for ordinal in ordinals]
+            self.assertEqual(siblings.largest_multiple_birth(ordinals), max(around, default=0))
+
+        children: List[Individual] = [Individual(_id=f"I{i}", birt={'date': text}) for i, text in
+                                      enumerate(["3 JAN 2001", "4 JAN 2001", "1 MAR 2001", "2 JAN 2003", "5 MAY 2010"])]
+        family: Family = Family(_id="F1")
+        family.chil = [child.id for child in children]
+        results = siblings.check_families([family, Family(_id="F2")], children)
+        self.assertEqual(list(results), ["F1"])
+        self.assertEqual((results["F1"].births, results["F1"].largest_multiple_birth, results["F1"].well_spaced),
+                         (5, 2, False))
+        self.assertEqual(results["F1"].first_multiple_birth, datetime.date(2001, 1, 3).toordinal())
+        with reporting_to(CollectorSink()):
+            self.assertFalse(us.siblings_spacing(family, children))
+            self.assertTrue(us.multiple_births_limit(family, children))
+            family.chil = family.chil[:2] + family.chil[3:]
+            self.assertTrue(us.siblings_spacing(family, children))
+            children.append(Individual(_id="I5", birt={'date': "2 JAN 2003"}))  # a twin born the same day
+            family.chil.append("I5")
+            self.assertTrue(us.siblings_spacing(family, children))
+        self.assertFalse(us.verifySiblingsSpace([datetime.date(2003, 1, 2)] * 2))
+
 
 def test_twins_birth_date(self):
     """ test twins birthdate same method """